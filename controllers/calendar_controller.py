@@ -1,27 +1,85 @@
 from datetime import datetime # datetimeをインポート済み
 import calendar # calendarモジュールをインポート済み
+from typing import Iterator
 from services.holiday_service import get_holidays_for_year # インポート済み
+from services.holiday_service import peek_holidays, prefetch_holidays
+from services.jp_holidays import holidays_for_year
 from services.event_manager import load_events # インポート済み
 from services.event_manager import add_event # add_event関数をインポート
-from services.weather_service import get_weather_for_today
+from services.event_manager import update_event, delete_event, move_event, find_event
+from services.event_manager import sync_external_changes
+from services.event_store import JsonEventStore
+from services.conflicts import get_conflict_index, scan_conflicts
+from services.date_index import iter_events_between
+from services.recurrence import load_recurrences
+from services.scheduler import DEFAULT_DAY_END, DEFAULT_DAY_START, find_free_slots
+from services.search_index import search_events
+from services.undo_history import UndoHistory
+from services.weather_service import get_cached_weather, get_weather_for_today
+from utils.calendar_utils import generate_calendar_matrix
 
 
 class CalendarController:
     """カレンダーの状態（年月・祝日・イベント）を管理し、移動操作を提供する"""
-    def __init__(self):
+    def __init__(self, store=None, holiday_notifier=None, weather_notifier=None):
+        """
+        store: EventStore を渡すと、表示中の月の範囲だけをそこから読み込みます。
+        省略時は従来どおり events.json を読み込みます。
+        holiday_notifier: 祝日をバックグラウンドで取得するときに、取得した (年, 祝日) を
+        受け取る関数（ワーカースレッドから呼ばれます）。指定すると年が変わっても祝日 API の
+        応答を待たず、前後の年の祝日も先読みします。結果は apply_prefetched_holidays() で反映します。
+        weather_notifier: 天気をバックグラウンドで取得し直したときに、新しい天気を受け取る関数
+        （ワーカースレッドから呼ばれます）。指定すると天気はキャッシュからすぐに返します。
+        """
+        self.store = store
+        self.holiday_notifier = holiday_notifier
+        self.weather_notifier = weather_notifier
         today = datetime.today()
         self.current_year = today.year
         self.current_month = today.month
         self.holidays = {} # 初期化
+        # self.holidays を読み込んだ年（月を移動しても年が同じなら祝日は読み直さない）
+        self.holidays_year = None
         self.events = {}   # 初期化
         self.weather_info = None
+        # 繰り返し予定のルール（件数が少ないので起動時に一度だけ読み込む）
+        self.recurrences = load_recurrences()
+        # 予定の編集履歴（ダイアログからの編集はこれを通して保存し、Ctrl+Z / Ctrl+Y で戻せる）
+        self.history = UndoHistory(store or JsonEventStore())
         self.load_data()
+        self.refresh_weather()
 
     def load_data(self):
-        """祝日とイベントデータをロードして属性にセット"""
-        self.holidays = get_holidays_for_year(self.current_year)
-        self.events = load_events()
-        self.weather_info = get_weather_for_today()
+        """祝日とイベントデータをロードして属性にセット（天気は月に関係しないので取得しない）"""
+        if self.holidays_year != self.current_year:
+            self.holidays = self._load_holidays(self.current_year)
+            self.holidays_year = self.current_year
+        if self.store is None:
+            self.events = load_events()
+        else:
+            self.events = self.store.load_events(*self.get_load_range())
+
+    def _load_holidays(self, year: int) -> dict:
+        """year 年の祝日を返します。holiday_notifier があれば API を待たずに返します。"""
+        if self.holiday_notifier is None:
+            return get_holidays_for_year(year)
+        holidays = peek_holidays(year)
+        # 表示する年と前後の年を、まだなければワーカースレッドで取得しておく
+        prefetch_holidays([year, year + 1, year - 1], self.holiday_notifier)
+        if holidays is None:
+            # 取得できるまでは計算した祝日を表示しておく
+            holidays = holidays_for_year(year)
+        return holidays
+
+    def apply_prefetched_holidays(self, year: int, holidays: dict) -> bool:
+        """
+        バックグラウンドで取得した year 年の祝日を反映します（UI スレッドで呼ぶこと）。
+        表示中の年の祝日が変わったときだけ True を返します。
+        """
+        if year != self.holidays_year or holidays == self.holidays:
+            return False
+        self.holidays = holidays
+        return True
 
     def prev_month(self):
         """前月に移動してデータを再ロード"""
@@ -47,6 +105,57 @@ class CalendarController:
         self.current_month = today.month
         self.load_data() # 日付変更後にデータを再ロード
 
+    def go_to_date(self, date_str: str):
+        """指定した日付（"YYYY-MM-DD"）を含む月に移動してデータを再ロード"""
+        self.current_year = int(date_str[:4])
+        self.current_month = int(date_str[5:7])
+        self.load_data()
+
+    def watches_events_file(self) -> bool:
+        """予定を events.json から読み込んでいるか（ほかのプロセスの変更を監視できるか）"""
+        return self.store is None or isinstance(self.store, JsonEventStore)
+
+    def sync_external_changes(self) -> set[str]:
+        """
+        ほかのプロセス（別のアプリや同期スクリプト）による events.json の変更を
+        self.events に取り込み、影響を受けた日付キーの集合を返します。
+        """
+        if not self.watches_events_file():
+            return set()
+        return sync_external_changes(self.events)
+
+    def get_visible_range(self) -> tuple[str, str]:
+        """
+        カレンダーに表示される月の最初と最後の日付（"YYYY-MM-DD"）を返します。
+        """
+        matrix = generate_calendar_matrix(self.current_year, self.current_month)
+        days = [d for week in matrix for d in week if d]
+        prefix = f"{self.current_year}-{self.current_month:02d}"
+        return f"{prefix}-{days[0]:02d}", f"{prefix}-{days[-1]:02d}"
+
+    def get_load_range(self) -> tuple[str, str]:
+        """
+        ストアから読み込む範囲（表示中の月と前後の月）を返します。
+        隣の月へ移動したときにも予定が揃っているようにするためです。
+        """
+        prev_year, prev_month = (self.current_year - 1, 12) if self.current_month == 1 \
+            else (self.current_year, self.current_month - 1)
+        next_year, next_month = (self.current_year + 1, 1) if self.current_month == 12 \
+            else (self.current_year, self.current_month + 1)
+        last_day = calendar.monthrange(next_year, next_month)[1]
+        return f"{prev_year}-{prev_month:02d}-01", f"{next_year}-{next_month:02d}-{last_day:02d}"
+
+    def refresh_weather(self) -> dict | None:
+        """
+        天気を更新して返します。weather_notifier があればキャッシュの天気をすぐに返し、
+        WEATHER_TTL_SEC より古ければバックグラウンドで取得し直します（結果は weather_notifier へ）。
+        """
+        if self.weather_notifier is None:
+            self.weather_info = get_weather_for_today()
+        else:
+            self.weather_info = get_cached_weather(self.weather_notifier)
+        return self.weather_info
+
     def get_weather_info(self) -> dict | None:
         """
         コントローラが保持する最新の天気情報を取得します。
@@ -60,9 +169,89 @@ class CalendarController:
         """
         return self.events.get(date_str, []) # self.eventsから取得
     
+    def get_events_between(self, start: str, end: str) -> Iterator[tuple[str, dict]]:
+        """
+        start 〜 end（"YYYY-MM-DD"、両端を含む）の予定を (日付, 予定) として
+        日付順に返すイテレータを返します。ストア使用時は読み込み済みの範囲が対象です。
+        """
+        return iter_events_between(self.events, start, end)
+
     def add_event_to_date(self, date_str: str, title: str,
-                          start_time: str = "", end_time: str = "", memo: str = "") -> None:
+                          start_time: str = "", end_time: str = "", memo: str = "") -> str:
         """
         指定された日付に新しいイベントを追加し、保存します。
+        追加した予定の ID を返します。
+        """
+        if self.store is None:
+            return add_event(self.events, date_str, title, start_time, end_time, memo)
+        return self.store.add_event(self.events, date_str, title, start_time, end_time, memo)
+
+    def find_event(self, event_id: str) -> tuple[str, dict] | None:
+        """ID から (日付, 予定) を返します。"""
+        return find_event(self.events, event_id)
+
+    def update_event(self, event_id: str, title: str,
+                     start_time: str = "", end_time: str = "", memo: str = "") -> bool:
+        """ID で指定した予定を更新し、保存します。"""
+        if self.store is None:
+            return update_event(self.events, event_id, title, start_time, end_time, memo)
+        return self.store.update_event(self.events, event_id, title, start_time, end_time, memo)
+
+    def delete_event(self, event_id: str) -> bool:
+        """ID で指定した予定を削除し、保存します。"""
+        if self.store is None:
+            return delete_event(self.events, event_id)
+        return self.store.delete_event(self.events, event_id)
+
+    def move_event(self, event_id: str, new_date: str) -> bool:
+        """ID で指定した予定を別の日付へ移動し、保存します。"""
+        if self.store is None:
+            return move_event(self.events, event_id, new_date)
+        return self.store.move_event(self.events, event_id, new_date)
+
+    def find_free_slots(self, start: str, end: str, duration: int = 60,
+                        day_start: str = DEFAULT_DAY_START,
+                        day_end: str = DEFAULT_DAY_END) -> list[tuple[str, str, str]]:
+        """
+        start 〜 end の平日（祝日を除く）の day_start 〜 day_end で、duration 分以上空いている
+        時間帯を (日付, 開始, 終了) のリストで返します。繰り返し予定の回も予定として扱います。
+        ストア使用時は読み込み済みの範囲の予定が対象です。
+        """
+        return find_free_slots(self.events, start, end, duration, day_start, day_end,
+                               recurrences=self.recurrences)
+
+    def find_conflicts(self) -> list[tuple[str, str, str]]:
+        """
+        カレンダー全体で時間が重なっている予定の組を (日付, 予定 ID, 予定 ID) のリストで返します。
+        ストア使用時は読み込み済みの範囲ではなく、ストアの全件を 1 日ずつ読みながら調べます。
+        """
+        if self.store is None:
+            return list(get_conflict_index(self.events).iter_conflicts())
+        return [(date_str, a, b)
+                for date_str, pairs in scan_conflicts(self.store.iter_events()).items()
+                for a, b in pairs]
+
+    def load_stats(self, start: str, end: str):
+        """
+        start 〜 end のすべての予定（繰り返し予定の回を含む）を読み込んだ EventStats を返します。
+        ストア使用時も読み込み済みの範囲ではなく、ストアから直接読み込みます。
+        """
+        # NumPy の読み込みは重いので、統計を開いたときに初めて読み込む（起動を遅くしない）
+        from services.stats import load_stats
+
+        return load_stats(self.history, start, end, self.recurrences)
+
+    def undo(self) -> set[str] | None:
+        """直前の編集を取り消し、影響を受けた日付キーの集合を返します（取り消せなければ None）。"""
+        return self.history.undo(self.events)
+
+    def redo(self) -> set[str] | None:
+        """取り消した編集をやり直し、影響を受けた日付キーの集合を返します（やり直せなければ None）。"""
+        return self.history.redo(self.events)
+
+    def search_events(self, query: str, limit: int | None = None) -> list[tuple[str, str]]:
+        """
+        タイトルかメモに query を含む予定の (日付, 予定 ID) を新しい順に返します。
+        ストア使用時は読み込み済みの範囲の予定が対象です（結果の予定 ID は self.events から引けます）。
         """
-        add_event(self.events, date_str, title, start_time, end_time, memo)
\ No newline at end of file
+        return search_events(self.events, query, limit)
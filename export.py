@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+
+from services.event_store import open_store
+from services.exporter import FORMATS, export_to_file, guess_format, iter_export
+from services.recurrence import load_recurrences
+
+
+def main(argv=None):
+    """予定を ICS / CSV に書き出すコマンドライン版のエクスポート"""
+    parser = argparse.ArgumentParser(description="カレンダーの予定を ICS / CSV に書き出します。")
+    parser.add_argument("output", help="書き出し先のファイル（- で標準出力）")
+    parser.add_argument("--format", choices=FORMATS, help="形式（省略時は拡張子から判断）")
+    parser.add_argument("--from", dest="start", metavar="YYYY-MM-DD", help="この日以降の予定")
+    parser.add_argument("--to", dest="end", metavar="YYYY-MM-DD", help="この日までの予定")
+    parser.add_argument("--store", default=os.environ.get("CALENDAR_APP_STORE", "json"),
+                        choices=("json", "sqlite", "shards"), help="読み込むストアの種類")
+    parser.add_argument("--no-recurring", action="store_true", help="繰り返し予定を含めない")
+    args = parser.parse_args(argv)
+
+    store = open_store(args.store)
+    recurrences = None if args.no_recurring else load_recurrences()
+    try:
+        if args.output == "-":
+            sys.stdout.writelines(
+                iter_export(store, args.format or "ics", args.start, args.end, recurrences)
+            )
+        else:
+            fmt = args.format or guess_format(args.output)
+            export_to_file(store, args.output, fmt, args.start, args.end, recurrences)
+            print(f"{args.output} に書き出しました")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
+import os
+
 from ui.main_window import MainWindow
+from services.event_store import open_store
 
 def main():
     """アプリケーションを起動します。"""
-    app = MainWindow()
+    # 保存先は環境変数 CALENDAR_APP_STORE で切り替え（json / sqlite / shards）
+    store = open_store(os.environ.get("CALENDAR_APP_STORE", "json"))
+    app = MainWindow(store=store)
     app.run()
 
 if __name__ == "__main__":
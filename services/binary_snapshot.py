@@ -0,0 +1,174 @@
+# calendar_app/services/binary_snapshot.py
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import chain
+
+# ファイルの先頭の識別子と形式のバージョン
+MAGIC = b"CALSNAP1"
+VERSION = 1
+
+# ヘッダー: 識別子, バージョン, 元の JSON の (更新時刻 ns, サイズ), 文字列数, 日数, 予定数,
+#           文字列本体のバイト数, フラグ
+_HEADER = struct.Struct("<8sIqqIIIQI")
+
+# よく使う項目は列（文字列番号の配列）として持つ。ほかの項目は予定ごとの JSON にまとめる
+COLUMNS = ("id", "title", "start_time", "end_time", "memo")
+
+# フラグ: 列 i に値のない予定があれば (1 << i)、列以外の項目を持つ予定があれば _HAS_EXTRAS
+_HAS_EXTRAS = 1 << 31
+
+
+def _u32_array(values) -> bytes:
+    data = array("I", values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _read_u32_array(buf, offset: int, count: int) -> tuple[array, int]:
+    data = array("I")
+    end = offset + count * 4
+    data.frombytes(buf[offset:end])
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data, end
+
+
+def dump_snapshot(path: str, events: dict, source_stat: tuple[int, int]) -> None:
+    """
+    events（日付キー → 予定リスト）をバイナリ形式で path に書き出します。
+
+    文字列はすべて 1 つの文字列表に重複なく入れ、日付キー・予定の各項目は文字列番号（uint32）の
+    配列として並べます。文字列表は「各文字列の終わりの位置（文字数の累計）」の配列と、
+    全文字列をつなげた UTF-8 本体からなります。読み込み時は本体を 1 回デコードして切り出すだけです。
+    source_stat には元にした events.json の (更新時刻 ns, サイズ) を記録し、鮮度の判定に使います。
+    """
+    strings = {}
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    day_keys, day_counts = [], []
+    rows = []
+    for date_str, day in events.items():
+        day_keys.append(intern(date_str))
+        day_counts.append(len(day))
+        rows.extend(day)
+
+    # 値のない列・列以外の項目は、文字列表の最後の次の番号（len(strings)）で「なし」を表す
+    columns = [[] for _ in COLUMNS]
+    extras = []
+    for event in rows:
+        for column, key in zip(columns, COLUMNS):
+            value = event.get(key)
+            if isinstance(value, str):
+                column.append(intern(value))
+            else:
+                column.append(None)
+        rest = {key: value for key, value in event.items()
+                if key not in COLUMNS or not isinstance(value, str)}
+        extras.append(intern(json.dumps(rest, ensure_ascii=False)) if rest else None)
+    none = len(strings)
+    flags = 0
+    for i, column in enumerate(columns + [extras]):
+        if None in column:
+            flags |= _HAS_EXTRAS if i == len(COLUMNS) else 1 << i
+            column[:] = [none if index is None else index for index in column]
+
+    ends, total = [], 0
+    for text in strings:
+        total += len(text)
+        ends.append(total)
+    # JSON の \ud800 のような単独のサロゲートも、そのまま往復できるように符号化する
+    blob = "".join(strings).encode("utf-8", errors="surrogatepass")
+
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, source_stat[0], source_stat[1],
+                     len(strings), len(day_keys), len(extras), len(blob), flags),
+        _u32_array(ends), blob,
+        _u32_array(day_keys), _u32_array(day_counts),
+        *(_u32_array(column) for column in columns),
+        _u32_array(extras),
+    ]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # 複数のプロセスが同時に書いても一時ファイルがぶつからないようにする
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.writelines(parts)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str, source_stat: tuple[int, int] | None) -> dict | None:
+    """
+    バイナリのスナップショットをメモリマップして読み込み、日付キー → 予定リスト を返します。
+
+    ファイルがない・壊れている・記録された events.json の (更新時刻 ns, サイズ) が
+    source_stat と一致しない（古い）ときは None を返すので、呼び出し側は JSON を読んでください。
+    """
+    if source_stat is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return _decode(buf, source_stat)
+    except (OSError, ValueError, struct.error, IndexError, UnicodeDecodeError) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"[warning] バイナリのスナップショットを読み込めませんでした: {e}", file=sys.stderr)
+        return None
+
+
+def _decode(buf, source_stat: tuple[int, int]) -> dict | None:
+    (magic, version, mtime_ns, size, n_strings, n_days, n_events,
+     blob_size, flags) = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("形式が違います")
+    if (mtime_ns, size) != tuple(source_stat):
+        return None
+
+    offset = _HEADER.size
+    ends, offset = _read_u32_array(buf, offset, n_strings)
+    text = buf[offset:offset + blob_size].decode("utf-8", errors="surrogatepass")
+    offset += blob_size
+    strings = list(map(text.__getitem__, map(slice, chain((0,), ends), ends)))
+    # 「なし」を表す番号（n_strings）
+    strings.append(None)
+
+    day_keys, offset = _read_u32_array(buf, offset, n_days)
+    day_counts, offset = _read_u32_array(buf, offset, n_days)
+    columns = []
+    for _ in COLUMNS:
+        column, offset = _read_u32_array(buf, offset, n_events)
+        # 文字列番号の列を、そのまま文字列の列に置き換える
+        columns.append(list(map(strings.__getitem__, column)))
+    extras, offset = _read_u32_array(buf, offset, n_events)
+    if offset != len(buf):
+        raise ValueError("ファイルの長さが合いません")
+
+    if flags & ~_HAS_EXTRAS == 0:
+        # すべての予定がすべての列を持つ（ふつうの）場合は dict の表示で一気に作る
+        rows = [{"id": a, "title": b, "start_time": c, "end_time": d, "memo": e}
+                for a, b, c, d, e in zip(*columns)]
+    else:
+        rows = [{key: value for key, value in zip(COLUMNS, values) if value is not None}
+                for values in zip(*columns)]
+    if flags & _HAS_EXTRAS:
+        for event, index in zip(rows, extras):
+            if index != n_strings:
+                event.update(json.loads(strings[index]))
+
+    events = {}
+    i = 0
+    for key_index, count in zip(day_keys, day_counts):
+        events[strings[key_index]] = rows[i:i + count]
+        i += count
+    return events
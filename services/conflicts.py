@@ -0,0 +1,115 @@
+# calendar_app/services/conflicts.py
+
+import heapq
+from itertools import groupby
+from typing import Iterator
+
+from services.event_manager import EventCollection
+from services.event_model import parse_time
+
+
+def _interval(event: dict) -> tuple[int, int] | None:
+    """予定の時間帯を分の区間 [開始, 終了) にします（IntervalIndex と同じ扱い）。時刻がなければ None。"""
+    start = parse_time(event.get("start_time", ""))
+    if start is None:
+        return None
+    end = parse_time(event.get("end_time", ""))
+    if end is None or end <= start:
+        end = start + 1
+    return start, end
+
+
+def find_day_conflicts(day: list[dict]) -> list[tuple[str, str]]:
+    """
+    1 日分の予定から、時間が重なっている予定 ID の組をすべて返します。
+
+    開始時刻でソートし、終了時刻の早い順のヒープに「まだ終わっていない予定」を持ちながら走査します。
+    新しい予定は、その時点でヒープに残っている予定とだけ重なるので、総当たりせずに済みます
+    （O(n log n + 組の数)）。組は (先に始まる予定, 後から始まる予定) の順です。
+    """
+    items = sorted(
+        (interval[0], interval[1], event.get("id"))
+        for event in day
+        if (interval := _interval(event)) is not None
+    )
+    pairs = []
+    active = []  # (終了, ID)
+    for start, end, event_id in items:
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        pairs.extend((other_id, event_id) for _, other_id in active)
+        heapq.heappush(active, (end, event_id))
+    return pairs
+
+
+def scan_conflicts(items) -> dict[str, list[tuple[str, str]]]:
+    """
+    日付順の (日付, 予定) の並び（EventStore.iter_events() など）を 1 日ずつ調べ、
+    重なりのある日の 日付 → 予定 ID の組のリスト を返します。保持するのは 1 日分だけです。
+    """
+    result = {}
+    for date_str, group in groupby(items, key=lambda item: item[0]):
+        pairs = find_day_conflicts([event for _, event in group])
+        if pairs:
+            result[date_str] = pairs
+    return result
+
+
+class ConflictIndex:
+    """
+    日付ごとの重なりの組を持つ索引。
+
+    EventCollection の listener として登録すると、予定が追加・削除された日だけを
+    「要再計算」として印を付け、次に参照されたときにその日の分だけを計算し直します。
+    編集のたびにカレンダー全体を調べ直すことはありません。
+    """
+
+    def __init__(self, events: dict):
+        self.events = events
+        # 日付 → 重なっている予定 ID の組（重なりのない日は持たない）
+        self._conflicts = scan_conflicts((date_str, event)
+                                         for date_str in sorted(events) for event in events[date_str])
+        # 予定が変わってまだ計算し直していない日付
+        self._dirty = set()
+
+    # ─── EventCollection からの通知 ───
+    def on_event_added(self, date_str: str, data: dict) -> None:
+        self._dirty.add(date_str)
+
+    def on_event_removed(self, date_str: str, data: dict) -> None:
+        self._dirty.add(date_str)
+
+    def _refresh(self) -> None:
+        for date_str in self._dirty:
+            pairs = find_day_conflicts(self.events.get(date_str, []))
+            if pairs:
+                self._conflicts[date_str] = pairs
+            else:
+                self._conflicts.pop(date_str, None)
+        self._dirty.clear()
+
+    def conflicts_on(self, date_str: str) -> list[tuple[str, str]]:
+        """その日の重なっている予定 ID の組を返します。"""
+        self._refresh()
+        return self._conflicts.get(date_str, [])
+
+    def conflict_dates(self) -> list[str]:
+        """重なりのある日付を昇順に返します。"""
+        self._refresh()
+        return sorted(self._conflicts)
+
+    def iter_conflicts(self) -> Iterator[tuple[str, str, str]]:
+        """すべての重なりを (日付, 予定 ID, 予定 ID) として日付順に返します。"""
+        for date_str in self.conflict_dates():
+            for a, b in self._conflicts[date_str]:
+                yield date_str, a, b
+
+
+def get_conflict_index(events: dict) -> ConflictIndex:
+    """
+    events の重なり索引を返します。EventCollection なら一度だけ作って以後の変更に追従させ、
+    ただの dict ならその場で作ります。
+    """
+    if isinstance(events, EventCollection):
+        return events.get_index(ConflictIndex)
+    return ConflictIndex(events)
@@ -0,0 +1,74 @@
+# calendar_app/services/date_index.py
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterator
+
+from services.event_manager import EventCollection
+
+
+class DateKeyIndex:
+    """
+    予定のある日付キー（"YYYY-MM-DD"）をソート済み配列で持つ索引。
+
+    "YYYY-MM-DD" は文字列の順序がそのまま日付の順序なので、二分探索で
+    範囲の先頭と末尾を O(log n) で求められます。日付ごとの予定件数を数えておき、
+    最後の 1 件が消えたときだけ配列からキーを取り除きます。
+    EventCollection の listener として登録すると、予定の追加・更新・削除に追従します。
+    """
+
+    def __init__(self, events: dict | None = None):
+        # 日付キー → その日の予定件数
+        self._counts = {}
+        for date_str, day in (events or {}).items():
+            if day:
+                self._counts[date_str] = len(day)
+        # 予定のある日付キー（昇順）
+        self._keys = sorted(self._counts)
+
+    def __len__(self):
+        return len(self._keys)
+
+    # ─── EventCollection からの通知 ───
+    def on_event_added(self, date_str: str, data: dict) -> None:
+        count = self._counts.get(date_str, 0)
+        if count == 0:
+            insort(self._keys, date_str)
+        self._counts[date_str] = count + 1
+
+    def on_event_removed(self, date_str: str, data: dict) -> None:
+        count = self._counts.get(date_str, 0)
+        if count <= 1:
+            self._counts.pop(date_str, None)
+            i = bisect_left(self._keys, date_str)
+            if i < len(self._keys) and self._keys[i] == date_str:
+                self._keys.pop(i)
+        else:
+            self._counts[date_str] = count - 1
+
+    def keys_between(self, start: str, end: str) -> Iterator[str]:
+        """start 〜 end（両端を含む）の日付キーを昇順に 1 つずつ返します。"""
+        keys = self._keys
+        i = bisect_left(keys, start)
+        stop = bisect_right(keys, end)
+        # 呼び出し側が途中で予定を変更しても壊れないよう、範囲の部分だけを複製して回す
+        yield from keys[i:stop]
+
+
+def get_date_index(events: dict) -> DateKeyIndex:
+    """
+    events の日付キー索引を返します。EventCollection なら一度だけ作って以後の変更に追従させ、
+    ただの dict ならその場で作ります。
+    """
+    if isinstance(events, EventCollection):
+        return events.get_index(DateKeyIndex)
+    return DateKeyIndex(events)
+
+
+def iter_events_between(events: dict, start: str, end: str) -> Iterator[tuple[str, dict]]:
+    """
+    start 〜 end（"YYYY-MM-DD"、両端を含む）の予定を (日付, 予定) として日付順に返す
+    イテレータです。必要になった日の分だけ順に取り出すので、途中でやめれば残りは読みません。
+    """
+    for date_str in get_date_index(events).keys_between(start, end):
+        for event in events.get(date_str, ()):
+            yield date_str, event
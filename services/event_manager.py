@@ -1,32 +1,264 @@
 # calendar_app/services/event_manager.py
 
+import atexit
+import hashlib
 import json
 import os
+import queue
 import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from threading import Lock
+from typing import Iterator
+from services.binary_snapshot import dump_snapshot, load_snapshot
+from services.file_lock import process_lock
+from services.offset_index import OffsetIndex
 from utils.resource import resource_path
 
 # 書き込み対応のファイルパス
 EVENTS_FILE = resource_path("data/events.json", writable=True)
 
+# ジャーナルがこのサイズ（バイト）を超えたらバックグラウンドでスナップショットに畳み込む
+JOURNAL_COMPACT_THRESHOLD = 256 * 1024
+
+# events.json と同じ内容のバイナリ形式のスナップショット（events.bin）も書き出すか。
+# 起動時は events.json より新しくなければ（鮮度が合えば）こちらを読み込む。JSON は常に正本として残す
+BINARY_SNAPSHOT = True
+
+# 連続した変更をまとめて 1 回の書き込みにする待ち時間（秒）
+SAVE_DEBOUNCE_SEC = 0.25
+
 # 複数スレッドから同時に書き込むのを防ぐためロックを用意
 _FILE_LOCK = Lock()
 
+# メモリ上の events の変更とスナップショット用のシリアライズを排他するロック
+_DATA_LOCK = Lock()
+
+# 変更ごとの連番と、スナップショットに含まれている最後の連番
+_last_seq = 0
+_snapshot_seq = 0
+
+# load_events() が最後に読み込んだデータと、そのときのファイルの指紋
+_cache = {}
+
+# events.json のパス → 日付キーごとのバイト範囲の索引（iter_days_between() で使う）
+_offset_indexes = {}
+
+
+def _journal_path() -> str:
+    """
+    EVENTS_FILE と同じ場所に置くジャーナルファイルのパスを返します。
+    （例: events.json → events.journal）
+    """
+    return os.path.splitext(EVENTS_FILE)[0] + ".journal"
+
+
+def data_files() -> list[str]:
+    """予定の保存に使うファイル（スナップショットとジャーナル）のパス。変更の監視に使います。"""
+    return [EVENTS_FILE, _journal_path()]
+
+
+def _binary_path() -> str:
+    """バイナリ形式のスナップショットのパス（例: events.json → events.bin）"""
+    return os.path.splitext(EVENTS_FILE)[0] + ".bin"
+
+
+def _offset_index_path() -> str:
+    """日付キー → events.json 内のバイト範囲 の索引ファイル（例: events.json → events.idx）"""
+    return os.path.splitext(EVENTS_FILE)[0] + ".idx"
+
+
+def _lock_path() -> str:
+    """ほかのプロセスと排他するためのロックファイル（例: events.json → events.lock）"""
+    return os.path.splitext(EVENTS_FILE)[0] + ".lock"
+
+
+@contextmanager
+def _locked():
+    """
+    ファイルの読み書きを、同じプロセスのスレッド間（_FILE_LOCK）とほかのプロセス間
+    （ロックファイルの OS ロック）の両方で排他します。
+    複数のアプリや同期スクリプトが同じ events.json を使っても、互いの書き込みが混ざりません。
+    """
+    with _FILE_LOCK:
+        with process_lock(_lock_path()):
+            yield
+
+
+def _journal_size() -> int:
+    """ジャーナルファイルのサイズを返します。存在しなければ 0。"""
+    try:
+        return os.path.getsize(_journal_path())
+    except OSError:
+        return 0
+
 
 def load_events() -> dict:
     """
     イベントデータを JSON ファイルから読み込んで返します。
+    スナップショット(events.json)を読んだあと、ジャーナルの操作を順に再生します。
     ファイルがなければ空の dict、JSON が壊れていれば警告のうえ空の dict を返します。
+
+    前回読み込んだときからファイルの更新時刻・サイズ・内容のハッシュが変わっていなければ、
+    読み込み済みの同じ dict をそのまま返します（再パースしない）。
+    """
+    fingerprint = _fingerprint()
+    cached = _cache.get("events")
+    if cached is not None and _cache.get("fingerprint") == fingerprint:
+        return cached
+
+    with _locked():
+        # スナップショットとジャーナルを同じ時点の内容として読む
+        fingerprint = _fingerprint()
+        snapshot_stat = fingerprint[1]
+        # 鮮度の合うバイナリのスナップショットがあれば、JSON の代わりにそれを読む
+        snapshot = load_snapshot(_binary_path(), snapshot_stat) if BINARY_SNAPSHOT else None
+        snapshot_text = _read_snapshot_text() if snapshot is None else None
+        journal_text = _read_journal_text()
+    # バイナリを読んだときは JSON の中身がわからないので、その (更新時刻, サイズ) で代用する
+    snapshot_key = snapshot_text if snapshot is None else f"bin:{snapshot_stat}"
+    digest = hashlib.sha1(
+        (snapshot_key or "").encode("utf-8") + b"\0" + (journal_text or "").encode("utf-8")
+    ).hexdigest()
+    if cached is not None and _cache.get("digest") == digest:
+        # 更新時刻だけが変わった（内容は同じ）
+        _cache["fingerprint"] = fingerprint
+        return cached
+
+    if snapshot is not None:
+        events = EventCollection(snapshot)
+    else:
+        # バイナリは読み込みでは作らない（ロックの外で書き込みスレッドと競合しないよう、
+        # スナップショットを書き出す _write_snapshot() の中でだけ作る）
+        events = EventCollection(_parse_snapshot(snapshot_text))
+    if journal_text:
+        _replay_journal(events, journal_text)
+
+    _cache.clear()
+    _cache.update(events=events, fingerprint=fingerprint, digest=digest)
+    return events
+
+
+def iter_days_between(start: str, end: str) -> Iterator[tuple[str, list]]:
+    """
+    start 〜 end（"YYYY-MM-DD"、両端を含む）の予定を (日付キー, 予定リスト) として日付順に
+    1 日ずつ返すジェネレータです（保存には使わない読み取り専用のリストです）。
+    範囲全体をまとめて読み込まないので、途中でやめれば残りの日は読みません。
+
+    まだ load_events() で全体を読み込んでおらず、ジャーナルも空のとき（コマンドラインの
+    ツールなど）は、日付キーごとのバイト範囲の索引（events.idx）を使い、events.json の
+    該当する日の範囲だけを読んでデコードします。それ以外のときは load_events() の内容を
+    日付キー索引でたどります。
+    """
+    last = None
+    if _cache.get("events") is None:
+        index = _offset_indexes.get(EVENTS_FILE)
+        if index is None:
+            index = _offset_indexes[EVENTS_FILE] = OffsetIndex(EVENTS_FILE, _offset_index_path())
+        with _locked():
+            use_index = not _journal_size()
+        if use_index:
+            try:
+                for date_str, day in index.iter_between(start, end):
+                    assign_missing_ids(date_str, day)
+                    last = date_str
+                    yield date_str, day
+                return
+            except ValueError as e:
+                # 壊れた JSON は load_events() で警告のうえ空として扱う
+                print(f"[warning] 予定の索引を作成できませんでした: {e}", file=sys.stderr)
+    # date_index は EventCollection を使うので、循環しないようここで読み込む
+    from services.date_index import get_date_index
+
+    events = load_events()
+    # 全キーを走査せず、日付キー索引の二分探索で範囲のキーだけを取り出す
+    for date_str in get_date_index(events).keys_between(start, end):
+        # 索引から途中まで返していたら、その続きから返す
+        if last is not None and date_str <= last:
+            continue
+        day = events.get(date_str)
+        if day:
+            yield date_str, list(day)
+
+
+def invalidate_events_cache() -> None:
+    """load_events() が保持している読み込み済みデータを破棄します。"""
+    _cache.clear()
+
+
+def _fingerprint():
+    """
+    スナップショットとジャーナルの (更新時刻, サイズ) の組を返します。
+    存在しないファイルは None です。スナップショットがまだなくても、ジャーナルへの
+    追記（ほかのプロセスの変更）を検出できるよう、ジャーナルの状態は必ず含めます。
     """
+    try:
+        st = os.stat(EVENTS_FILE)
+        snapshot = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        snapshot = None
+    try:
+        jst = os.stat(_journal_path())
+        journal = (jst.st_mtime_ns, jst.st_size)
+    except OSError:
+        journal = None
+    return EVENTS_FILE, snapshot, journal
+
+
+def _is_stale(events: dict) -> bool:
+    """
+    events を読み込んだ（または自分が書き込んだ）あとに、ほかのプロセスがファイルを
+    変更していれば True を返します（楽観的なバージョンチェック。_locked() の中で呼ぶこと）。
+    """
+    return _cache.get("events") is events and _cache.get("fingerprint") != _fingerprint()
+
+
+def _mark_written(events: dict) -> None:
+    """
+    自分で書き込んだ直後に呼び出し、読み込み済みデータの指紋を更新します
+    （_FILE_LOCK 取得済みで呼ぶこと）。
+    メモリ上のデータはすでに書き込んだ内容を含んでいるので、次の load_events() で
+    自分の書き込みを外部の変更と誤認して再パースしないようにします。
+    """
+    if _cache.get("events") is events:
+        _cache["fingerprint"] = _fingerprint()
+        _cache["digest"] = None
+    else:
+        _cache.clear()
+
+
+def _read_snapshot_text() -> str | None:
+    """スナップショット(events.json)の中身を文字列で返します。ファイルがなければ None。"""
     try:
         with open(EVENTS_FILE, encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return data
-            # 形式が dict でない場合も空にフォールバック
-            return {}
+            return f.read()
     except FileNotFoundError:
         # ファイル未作成時は空データ
+        return None
+
+
+def _read_journal_text() -> str | None:
+    """ジャーナルの中身を文字列で返します。ファイルがなければ None。"""
+    if not _journal_size():
+        return None
+    try:
+        with open(_journal_path(), encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _parse_snapshot(text: str | None) -> dict:
+    """スナップショットの文字列を dict に変換します。"""
+    if text is None:
+        return {}
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data
+        # 形式が dict でない場合も空にフォールバック
         return {}
     except json.JSONDecodeError:
         # JSON 故障時の警告
@@ -34,15 +266,262 @@ def load_events() -> dict:
         return {}
 
 
-def save_events(events: dict) -> None:
+def _replay_journal(events: dict, journal_text: str) -> None:
     """
-    イベントデータを JSON ファイルに書き込みます。
-    必要に応じてディレクトリを作成し、 thread-safe に動作します。
+    ジャーナルの各行（1 操作 = 1 行の JSON）を events に順番に適用します。
+    書き込み途中でクラッシュした末尾の壊れた行は読み飛ばします。
     """
-    os.makedirs(os.path.dirname(EVENTS_FILE), exist_ok=True)
-    with _FILE_LOCK:
-        with open(EVENTS_FILE, "w", encoding="utf-8") as f:
-            json.dump(events, f, ensure_ascii=False, indent=2)
+    for line in journal_text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            print(f"[warning] ジャーナルの壊れた行を読み飛ばしました: {line[:40]}", file=sys.stderr)
+            continue
+        _apply_record(events, record)
+
+
+def _apply_record(events: dict, record: dict) -> None:
+    """ジャーナルの 1 レコードを events に適用します。"""
+    op = record.get("op")
+    if op == "add":
+        attach_event(events, record["date"], record["event"], record.get("position"))
+    elif op == "update":
+        replace_event(events, record["id"], record["event"])
+    elif op == "delete":
+        detach_event(events, record["id"])
+    elif op == "move":
+        removed = detach_event(events, record["id"])
+        if removed is not None:
+            attach_event(events, record["date"], removed[2])
+
+
+def save_events(events: dict) -> bool:
+    """
+    イベントデータを JSON ファイルに書き込みます（スナップショット全体の書き直し）。
+    一時ファイルへの書き込み→fsync→置き換えの順で行うため、途中でクラッシュしても
+    元のファイルが壊れることはありません。書き込んだ内容にはジャーナルの操作もすべて
+    含まれるため、ジャーナルは削除します。
+
+    読み込んだあとにほかのプロセスがファイルを変更していた場合は、その変更を
+    上書きしないよう書き込みを見送り False を返します（sync_external_changes() で
+    取り込んだあとなら書き込めます）。
+    """
+    return _write_snapshot(events)
+
+
+def atomic_write_text(path: str, text: str) -> None:
+    """
+    path と同じディレクトリの一時ファイルに書き込み、fsync してから置き換えます。
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_snapshot(events: dict) -> bool:
+    """
+    スナップショットを書き出してジャーナルを削除します。
+
+    メモリ上の変更と排他するのはシリアライズの間だけで、ディスクへの書き込み中も
+    UI スレッドは予定を変更できます。書き込み時点までに行われた変更の連番を覚えておき、
+    キューに残っている同じ操作がジャーナルに二重に書かれないようにします。
+    """
+    global _snapshot_seq
+    with _locked():
+        if _is_stale(events):
+            print("[warning] ほかのプロセスがイベントファイルを変更したため、"
+                  "スナップショットの書き込みを見送りました", file=sys.stderr)
+            return False
+        with _DATA_LOCK:
+            payload = json.dumps(events, ensure_ascii=False, indent=2)
+            seq = _last_seq
+            # 予定の dict は差し替えで更新されるので、リストだけ写せば書き込み時点の内容を保てる
+            frozen = {date_str: list(day) for date_str, day in events.items()} if BINARY_SNAPSHOT else None
+        atomic_write_text(EVENTS_FILE, payload)
+        if frozen is not None:
+            st = os.stat(EVENTS_FILE)
+            _write_binary_snapshot(frozen, (st.st_mtime_ns, st.st_size))
+        try:
+            os.remove(_journal_path())
+        except FileNotFoundError:
+            pass
+        _snapshot_seq = max(_snapshot_seq, seq)
+        _mark_written(events)
+    return True
+
+
+def _write_binary_snapshot(events: dict, source_stat: tuple[int, int]) -> None:
+    """
+    events.json と同じ内容をバイナリ形式で書き出します。失敗しても JSON が正本なので警告だけにします。
+    """
+    try:
+        dump_snapshot(_binary_path(), events, source_stat)
+    except (OSError, ValueError) as e:
+        print(f"[warning] バイナリのスナップショットを書き出せませんでした: {e}", file=sys.stderr)
+
+
+def _next_seq() -> int:
+    """メモリ上の変更ごとの連番を払い出します（_DATA_LOCK 取得済みで呼ぶこと）。"""
+    global _last_seq
+    _last_seq += 1
+    return _last_seq
+
+
+class _EventWriter:
+    """
+    ジャーナルへの書き込みを担当するバックグラウンドスレッド。
+
+    UI スレッドはキューに操作を積むだけで戻り、このスレッドが SAVE_DEBOUNCE_SEC の間に
+    積まれた操作をまとめて 1 回の追記＋fsync で書き込みます。ジャーナルがしきい値を
+    超えたら、同じスレッドでスナップショットへの畳み込みも行います。
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = None
+        self._start_lock = Lock()
+
+    def submit(self, events: dict, record: dict, seq: int) -> None:
+        self._ensure_started()
+        self.queue.put((events, record, seq))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """キューに積まれた操作がすべて書き込まれるまで待ちます。"""
+        if self.thread is None:
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+                self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch, waiters = self._collect(self.queue.get())
+            try:
+                if batch:
+                    self._write(batch)
+            except Exception as e:
+                print(f"[ERROR] イベントの保存に失敗しました: {e}", file=sys.stderr)
+            for done in waiters:
+                done.set()
+
+    def _collect(self, first):
+        """最初の操作から SAVE_DEBOUNCE_SEC の間に積まれた操作を 1 つのバッチにまとめます。"""
+        batch, waiters = [], []
+        item = first
+        deadline = time.monotonic() + SAVE_DEBOUNCE_SEC
+        while True:
+            if isinstance(item, threading.Event):
+                # flush 要求があれば待たずにすぐ書き込む
+                waiters.append(item)
+                deadline = 0
+            else:
+                batch.append(item)
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                return batch, waiters
+
+    def _write(self, batch) -> None:
+        with _locked():
+            # ほかのプロセスの変更があっても、操作の追記はそのまま行える（ID で適用されるため）。
+            # ただしその場合は読み込み済みの版を更新せず、sync_external_changes() に取り込ませる
+            stale = _is_stale(batch[-1][0])
+            lines = [
+                json.dumps(record, ensure_ascii=False) + "\n"
+                for _, record, seq in batch
+                # すでにスナップショットに含まれている操作は書かない
+                if seq > _snapshot_seq
+            ]
+            if lines:
+                path = _journal_path()
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if not stale:
+                    _mark_written(batch[-1][0])
+        if _journal_size() > JOURNAL_COMPACT_THRESHOLD:
+            compact_journal(batch[-1][0])
+
+
+_writer = _EventWriter()
+
+
+def flush_pending_saves(timeout: float | None = None) -> bool:
+    """
+    まだ書き込まれていない変更をすべてディスクに書き出すまで待ちます。
+    ウィンドウを閉じるときなど、終了前に必ず呼び出してください。
+    """
+    return _writer.flush(timeout)
+
+
+atexit.register(flush_pending_saves, 5.0)
+
+
+def _append_journal(events: dict, record: dict) -> None:
+    """
+    1 件の操作をジャーナル書き込みスレッドに渡します（_DATA_LOCK 取得済みで呼ぶこと）。
+    実際の追記は少し遅れてまとめて行われます。
+    """
+    _writer.submit(events, record, _next_seq())
+
+
+def sync_external_changes(events: dict) -> set[str]:
+    """
+    ほかのプロセスが events.json やジャーナルを変更していれば読み直し、
+    変わった予定だけを events に取り込みます（追加・更新・移動・削除）。
+    影響を受けた日付キーの集合を返します。変更がなければ空集合です。
+
+    自分の書き込み待ちの変更を先にファイルへ書き出してから比較するため、
+    UI スレッドから呼び出してください。
+    """
+    if _cache.get("events") is not events:
+        return set()
+    if _cache.get("fingerprint") == _fingerprint():
+        return set()
+
+    flush_pending_saves()
+    with _locked():
+        fingerprint = _fingerprint()
+        snapshot_text = _read_snapshot_text()
+        journal_text = _read_journal_text()
+    fresh = EventCollection(_parse_snapshot(snapshot_text))
+    if journal_text:
+        _replay_journal(fresh, journal_text)
+
+    with _DATA_LOCK:
+        affected = merge_events(events, fresh)
+    if _cache.get("events") is events:
+        _cache["fingerprint"] = fingerprint
+        _cache["digest"] = None
+    return affected
+
+
+def compact_journal(events: dict) -> None:
+    """
+    現在のイベントデータをスナップショットとして書き出し、ジャーナルを畳み込みます。
+    """
+    _write_snapshot(events)
+
+
+def new_event_id() -> str:
+    """新しい予定 ID を払い出します。"""
+    return uuid.uuid4().hex
 
 
 def add_event(events: dict,
@@ -50,65 +529,290 @@ def add_event(events: dict,
               title: str,
               start_time: str = "",
               end_time: str = "",
-              memo: str = "") -> None:
+              memo: str = "") -> str:
     """
-    新しい予定を events に追加して保存します。
+    新しい予定を events に追加し、ジャーナルに記録します。
+    追加した予定の ID を返します。
 
     - date_str: "YYYY-MM-DD" 形式の日付キー
     - title: イベントタイトル
     - start_time, end_time: "HH:MM" 形式
     - memo: 任意のメモ文字列
     """
-    # 同じキーのリストに追加
-    events.setdefault(date_str, []).append({
+    event = {
+        "id":          new_event_id(),
         "title":       title,
         "start_time":  start_time,
         "end_time":    end_time,
         "memo":        memo
-    })
-    save_events(events)
+    }
+    with _DATA_LOCK:
+        # 同じキーのリストに追加
+        attach_event(events, date_str, event)
+        _append_journal(events, {"op": "add", "date": date_str, "event": event})
+    return event["id"]
 
 
-def delete_event(events: dict, date_str: str, index: int) -> None:
+def add_events(events: dict, items) -> int:
     """
-    指定の日(date_str)のイベントリストから index 番目を削除し、空になればキーごと削除して保存します。
+    (日付, 予定 dict) の組をまとめて events に追加し、最後に 1 回だけスナップショットを
+    書き出します。インポートなど大量の追加で、1 件ごとに書き込まないようにするためです。
+    events にすでにある ID の予定は追加しません。追加した件数を返します。
     """
-    if date_str in events and 0 <= index < len(events[date_str]):
-        events[date_str].pop(index)
-        if not events[date_str]:
-            del events[date_str]
-        save_events(events)
+    added = []
+    with _DATA_LOCK:
+        for date_str, event in items:
+            if not event.get("id"):
+                event["id"] = new_event_id()
+            elif find_event(events, event["id"]) is not None:
+                continue
+            attach_event(events, date_str, event)
+            added.append((date_str, event))
+        if added:
+            _next_seq()
+    if added and not save_events(events):
+        # ほかのプロセスの変更と衝突したときは、追加操作としてジャーナルに記録する
+        with _DATA_LOCK:
+            for date_str, event in added:
+                _append_journal(events, {"op": "add", "date": date_str, "event": event})
+    return len(added)
+
+
+def restore_event(events: dict, date_str: str, event: dict, position: int | None = None) -> bool:
+    """
+    削除した予定を同じ ID のまま元の位置に戻し、ジャーナルに記録します（元に戻す操作で使う）。
+    同じ ID の予定がすでにあれば何もせず False を返します。
+    """
+    with _DATA_LOCK:
+        if find_event(events, event["id"]) is not None:
+            return False
+        attach_event(events, date_str, event, position)
+        _append_journal(events, {"op": "add", "date": date_str, "event": event, "position": position})
+    return True
+
+
+def delete_event(events: dict, event_id: str) -> bool:
+    """
+    指定した ID の予定を削除し、その日の予定が空になればキーごと削除して
+    ジャーナルに記録します。削除できたら True を返します。
+    """
+    with _DATA_LOCK:
+        if detach_event(events, event_id) is None:
+            return False
+        _append_journal(events, {"op": "delete", "id": event_id})
+    return True
 
-        
-# calendar_app/services/event_manager.py (抜粋 - 追加する可能性のある関数)
-# ...既存の import と関数...
 
 def update_event(events: dict,
-                 date_str: str,
-                 index: int,
+                 event_id: str,
                  title: str,
                  start_time: str = "",
                  end_time: str = "",
-                 memo: str = "") -> None:
+                 memo: str = "") -> bool:
     """
-    既存のイベントを更新し、保存します。
+    既存のイベントを更新し、ジャーナルに記録します。更新できたら True を返します。
 
     - events: 現在のイベントデータ辞書
-    - date_str: "YYYY-MM-DD" 形式の日付キー
-    - index: その日付のイベントリスト内でのインデックス
+    - event_id: 更新する予定の ID
     - title: 新しいイベントタイトル
     - start_time, end_time: "HH:MM" 形式
     - memo: 任意のメモ文字列
     """
-    if date_str in events and 0 <= index < len(events[date_str]):
-        # イベントデータを更新
-        events[date_str][index] = {
-            "title":      title,
-            "start_time": start_time,
-            "end_time":   end_time,
-            "memo":       memo
-        }
-        save_events(events)
+    # イベントデータを更新
+    event = {
+        "id":         event_id,
+        "title":      title,
+        "start_time": start_time,
+        "end_time":   end_time,
+        "memo":       memo
+    }
+    with _DATA_LOCK:
+        if replace_event(events, event_id, event):
+            _append_journal(events, {"op": "update", "id": event_id, "event": event})
+            return True
+    # 存在しないイベントを更新しようとした場合の処理（エラーログなど）
+    print(f"[warning] イベントの更新に失敗しました: ID {event_id} が見つかりません。", file=sys.stderr)
+    return False
+
+
+def move_event(events: dict, event_id: str, new_date: str) -> bool:
+    """
+    指定した ID の予定を別の日付へ移動し、ジャーナルに記録します。移動できたら True を返します。
+    """
+    with _DATA_LOCK:
+        removed = detach_event(events, event_id)
+        if removed is None:
+            return False
+        attach_event(events, new_date, removed[2])
+        _append_journal(events, {"op": "move", "id": event_id, "date": new_date})
+    return True
+
+
+# ────────────────────────────────────────────────────────────
+# メモリ上の events の操作（保存は行わない）
+# ────────────────────────────────────────────────────────────
+
+class EventCollection(dict):
+    """
+    日付キー("YYYY-MM-DD") → 予定リスト の辞書。
+
+    通常の dict としてそのまま JSON に書き出せるうえ、予定の "id" から
+    (日付, 予定) を引ける索引 by_id を持ちます。予定の追加・削除は
+    attach_event / detach_event などを通して行い、索引と常に同期させます。
+    """
+
+    def __init__(self, data: dict | None = None):
+        super().__init__()
+        self.by_id = {}
+        # 予定の追加・削除を通知する相手（on_event_added / on_event_removed を持つ）
+        self._listeners = []
+        # get_index() で作成した索引
+        self._indexes = {}
+        # 作成時はまだ listener がいないので、attach_event を 1 件ずつ呼ばずにまとめて登録する
+        for date_str, day in (data or {}).items():
+            if not day:
+                continue
+            assign_missing_ids(date_str, day)
+            self[date_str] = list(day)
+            self.by_id.update((event["id"], (date_str, event)) for event in day)
+
+    def add_listener(self, listener) -> None:
+        """予定が追加・削除されるたびに通知を受け取るオブジェクトを登録します。"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def get_index(self, factory):
+        """
+        factory(self) で作った索引を 1 つだけ作成してキャッシュし、返します。
+        索引は listener として登録され、以後の変更に追従します。
+        """
+        index = self._indexes.get(factory)
+        if index is None:
+            index = factory(self)
+            self._indexes[factory] = index
+            self.add_listener(index)
+        return index
+
+    def _notify_added(self, date_str: str, event: dict) -> None:
+        for listener in self._listeners:
+            listener.on_event_added(date_str, event)
+
+    def _notify_removed(self, date_str: str, event: dict) -> None:
+        for listener in self._listeners:
+            listener.on_event_removed(date_str, event)
+
+
+def merge_events(events: dict, fresh: dict) -> set[str]:
+    """
+    events を fresh（ファイルから読み直した内容）と同じになるよう、差分だけ更新します。
+    予定は ID で対応づけ、影響を受けた日付キーの集合を返します（保存は行わない）。
+    """
+    affected = set()
+    fresh_by_id = {}
+    for date_str, day in fresh.items():
+        for event in day:
+            fresh_by_id[event.get("id")] = (date_str, event)
+
+    for event_id, (date_str, _) in list(_iter_by_id(events)):
+        if event_id not in fresh_by_id:
+            detach_event(events, event_id)
+            affected.add(date_str)
+
+    for event_id, (date_str, event) in fresh_by_id.items():
+        current = find_event(events, event_id)
+        if current is None:
+            attach_event(events, date_str, dict(event))
+            affected.add(date_str)
+        elif current[0] != date_str:
+            detach_event(events, event_id)
+            attach_event(events, date_str, dict(event))
+            affected.update((current[0], date_str))
+        elif current[1] != event:
+            replace_event(events, event_id, dict(event))
+            affected.add(date_str)
+    return affected
+
+
+def _iter_by_id(events: dict):
+    """events の予定を (ID, (日付, 予定)) として返します。"""
+    if isinstance(events, EventCollection):
+        return events.by_id.items()
+    return ((event.get("id"), (date_str, event)) for date_str, day in events.items() for event in day)
+
+
+def assign_missing_ids(date_str: str, day: list) -> None:
+    """
+    ID を持たない旧形式の予定に ID を付けます。
+
+    ID は日付と内容から決まるため、スナップショットに ID が保存されるまでは
+    何度読み込んでも同じ ID になり、ジャーナルの操作もそのまま適用できます。
+    """
+    seen = {}
+    for event in day:
+        if event.get("id"):
+            continue
+        base = date_str + json.dumps(event, ensure_ascii=False, sort_keys=True)
+        n = seen.get(base, 0)
+        seen[base] = n + 1
+        event["id"] = hashlib.sha1(f"{base}#{n}".encode("utf-8")).hexdigest()[:32]
+
+
+def find_event(events: dict, event_id: str) -> tuple[str, dict] | None:
+    """ID から (日付, 予定) を返します。見つからなければ None。"""
+    if isinstance(events, EventCollection):
+        return events.by_id.get(event_id)
+    for date_str, day in events.items():
+        for event in day:
+            if event.get("id") == event_id:
+                return date_str, event
+    return None
+
+
+def attach_event(events: dict, date_str: str, event: dict, position: int | None = None) -> None:
+    """予定をその日のリストに加えます（position 省略時は末尾）。"""
+    day = events.setdefault(date_str, [])
+    if position is None:
+        day.append(event)
     else:
-        # 存在しないイベントを更新しようとした場合の処理（エラーログなど）
-        print(f"[warning] イベントの更新に失敗しました: 日付 {date_str}, インデックス {index} が見つかりません。", file=sys.stderr)
+        day.insert(position, event)
+    if isinstance(events, EventCollection):
+        events.by_id[event["id"]] = (date_str, event)
+        events._notify_added(date_str, event)
+
+
+def detach_event(events: dict, event_id: str) -> tuple[str, int, dict] | None:
+    """
+    予定を取り除き、(日付, 元の位置, 予定) を返します。見つからなければ None。
+    その日の予定が空になれば日付キーも削除します。
+    """
+    found = find_event(events, event_id)
+    if found is None:
+        return None
+    date_str, event = found
+    day = events[date_str]
+    index = next(i for i, ev in enumerate(day) if ev is event)
+    day.pop(index)
+    if not day:
+        del events[date_str]
+    if isinstance(events, EventCollection):
+        del events.by_id[event_id]
+        events._notify_removed(date_str, event)
+    return date_str, index, event
+
+
+def replace_event(events: dict, event_id: str, event: dict) -> bool:
+    """同じ日付・同じ位置のまま予定の内容を差し替えます。"""
+    found = find_event(events, event_id)
+    if found is None:
+        return False
+    date_str, old = found
+    day = events[date_str]
+    day[next(i for i, ev in enumerate(day) if ev is old)] = event
+    if isinstance(events, EventCollection):
+        events.by_id[event_id] = (date_str, event)
+        events._notify_removed(date_str, old)
+        events._notify_added(date_str, event)
+    return True
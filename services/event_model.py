@@ -0,0 +1,132 @@
+# calendar_app/services/event_model.py
+
+import re
+import sys
+from datetime import date
+
+# "HH:MM" 形式（events.json に保存されている形）
+_TIME_RE = re.compile(r"^([01]\d|2[0-3]):([0-5]\d)$")
+
+# 予定のタイトルの選択肢（入力画面のコンボボックスや統計の分類に使う）
+TITLE_CHOICES = [
+    "会議/打合せ",
+    "来客",
+    "外出",
+    "出張",
+    "休暇",
+    "私用",
+    "その他"
+]
+
+# よく使うタイトルはあらかじめ intern しておき、全予定で同じ文字列オブジェクトを共有する
+_TITLES = {title: sys.intern(title) for title in TITLE_CHOICES}
+
+
+def parse_time(text: str) -> int | None:
+    """
+    "HH:MM" を 0 時からの分数に変換します。
+    空文字や "HH:MM" 以外の文字列は None を返します。
+    """
+    m = _TIME_RE.match(text or "")
+    if not m:
+        return None
+    return int(m.group(1)) * 60 + int(m.group(2))
+
+
+def format_time(minutes: int | None) -> str:
+    """分数を "HH:MM" に戻します。None は空文字。"""
+    if minutes is None:
+        return ""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def intern_title(title: str) -> str:
+    """タイトル文字列を intern して返します（同じタイトルはメモリ上で 1 つだけになる）。"""
+    return _TITLES.get(title) or sys.intern(title)
+
+
+class Event:
+    """
+    1 件の予定を表すコンパクトなクラス。
+
+    - ordinal: 日付（date.toordinal() の値）
+    - start, end: 0 時からの分数（時刻なしは None）
+    - title: intern 済みのタイトル
+    events.json の dict 形式とは from_dict() / to_dict() で相互に変換できます。
+    """
+
+    __slots__ = ("id", "ordinal", "start", "end", "title", "memo", "_raw_times")
+
+    def __init__(self, id: str, ordinal: int, start: int | None, end: int | None,
+                 title: str, memo: str = ""):
+        self.id = id
+        self.ordinal = ordinal
+        self.start = start
+        self.end = end
+        self.title = intern_title(title)
+        self.memo = memo
+        # "HH:MM" として解釈できなかった時刻の元の文字列（通常は None）
+        self._raw_times = None
+
+    @classmethod
+    def from_dict(cls, date_str: str, data: dict) -> "Event":
+        """events.json 形式の予定 dict から生成します。"""
+        start_text = data.get("start_time", "")
+        end_text = data.get("end_time", "")
+        event = cls(
+            data.get("id"),
+            date.fromisoformat(date_str).toordinal(),
+            parse_time(start_text),
+            parse_time(end_text),
+            data.get("title", ""),
+            data.get("memo", ""),
+        )
+        # 自由入力された時刻など、分数に変換すると元に戻せないものはそのまま保持する
+        if format_time(event.start) != start_text or format_time(event.end) != end_text:
+            event._raw_times = (start_text, end_text)
+        return event
+
+    def to_dict(self) -> dict:
+        """events.json 形式の予定 dict に戻します。"""
+        if self._raw_times is not None:
+            start_text, end_text = self._raw_times
+        else:
+            start_text, end_text = format_time(self.start), format_time(self.end)
+        return {
+            "id":         self.id,
+            "title":      self.title,
+            "start_time": start_text,
+            "end_time":   end_text,
+            "memo":       self.memo,
+        }
+
+    @property
+    def date_str(self) -> str:
+        """"YYYY-MM-DD" 形式の日付"""
+        return date.fromordinal(self.ordinal).isoformat()
+
+    @property
+    def duration(self) -> int:
+        """所要時間（分）。開始・終了のどちらかがなければ 0。"""
+        if self.start is None or self.end is None:
+            return 0
+        return max(self.end - self.start, 0)
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return self.ordinal == other.ordinal and self.to_dict() == other.to_dict()
+
+    # 属性を書き換えられる（可変な）クラスなので、ハッシュ化はできないことを明示する
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"Event({self.date_str} {format_time(self.start)}-{format_time(self.end)} "
+                f"{self.title!r}, id={self.id!r})")
+
+
+def iter_events(events: dict):
+    """events（日付キー → 予定 dict のリスト）を Event として順に返します。"""
+    for date_str, day in events.items():
+        for data in day:
+            yield Event.from_dict(date_str, data)
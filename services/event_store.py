@@ -0,0 +1,531 @@
+# calendar_app/services/event_store.py
+
+import json
+import os
+import sqlite3
+import sys
+from typing import Iterator
+
+from services import event_manager
+
+
+# 範囲を省略したときの下限・上限
+MIN_DATE = "0001-01-01"
+MAX_DATE = "9999-12-31"
+
+
+class EventStore:
+    """
+    イベントの保存先を差し替えるための共通インターフェース。
+
+    各メソッドは event_manager の関数と同じ引数を取り、
+    呼び出し側が保持している events 辞書も同時に更新します。
+    """
+
+    def load_events(self, start: str | None = None, end: str | None = None) -> dict:
+        """
+        start〜end（"YYYY-MM-DD"、両端を含む）のイベントを読み込んで返します。
+        範囲を省略した場合は全件を返します。
+        """
+        raise NotImplementedError
+
+    def iter_events(self, start: str | None = None, end: str | None = None) -> Iterator[tuple[str, dict]]:
+        """
+        start〜end の予定を (日付, 予定) として日付順に 1 件ずつ返します。
+        エクスポートなど、全件を一度にメモリに載せたくない処理で使います。
+        """
+        raise NotImplementedError
+
+    def add_event(self, events: dict, date_str: str, title: str,
+                  start_time: str = "", end_time: str = "", memo: str = "") -> str:
+        """予定を追加し、払い出した ID を返します。"""
+        raise NotImplementedError
+
+    def add_events(self, events: dict, items) -> int:
+        """
+        (日付, 予定 dict) の組をまとめて追加し、1 回の書き込み（コミット）で保存します。
+        すでにある ID の予定は追加しません。追加した件数を返します。
+        """
+        raise NotImplementedError
+
+    def restore_event(self, events: dict, date_str: str, event: dict, position: int | None = None) -> bool:
+        """削除した予定を同じ ID のまま、その日の position 番目に戻します。"""
+        raise NotImplementedError
+
+    def update_event(self, events: dict, event_id: str, title: str,
+                     start_time: str = "", end_time: str = "", memo: str = "") -> bool:
+        raise NotImplementedError
+
+    def delete_event(self, events: dict, event_id: str) -> bool:
+        raise NotImplementedError
+
+    def move_event(self, events: dict, event_id: str, new_date: str) -> bool:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """保存先のリソースを解放します。"""
+
+
+class JsonEventStore(EventStore):
+    """従来の events.json（＋ジャーナル）を保存先とするストア"""
+
+    def load_events(self, start=None, end=None) -> dict:
+        # JSON は 1 ファイルなので範囲に関係なく全件を返す
+        # （部分的な辞書を渡すとコンパクション時に範囲外の予定が失われるため）
+        return event_manager.load_events()
+
+    def iter_events(self, start=None, end=None):
+        # 範囲の有無にかかわらず 1 日ずつ読む（読み込み済みならその dict を日付索引でたどり、
+        # まだ全体を読み込んでいないときは、その日の分だけを events.json から読む）
+        days = event_manager.iter_days_between(start or MIN_DATE, end or MAX_DATE)
+        return ((date_str, event) for date_str, day in days for event in day)
+
+    def add_event(self, events, date_str, title, start_time="", end_time="", memo=""):
+        return event_manager.add_event(events, date_str, title, start_time, end_time, memo)
+
+    def add_events(self, events, items):
+        return event_manager.add_events(events, items)
+
+    def restore_event(self, events, date_str, event, position=None):
+        return event_manager.restore_event(events, date_str, event, position)
+
+    def update_event(self, events, event_id, title, start_time="", end_time="", memo=""):
+        return event_manager.update_event(events, event_id, title, start_time, end_time, memo)
+
+    def delete_event(self, events, event_id):
+        return event_manager.delete_event(events, event_id)
+
+    def move_event(self, events, event_id, new_date):
+        return event_manager.move_event(events, event_id, new_date)
+
+
+class SqliteEventStore(EventStore):
+    """
+    SQLite（WAL モード）を保存先とするストア。
+    日付＋開始時刻のインデックスにより、表示中の月の行だけを読み込めます。
+    """
+
+    def __init__(self, db_path: str | None = None):
+        self.db_path = db_path or default_db_path()
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                id         INTEGER PRIMARY KEY,
+                date       TEXT    NOT NULL,
+                position   INTEGER NOT NULL,
+                title      TEXT    NOT NULL,
+                start_time TEXT    NOT NULL DEFAULT '',
+                end_time   TEXT    NOT NULL DEFAULT '',
+                memo       TEXT    NOT NULL DEFAULT '',
+                uid        TEXT
+            )
+            """
+        )
+        self._migrate_schema()
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_events_date_start ON events (date, start_time)"
+        )
+        self.conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_events_uid ON events (uid)")
+        self.conn.commit()
+
+    def _migrate_schema(self) -> None:
+        """予定 ID(uid) 列のない古いデータベースに列を追加し、ID を割り当てます。"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(events)")}
+        if "uid" not in columns:
+            self.conn.execute("ALTER TABLE events ADD COLUMN uid TEXT")
+        self.conn.execute("UPDATE events SET uid = lower(hex(randomblob(16))) WHERE uid IS NULL")
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM events LIMIT 1").fetchone() is None
+
+    def load_events(self, start=None, end=None) -> dict:
+        sql = "SELECT date, uid, title, start_time, end_time, memo FROM events"
+        params = ()
+        if start is not None and end is not None:
+            sql += " WHERE date BETWEEN ? AND ?"
+            params = (start, end)
+        sql += " ORDER BY date, position"
+
+        events = event_manager.EventCollection()
+        for date_str, uid, title, st, et, memo in self.conn.execute(sql, params):
+            event_manager.attach_event(events, date_str, {
+                "id": uid, "title": title, "start_time": st, "end_time": et, "memo": memo
+            })
+        return events
+
+    def iter_events(self, start=None, end=None):
+        # カーソルから 1 行ずつ取り出す（別の接続を使い、書き込み中の UI 操作と干渉しない）
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                """
+                SELECT date, uid, title, start_time, end_time, memo FROM events
+                WHERE date BETWEEN ? AND ? ORDER BY date, position
+                """,
+                (start or MIN_DATE, end or MAX_DATE),
+            )
+            for date_str, uid, title, st, et, memo in rows:
+                yield date_str, {
+                    "id": uid, "title": title, "start_time": st, "end_time": et, "memo": memo
+                }
+        finally:
+            conn.close()
+
+    def add_event(self, events, date_str, title, start_time="", end_time="", memo=""):
+        event = {
+            "id": event_manager.new_event_id(),
+            "title": title, "start_time": start_time, "end_time": end_time, "memo": memo
+        }
+        with self.conn:
+            self._insert(date_str, event)
+        event_manager.attach_event(events, date_str, event)
+        return event["id"]
+
+    def add_events(self, events, items):
+        count = 0
+        with self.conn:
+            for date_str, event in items:
+                if not event.get("id"):
+                    event["id"] = event_manager.new_event_id()
+                elif self.conn.execute("SELECT 1 FROM events WHERE uid = ?", (event["id"],)).fetchone():
+                    continue
+                self._insert(date_str, event)
+                event_manager.attach_event(events, date_str, event)
+                count += 1
+        return count
+
+    def restore_event(self, events, date_str, event, position=None):
+        if self.conn.execute("SELECT 1 FROM events WHERE uid = ?", (event["id"],)).fetchone():
+            return False
+        with self.conn:
+            # position 列は連番とは限らないので、その日の position 番目の行の値に差し込む
+            row = None if position is None else self.conn.execute(
+                "SELECT position FROM events WHERE date = ? ORDER BY position LIMIT 1 OFFSET ?",
+                (date_str, position),
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE events SET position = position + 1 WHERE date = ? AND position >= ?",
+                    (date_str, row[0]),
+                )
+            self._insert(date_str, event, None if row is None else row[0])
+        event_manager.attach_event(events, date_str, event, None if row is None else position)
+        return True
+
+    def update_event(self, events, event_id, title, start_time="", end_time="", memo=""):
+        with self.conn:
+            cur = self.conn.execute(
+                "UPDATE events SET title = ?, start_time = ?, end_time = ?, memo = ? WHERE uid = ?",
+                (title, start_time, end_time, memo, event_id),
+            )
+        if cur.rowcount == 0:
+            print(f"[warning] イベントの更新に失敗しました: ID {event_id} が見つかりません。", file=sys.stderr)
+            return False
+        event_manager.replace_event(events, event_id, {
+            "id": event_id, "title": title, "start_time": start_time, "end_time": end_time, "memo": memo
+        })
+        return True
+
+    def delete_event(self, events, event_id):
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM events WHERE uid = ?", (event_id,))
+        event_manager.detach_event(events, event_id)
+        return cur.rowcount > 0
+
+    def move_event(self, events, event_id, new_date):
+        with self.conn:
+            cur = self.conn.execute(
+                """
+                UPDATE events
+                SET date = ?, position = (SELECT COALESCE(MAX(position) + 1, 0) FROM events WHERE date = ?)
+                WHERE uid = ?
+                """,
+                (new_date, new_date, event_id),
+            )
+        removed = event_manager.detach_event(events, event_id)
+        if removed is not None:
+            event_manager.attach_event(events, new_date, removed[2])
+        return cur.rowcount > 0
+
+    def close(self):
+        self.conn.close()
+
+    def _insert(self, date_str: str, event: dict, position: int | None = None) -> None:
+        """1 件の予定を挿入します（position 省略時はその日の末尾）。"""
+        self.conn.execute(
+            """
+            INSERT INTO events (date, position, title, start_time, end_time, memo, uid)
+            VALUES (?, COALESCE(?, (SELECT COALESCE(MAX(position) + 1, 0) FROM events WHERE date = ?)),
+                    ?, ?, ?, ?, ?)
+            """,
+            (date_str, position, date_str, event.get("title", ""), event.get("start_time", ""),
+             event.get("end_time", ""), event.get("memo", ""), event["id"]),
+        )
+
+
+class ShardedJsonEventStore(EventStore):
+    """
+    1 か月 = 1 ファイル（例: events/2025-07.json）に分割して保存するストア。
+
+    manifest.json には予定が存在する月の一覧だけを記録し、
+    読み込みは必要な月のシャードだけ、書き込みは変更のあった月のシャードだけを行います。
+    """
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or default_shard_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        # "YYYY-MM" -> EventCollection（読み込み済みのシャードのみ）
+        self._shards = {}
+        self.months = self._load_manifest()
+
+    def is_empty(self) -> bool:
+        return not self.months
+
+    def load_events(self, start=None, end=None) -> dict:
+        events = event_manager.EventCollection()
+        for month in sorted(self.months):
+            if start is not None and month < start[:7]:
+                continue
+            if end is not None and month > end[:7]:
+                continue
+            for date_str, day in self._shard(month).items():
+                if (start is None or date_str >= start) and (end is None or date_str <= end):
+                    # 予定そのものはシャードと共有し、リストは別々に持つ
+                    for event in day:
+                        event_manager.attach_event(events, date_str, event)
+        return events
+
+    def iter_events(self, start=None, end=None):
+        start, end = start or MIN_DATE, end or MAX_DATE
+        for month in sorted(self.months):
+            if not start[:7] <= month <= end[:7]:
+                continue
+            # 読み込み済みでない月はキャッシュせず、その月の分だけを読んで捨てる
+            shard = self._shards.get(month)
+            if shard is None:
+                try:
+                    with open(self._shard_path(month), encoding="utf-8") as f:
+                        shard = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    print(f"[warning] シャードの読み込みに失敗しました: {month}", file=sys.stderr)
+                    continue
+            for date_str in sorted(shard):
+                if start <= date_str <= end:
+                    for event in shard[date_str]:
+                        yield date_str, event
+
+    def add_event(self, events, date_str, title, start_time="", end_time="", memo=""):
+        event = {
+            "id": event_manager.new_event_id(),
+            "title": title, "start_time": start_time, "end_time": end_time, "memo": memo
+        }
+        event_manager.attach_event(self._shard(date_str[:7]), date_str, event)
+        event_manager.attach_event(events, date_str, event)
+        self._write_shard(date_str[:7])
+        return event["id"]
+
+    def add_events(self, events, items):
+        touched = set()
+        count = 0
+        for date_str, event in items:
+            month = date_str[:7]
+            shard = self._shard(month)
+            if not event.get("id"):
+                event["id"] = event_manager.new_event_id()
+            elif event["id"] in shard.by_id or self._month_of(events, event["id"]) is not None:
+                continue
+            event_manager.attach_event(shard, date_str, event)
+            event_manager.attach_event(events, date_str, event)
+            touched.add(month)
+            count += 1
+        # 変更のあった月のシャードを 1 回ずつ書き出す
+        for month in sorted(touched):
+            self._write_shard(month)
+        return count
+
+    def restore_event(self, events, date_str, event, position=None):
+        month = date_str[:7]
+        shard = self._shard(month)
+        if event["id"] in shard.by_id or self._month_of(events, event["id"]) is not None:
+            return False
+        event_manager.attach_event(shard, date_str, event, position)
+        event_manager.attach_event(events, date_str, event, position)
+        self._write_shard(month)
+        return True
+
+    def update_event(self, events, event_id, title, start_time="", end_time="", memo=""):
+        month = self._month_of(events, event_id)
+        if month is None:
+            print(f"[warning] イベントの更新に失敗しました: ID {event_id} が見つかりません。", file=sys.stderr)
+            return False
+        event = {
+            "id": event_id, "title": title, "start_time": start_time, "end_time": end_time, "memo": memo
+        }
+        event_manager.replace_event(self._shard(month), event_id, event)
+        event_manager.replace_event(events, event_id, event)
+        self._write_shard(month)
+        return True
+
+    def delete_event(self, events, event_id):
+        month = self._month_of(events, event_id)
+        if month is None:
+            return False
+        event_manager.detach_event(self._shard(month), event_id)
+        event_manager.detach_event(events, event_id)
+        self._write_shard(month)
+        return True
+
+    def move_event(self, events, event_id, new_date):
+        month = self._month_of(events, event_id)
+        if month is None:
+            return False
+        _, _, event = event_manager.detach_event(self._shard(month), event_id)
+        event_manager.attach_event(self._shard(new_date[:7]), new_date, event)
+        removed = event_manager.detach_event(events, event_id)
+        if removed is not None:
+            event_manager.attach_event(events, new_date, event)
+        self._write_shard(month)
+        if new_date[:7] != month:
+            self._write_shard(new_date[:7])
+        return True
+
+    def _month_of(self, events: dict, event_id: str) -> str | None:
+        """予定が入っている月を、呼び出し側の events か読み込み済みのシャードから探します。"""
+        found = event_manager.find_event(events, event_id)
+        if found is not None:
+            return found[0][:7]
+        for month, shard in self._shards.items():
+            if event_id in shard.by_id:
+                return month
+        return None
+
+    def _shard_path(self, month: str) -> str:
+        return os.path.join(self.directory, f"{month}.json")
+
+    def _shard(self, month: str) -> event_manager.EventCollection:
+        """月のシャードを返します（未読み込みならファイルから読み込む）。"""
+        if month not in self._shards:
+            data = {}
+            if month in self.months:
+                try:
+                    with open(self._shard_path(month), encoding="utf-8") as f:
+                        data = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    print(f"[warning] シャードの読み込みに失敗しました: {month}", file=sys.stderr)
+                    data = {}
+            self._shards[month] = event_manager.EventCollection(data)
+        return self._shards[month]
+
+    def _write_shard(self, month: str) -> None:
+        """変更のあった月のシャードだけを書き出し、月の増減があれば manifest も更新します。"""
+        shard = self._shards.get(month, {})
+        path = self._shard_path(month)
+        if shard:
+            _write_json(path, shard)
+            if month not in self.months:
+                self.months.add(month)
+                self._write_manifest()
+        else:
+            if os.path.exists(path):
+                os.remove(path)
+            if month in self.months:
+                self.months.discard(month)
+                self._write_manifest()
+
+    def _load_manifest(self) -> set:
+        try:
+            with open(os.path.join(self.directory, self.MANIFEST_NAME), encoding="utf-8") as f:
+                return set(json.load(f).get("months", []))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return set()
+
+    def _write_manifest(self) -> None:
+        _write_json(
+            os.path.join(self.directory, self.MANIFEST_NAME),
+            {"months": sorted(self.months)},
+        )
+
+
+def _write_json(path: str, data) -> None:
+    """一時ファイルに書いてから置き換えることで、書き込み途中のファイルを残さない"""
+    event_manager.atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def default_db_path() -> str:
+    """events.json と同じディレクトリに置く SQLite ファイルのパス"""
+    return os.path.join(os.path.dirname(event_manager.EVENTS_FILE), "events.db")
+
+
+def migrate_json_to_sqlite(store: SqliteEventStore, events: dict | None = None) -> int:
+    """
+    既存の events.json 形式のデータを SQLite ストアへ一括で移行します。
+    移行先がすでに空でない場合は何もしません。移行した件数を返します。
+    """
+    if not store.is_empty():
+        return 0
+    if events is None:
+        events = event_manager.load_events()
+
+    count = 0
+    with store.conn:
+        for date_str, day in events.items():
+            event_manager.assign_missing_ids(date_str, day)
+            for position, event in enumerate(day):
+                store._insert(date_str, event, position)
+                count += 1
+    return count
+
+
+def default_shard_dir() -> str:
+    """events.json と同じディレクトリに置く月別シャードのディレクトリ"""
+    return os.path.join(os.path.dirname(event_manager.EVENTS_FILE), "events")
+
+
+def migrate_json_to_shards(store: ShardedJsonEventStore, events: dict | None = None) -> int:
+    """
+    既存の events.json 形式のデータを月別シャードへ一括で移行します。
+    移行先がすでに空でない場合は何もしません。移行した件数を返します。
+    """
+    if not store.is_empty():
+        return 0
+    if events is None:
+        events = event_manager.load_events()
+
+    count = 0
+    for date_str, day in events.items():
+        event_manager.assign_missing_ids(date_str, day)
+        shard = store._shard(date_str[:7])
+        for event in day:
+            event_manager.attach_event(shard, date_str, event)
+        count += len(day)
+    for month in {date_str[:7] for date_str in events}:
+        store._write_shard(month)
+    return count
+
+
+def open_store(kind: str = "json") -> EventStore:
+    """
+    種類名からストアを生成します。
+    - "json": events.json（既定）
+    - "sqlite": events.db（初回は events.json の内容を移行）
+    - "shards": events/YYYY-MM.json（初回は events.json の内容を移行）
+    """
+    if kind == "shards":
+        store = ShardedJsonEventStore()
+        count = migrate_json_to_shards(store)
+        if count:
+            print(f"events.json から {count} 件の予定を月別ファイルに移行しました")
+        return store
+    if kind == "sqlite":
+        store = SqliteEventStore()
+        count = migrate_json_to_sqlite(store)
+        if count:
+            print(f"events.json から {count} 件の予定を SQLite に移行しました")
+        return store
+    return JsonEventStore()
@@ -0,0 +1,197 @@
+# calendar_app/services/exporter.py
+
+import csv
+import heapq
+import io
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator
+
+from services.recurrence import iter_occurrences
+
+# 書き出せる形式
+FORMATS = ("ics", "csv")
+
+# CSV の列
+CSV_COLUMNS = ["date", "start_time", "end_time", "title", "memo", "id"]
+
+_WEEKDAY_CODES = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+# 書き出す UID の末尾（UID は "<予定 ID>@calendar_app"）
+UID_SUFFIX = "@calendar_app"
+
+
+# ────────────────────────────────────────────────────────────
+# ICS
+# ────────────────────────────────────────────────────────────
+
+def _escape(text: str) -> str:
+    """TEXT 型の値として \\ ; , 改行をエスケープします。"""
+    return (text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """RFC 5545 に従い、1 行 75 オクテットを超える部分を折り返して CRLF を付けます。"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, chunk, size = [], "", 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        # 2 行目以降は先頭の空白 1 文字分を含めて 75 オクテット
+        if size + n > (75 if not parts else 74):
+            parts.append(chunk)
+            chunk, size = "", 0
+        chunk += ch
+        size += n
+    parts.append(chunk)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_date(date_str: str) -> str:
+    return date_str.replace("-", "")
+
+
+def _ics_datetime(date_str: str, time_str: str) -> str:
+    return f"{_ics_date(date_str)}T{time_str.replace(':', '')}00"
+
+
+def _vevent_lines(date_str: str, event: dict, stamp: str, rule: dict | None = None) -> Iterator[str]:
+    """1 件の予定（rule を渡すと繰り返し予定）の VEVENT の行を返します。"""
+    yield "BEGIN:VEVENT"
+    yield f"UID:{event.get('id')}{UID_SUFFIX}"
+    yield f"DTSTAMP:{stamp}"
+    start_time, end_time = event.get("start_time", ""), event.get("end_time", "")
+    if start_time:
+        yield f"DTSTART:{_ics_datetime(date_str, start_time)}"
+        if end_time and end_time > start_time:
+            yield f"DTEND:{_ics_datetime(date_str, end_time)}"
+    else:
+        # 時刻のない予定は終日の予定にする（DTEND は翌日）
+        next_day = (date.fromisoformat(date_str) + timedelta(days=1)).isoformat()
+        yield f"DTSTART;VALUE=DATE:{_ics_date(date_str)}"
+        yield f"DTEND;VALUE=DATE:{_ics_date(next_day)}"
+    if rule is not None:
+        yield f"RRULE:{_rrule(rule)}"
+        for exdate in rule.get("exdates") or ():
+            if start_time:
+                yield f"EXDATE:{_ics_datetime(exdate, start_time)}"
+            else:
+                yield f"EXDATE;VALUE=DATE:{_ics_date(exdate)}"
+    yield f"SUMMARY:{_escape(event.get('title', ''))}"
+    if event.get("memo"):
+        yield f"DESCRIPTION:{_escape(event['memo'])}"
+    yield "END:VEVENT"
+
+
+def _rrule(rule: dict) -> str:
+    """繰り返しルールを RRULE の値に変換します。"""
+    parts = [f"FREQ={rule['freq'].upper()}"]
+    if (rule.get("interval") or 1) > 1:
+        parts.append(f"INTERVAL={rule['interval']}")
+    weekdays = rule.get("weekdays")
+    if weekdays:
+        prefix = str(rule["nth"]) if rule.get("nth") else ""
+        parts.append("BYDAY=" + ",".join(prefix + _WEEKDAY_CODES[wd] for wd in weekdays))
+    if rule.get("monthday"):
+        parts.append(f"BYMONTHDAY={rule['monthday']}")
+    if rule.get("count"):
+        parts.append(f"COUNT={rule['count']}")
+    if rule.get("until"):
+        # DTSTART が日時なら UNTIL も日時で書く（RFC 5545）
+        suffix = "T235959" if rule.get("start_time") else ""
+        parts.append(f"UNTIL={_ics_date(rule['until'])}{suffix}")
+    return ";".join(parts)
+
+
+def iter_ics(items, rules=()) -> Iterator[str]:
+    """
+    (日付, 予定) の並びを iCalendar 形式の文字列として 1 行ずつ返します。
+    rules を渡すと、繰り返しルールを RRULE 付きの VEVENT として書き出します。
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield from map(_fold, ["BEGIN:VCALENDAR", "VERSION:2.0",
+                           "PRODID:-//calendar_app//Desktop Calendar//JA", "CALSCALE:GREGORIAN"])
+    for date_str, event in items:
+        for line in _vevent_lines(date_str, event, stamp):
+            yield _fold(line)
+    for rule in rules:
+        for line in _vevent_lines(rule["start"], rule, stamp, rule=rule):
+            yield _fold(line)
+    yield _fold("END:VCALENDAR")
+
+
+# ────────────────────────────────────────────────────────────
+# CSV
+# ────────────────────────────────────────────────────────────
+
+def iter_csv(items) -> Iterator[str]:
+    """(日付, 予定) の並びを、見出し行付きの CSV として 1 行ずつ返します。"""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\r\n")
+
+    def row(values):
+        writer.writerow(values)
+        line = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        return line
+
+    yield row(CSV_COLUMNS)
+    for date_str, event in items:
+        yield row([date_str] + [event.get(column, "") for column in CSV_COLUMNS[1:]])
+
+
+# ────────────────────────────────────────────────────────────
+# 書き出し
+# ────────────────────────────────────────────────────────────
+
+def guess_format(path: str) -> str:
+    """拡張子から形式を決めます（.csv 以外は ics）。"""
+    return "csv" if os.path.splitext(path)[1].lower() == ".csv" else "ics"
+
+
+def iter_export(store, fmt: str, start: str | None = None, end: str | None = None,
+                recurrences=None) -> Iterator[str]:
+    """
+    store の start〜end の予定を fmt（"ics" / "csv"）の文字列として少しずつ返すジェネレータです。
+
+    ICS では繰り返し予定をルールのまま（RRULE）書き出します。CSV には各回を展開して含めますが、
+    終わりのない繰り返しもあるため、end を指定したときだけ展開します。
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"未対応の形式です: {fmt}")
+    items = store.iter_events(start, end)
+    if fmt == "ics":
+        rules = recurrences.rules.values() if recurrences else ()
+        if start or end:
+            rules = [rule for rule in rules
+                     if (not end or rule["start"] <= end) and (not start or not rule.get("until")
+                                                              or rule["until"] >= start)]
+        return iter_ics(items, rules)
+    if recurrences and end:
+        occurrences = iter_occurrences(recurrences, start or _first_rule_start(recurrences), end)
+        items = heapq.merge(items, occurrences, key=lambda item: item[0])
+    return iter_csv(items)
+
+
+def _first_rule_start(recurrences) -> str:
+    """繰り返し予定を展開し始める日（最も早いルールの初回）"""
+    return min((rule["start"] for rule in recurrences.rules.values()), default="9999-12-31")
+
+
+def export_to_file(store, path: str, fmt: str | None = None, start: str | None = None,
+                   end: str | None = None, recurrences=None) -> None:
+    """
+    予定をファイルに書き出します。文書全体を組み立てずに 1 行ずつ書き込むので、
+    何年分を書き出してもメモリ使用量は一定です。CSV は Excel で開けるよう BOM 付き UTF-8 です。
+    """
+    fmt = fmt or guess_format(path)
+    lines = iter_export(store, fmt, start, end, recurrences)
+    encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+    tmp_path = path + ".tmp"
+    # newline="" で改行をそのまま（CRLF）書き込む
+    with open(tmp_path, "w", encoding=encoding, newline="") as f:
+        f.writelines(lines)
+    os.replace(tmp_path, path)
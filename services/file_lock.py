@@ -0,0 +1,62 @@
+# calendar_app/services/file_lock.py
+
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # Windows 以外
+    msvcrt = None
+
+
+@contextmanager
+def process_lock(lock_path: str):
+    """
+    lock_path のロックファイルを使って、ほかのプロセスと排他します（OS の助言ロック）。
+
+    Linux / macOS では fcntl.flock、Windows では msvcrt.locking を使います。
+    同じプロセス内のスレッド間の排他はしないので、threading.Lock と組み合わせて使ってください。
+    ロックファイルのディレクトリがない（まだ何も保存していない）ときは、ロックせずに進みます。
+    """
+    try:
+        # builtins.open ではなく os.open を使う（テストで open をモックしても影響しないように）
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    except FileNotFoundError:
+        yield
+        return
+    try:
+        _acquire(fd)
+        try:
+            yield
+        finally:
+            _release(fd)
+    finally:
+        os.close(fd)
+
+
+def _acquire(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                # LK_LOCK は約 10 秒で諦めて OSError になるので、取れるまで繰り返す
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.05)
+
+
+def _release(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,148 @@
+# calendar_app/services/file_watcher.py
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+# inotify のイベント（linux/inotify.h）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+# 変更が続いている間は通知を待つ時間（秒）。書き込みの途中で読み直さないようにする
+SETTLE_SEC = 0.2
+
+
+def _load_inotify():
+    """libc の inotify 関数を返します。使えない環境（Linux 以外など）では None。"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class FileWatcher:
+    """
+    ファイルの変更を監視し、変更があれば callback() を呼び出すバックグラウンドスレッド。
+
+    Linux では inotify でディレクトリを監視し、それ以外の環境や inotify が使えないときは
+    interval 秒ごとに (更新時刻, サイズ) を比較するポーリングに切り替えます。
+    短時間に続いた変更は SETTLE_SEC 待ってから 1 回にまとめて通知します。
+    callback は監視スレッドから呼ばれるので、UI の更新は root.after() などで UI スレッドに渡してください。
+    """
+
+    def __init__(self, paths, callback, interval: float = 1.0, use_inotify: bool = True):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.callback = callback
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.mode = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> "FileWatcher":
+        libc = _load_inotify() if self.use_inotify else None
+        fd = self._init_inotify(libc) if libc is not None else -1
+        if fd >= 0:
+            self.mode = "inotify"
+            target, args = self._run_inotify, (fd,)
+        else:
+            self.mode = "polling"
+            target, args = self._run_polling, ()
+        self._thread = threading.Thread(target=target, args=args, name="file-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # ─── inotify ───
+    def _init_inotify(self, libc) -> int:
+        fd = libc.inotify_init1(os.O_NONBLOCK)
+        if fd < 0:
+            return -1
+        for directory in {os.path.dirname(p) for p in self.paths}:
+            if libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK) < 0:
+                os.close(fd)
+                return -1
+        return fd
+
+    def _run_inotify(self, fd: int) -> None:
+        names = {os.path.basename(p) for p in self.paths}
+        pending_since = None
+        try:
+            while not self._stop.is_set():
+                timeout = SETTLE_SEC if pending_since is not None else 0.5
+                ready, _, _ = select.select([fd], [], [], timeout)
+                if ready and self._read_inotify(fd, names):
+                    pending_since = time.monotonic()
+                elif pending_since is not None and time.monotonic() - pending_since >= SETTLE_SEC:
+                    pending_since = None
+                    self._notify()
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_inotify(fd: int, names: set) -> bool:
+        """溜まっている inotify イベントを読み、監視対象のファイルが含まれていれば True。"""
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        hit = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", errors="replace")
+            offset += length
+            if name in names:
+                hit = True
+        return hit
+
+    # ─── ポーリング ───
+    def _signature(self):
+        result = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                result.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                result.append(None)
+        return result
+
+    def _run_polling(self) -> None:
+        last = self._signature()
+        while not self._stop.wait(self.interval):
+            current = self._signature()
+            if current != last:
+                # 書き込み途中を避けるため、落ち着くまで待ってから通知する
+                while not self._stop.wait(SETTLE_SEC):
+                    settled = self._signature()
+                    if settled == current:
+                        break
+                    current = settled
+                last = current
+                self._notify()
+
+    def _notify(self) -> None:
+        try:
+            self.callback()
+        except Exception as e:
+            print(f"[ERROR] ファイル変更の通知でエラーが発生しました: {e}", file=sys.stderr)
@@ -1,18 +1,23 @@
 import json
 import os
-import requests
+import threading
+from services.http_client import get_client
+from services.jp_holidays import holidays_for_year
 from utils.resource import resource_path
 
 CACHE_FILE = resource_path("data/holidays.json")
 
+# 祝日の取得元。
+# "api":   holidays.json のキャッシュ → 祝日 API の順に探し、API に届かなければ計算（jp_holidays）で代用する
+# "local": 計算だけを使う（ファイルもネットワークも使わない）
+HOLIDAY_SOURCE = os.environ.get("CALENDAR_APP_HOLIDAYS", "api")
+
 def fetch_holidays_from_api(year):
     """祝日APIから取得"""
     url = f"https://holidays-jp.github.io/api/v1/{year}/date.json"
     try:
-        res = requests.get(url)
-        res.raise_for_status()
-        data = res.json()
-        return data
+        # 共有の HTTP クライアント（タイムアウト・再試行・ETag による再検証つき）で取得
+        return get_client().get_json(url)
     except Exception as e:
         print(f"API取得失敗({year}):", e)
         return {}
@@ -30,25 +35,141 @@ def save_holiday_cache(data):
     with open(CACHE_FILE, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
+class HolidayRepository:
+    """
+    祝日データの置き場所。
+
+    キャッシュファイル（holidays.json）は最初に必要になったときに一度だけ読み込み、
+    年 → 祝日（日付 → 祝日名）の map をメモリに持ちます。以後の参照ではファイルを開きません。
+    キャッシュにない年を API から取得できたときだけ、ファイルに書き戻します。
+    API に届かない年は祝日を計算して返し、その結果はメモリにだけ持ちます。
+    """
+
+    def __init__(self):
+        # 年（文字列）→ 祝日。None はまだキャッシュファイルを読み込んでいない
+        self._years = None
+        # API に届かず計算で代用した年（文字列）→ 祝日（ファイルには保存しない）
+        self._computed = {}
+        # バックグラウンドで取得中の年
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def _loaded(self) -> dict:
+        """年 → 祝日 の map を返します（_lock 取得済みで呼ぶこと）。"""
+        if self._years is None:
+            self._years = load_holiday_cache()
+        return self._years
+
+    def get(self, year) -> dict:
+        """year 年の祝日を返します。キャッシュになければ API から取得して保存します。"""
+        if HOLIDAY_SOURCE == "local":
+            return holidays_for_year(year)
+        key = str(year)
+        with self._lock:
+            years = self._loaded()
+            if key in years:
+                return years[key]
+            if key in self._computed:
+                return self._computed[key]
+
+        print(f"キャッシュに{year}年がないのでAPIから取得します")
+        data = fetch_holidays_from_api(year)
+        if data:
+            with self._lock:
+                years = self._loaded()
+                years[key] = data
+                save_holiday_cache(years)
+            return data
+
+        # オフラインなどで取得できなければ、祝日を計算して代用する
+        data = holidays_for_year(year)
+        with self._lock:
+            self._computed[key] = data
+        return data
+
+    def peek(self, year) -> dict | None:
+        """
+        メモリ上（とキャッシュファイル）にある year 年の祝日を返します。
+        API には問い合わせないので、UI スレッドから呼んでも待たされません。まだなければ None。
+        """
+        if HOLIDAY_SOURCE == "local":
+            return holidays_for_year(year)
+        key = str(year)
+        with self._lock:
+            years = self._loaded()
+            if key in years:
+                return years[key]
+            return self._computed.get(key)
+
+    def prefetch(self, years, callback=None) -> threading.Thread | None:
+        """
+        years のうちまだない年の祝日を、ワーカースレッドで 1 年ずつ取得します。
+        取得するたびに callback(年, 祝日) をワーカースレッドから呼ぶので、UI の更新は
+        root.after() などで UI スレッドに渡してください。取得する年がなければ None を返します。
+        """
+        if HOLIDAY_SOURCE == "local":
+            return None
+        with self._lock:
+            loaded = self._loaded()
+            years = [
+                year for year in dict.fromkeys(years)
+                if str(year) not in loaded and str(year) not in self._computed and year not in self._pending
+            ]
+            self._pending.update(years)
+        if not years:
+            return None
+        thread = threading.Thread(target=self._prefetch, args=(years, callback),
+                                  name="holiday-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+    def _prefetch(self, years, callback) -> None:
+        for year in years:
+            try:
+                holidays = self.get(year)
+            except Exception as e:
+                print(f"[warning] {year}年の祝日を先読みできませんでした: {e}")
+                continue
+            finally:
+                with self._lock:
+                    self._pending.discard(year)
+            if callback is not None:
+                callback(year, holidays)
+
+    def invalidate(self) -> None:
+        """メモリ上の祝日を破棄し、次の参照でキャッシュファイルを読み直すようにします。"""
+        with self._lock:
+            self._years = None
+            self._computed.clear()
+
+
+_repository = HolidayRepository()
+
+
+def invalidate_holiday_cache():
+    """メモリ上に読み込んだ祝日を破棄します（次回は holidays.json を読み直す）。"""
+    _repository.invalidate()
+
+
+def peek_holidays(year):
+    """メモリ上にある year 年の祝日を返します（API は使わない）。まだなければ None。"""
+    return _repository.peek(year)
+
+
+def prefetch_holidays(years, callback=None):
+    """years の祝日をバックグラウンドで取得し、1 年ごとに callback(年, 祝日) を呼びます。"""
+    return _repository.prefetch(years, callback)
+
+
 def get_holidays_for_year(year):
     """
     この関数をMainWindowで使うイメージ
-    - キャッシュを読み込む
-    - 欲しい年がなければAPIから取得
+    - キャッシュを読み込む（プロセス内で最初の 1 回だけ）
+    - 欲しい年がなければAPIから取得（取得できなければ計算で代用）
     - キャッシュに保存
     - その年のデータを返す
     """
-    holidays_cache = load_holiday_cache()
-    
-    if str(year) in holidays_cache:
-        return holidays_cache[str(year)]
-    
-    print(f"キャッシュに{year}年がないのでAPIから取得します")
-    data = fetch_holidays_from_api(year)
-    if data:
-        holidays_cache[str(year)] = data
-        save_holiday_cache(holidays_cache)
-    return data
+    return _repository.get(year)
 
 #if __name__ == "__main__":
     """API取得するための確認"""
@@ -0,0 +1,146 @@
+# calendar_app/services/http_client.py
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 接続・読み込みのタイムアウト（秒）。応答しないサーバーでアプリ全体が固まらないようにする
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+
+# 失敗したときの再試行の回数と、待ち時間の係数（0.5 → 0.5 秒, 1 秒, ... と倍々に待つ）
+MAX_RETRIES = 2
+BACKOFF_FACTOR = 0.5
+# 再試行する HTTP ステータス（混雑・一時的なサーバーエラー）
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# 条件付きリクエスト（ETag / Last-Modified）用に応答を保存するディレクトリ
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".calendar_app", "http_cache")
+
+
+class HttpClient:
+    """
+    ネットワークを使うサービス（祝日・天気）で共有する HTTP クライアント。
+
+    1 つの requests.Session の接続プールを使い回すので、同じホストへの 2 回目以降の
+    リクエストでは TCP / TLS の接続をやり直しません。すべてのリクエストに接続・読み込みの
+    タイムアウトを付け、読み込みのエラーや RETRY_STATUSES の応答は待ち時間を倍々にしながら
+    MAX_RETRIES 回まで（接続できないときは 1 回だけ）再試行します。
+
+    get_json() は応答の本文と ETag / Last-Modified を cache_dir に保存し、次回は
+    If-None-Match / If-Modified-Since を付けて問い合わせます。304 Not Modified なら
+    保存しておいた本文を使うので、変わっていないデータを再ダウンロードしません。
+    """
+
+    def __init__(self, cache_dir: str | None = DEFAULT_CACHE_DIR,
+                 timeout: tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+                 retries: int = MAX_RETRIES, backoff_factor: float = BACKOFF_FACTOR):
+        """cache_dir に None を渡すと、応答をディスクに保存しません。"""
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.session = requests.Session()
+        # 接続できないとき（オフラインなど）は待つだけ無駄になりやすいので、再試行は 1 回まで
+        retry = Retry(
+            total=retries, connect=min(retries, 1), read=retries, status=retries,
+            backoff_factor=backoff_factor, status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, headers: dict | None = None, **kwargs) -> requests.Response:
+        """タイムアウトと再試行を付けて GET します。kwargs は requests にそのまま渡します。"""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, headers=headers, **kwargs)
+
+    def get_json(self, url: str):
+        """
+        url の JSON を返します。保存済みの応答があれば条件付きリクエストで再検証し、
+        304 Not Modified ならその本文を使います。
+        接続できない・HTTP エラーのときは requests.exceptions.RequestException を、
+        本文が JSON でないときは ValueError を送出します。
+        """
+        cached = self.load_cached(url)
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        res = self.get(url, headers=headers)
+        if res.status_code == 304 and cached is not None:
+            cached["fetched_at"] = time.time()
+            self._store(url, cached)
+            return json.loads(cached["body"])
+        res.raise_for_status()
+        data = res.json()
+        self._store(url, {
+            "url": url,
+            "etag": res.headers.get("ETag"),
+            "last_modified": res.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "body": res.text,
+        })
+        return data
+
+    def load_cached(self, url: str) -> dict | None:
+        """
+        url の保存済みの応答（"etag", "last_modified", "fetched_at", "body"）を返します。
+        保存していない・読めないときは None。
+        """
+        path = self._cache_path(url)
+        if path is None:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url or "body" not in entry:
+            return None
+        return entry
+
+    def close(self) -> None:
+        """接続プールを閉じます。"""
+        self.session.close()
+
+    def _cache_path(self, url: str) -> str | None:
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def _store(self, url: str, entry: dict) -> None:
+        """応答を保存します。保存できなくても次回は条件なしで取得するだけなので、警告にとどめます。"""
+        path = self._cache_path(url)
+        if path is None:
+            return
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[warning] HTTP の応答を保存できませんでした: {e}", file=sys.stderr)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """アプリ全体で共有する HttpClient を返します（最初の呼び出しで作成）。"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
@@ -0,0 +1,344 @@
+# calendar_app/services/ics_import.py
+
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+from services import event_manager
+from services.exporter import UID_SUFFIX
+from services.recurrence import make_rule, save_recurrences
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8 以前
+    ZoneInfo = None
+
+# これより小さいファイルはプロセスプールを使わずに読む（起動コストの方が大きいため）
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+# iCalendar の曜日 → Python の曜日番号（月曜=0）
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_FREQS = {"DAILY": "daily", "WEEKLY": "weekly", "MONTHLY": "monthly", "YEARLY": "yearly"}
+_DURATION_RE = re.compile(
+    r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+
+
+# ────────────────────────────────────────────────────────────
+# 行・プロパティの読み取り
+# ────────────────────────────────────────────────────────────
+
+def _iter_lines(f, end: int | None = None) -> Iterator[str]:
+    """
+    バイナリで開いたファイルから、折り返しを戻した論理行を 1 行ずつ返します。
+    end を指定すると、その位置以降で始まる BEGIN:VEVENT の手前で止まります
+    （プロセスプールで分割して読むときの区切り）。
+    """
+    pos = f.tell()
+    pending = None
+    for raw in iter(f.readline, b""):
+        start, pos = pos, pos + len(raw)
+        if raw[:1] in (b" ", b"\t"):
+            # 行頭が空白なら前の行の続き（RFC 5545 の折り返し）
+            if pending is not None:
+                pending += raw[1:].rstrip(b"\r\n")
+            continue
+        if pending is not None:
+            yield pending.decode("utf-8", errors="replace")
+            pending = None
+        if end is not None and start >= end and raw.startswith(b"BEGIN:VEVENT"):
+            return
+        pending = raw.rstrip(b"\r\n")
+    if pending is not None:
+        yield pending.decode("utf-8", errors="replace")
+
+
+def _parse_line(line: str) -> tuple[str, dict, str]:
+    """"NAME;PARAM=VALUE:値" を (名前, パラメータ, 値) に分けます。"""
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    return name.upper(), dict(p.partition("=")[::2] for p in params), value
+
+
+def _unescape(text: str) -> str:
+    """TEXT 型の値のエスケープ（\\n, \\, など）を戻します。"""
+    return re.sub(r"\\([nN,;\\])", lambda m: "\n" if m.group(1) in "nN" else m.group(1), text)
+
+
+def iter_vevents(lines) -> Iterator[dict]:
+    """
+    論理行の並びから VEVENT を 1 つずつ、プロパティ名 → (パラメータ, 値) の dict として返します。
+    VEVENT の中の VALARM などの入れ子は読み飛ばします。EXDATE は複数あり得るのでリストにまとめます。
+    """
+    props = None
+    depth = 0
+    for line in lines:
+        name, params, value = _parse_line(line)
+        if name == "BEGIN":
+            if value.upper() == "VEVENT" and props is None:
+                props = {"EXDATE": []}
+            elif props is not None:
+                depth += 1
+        elif name == "END" and props is not None:
+            if depth:
+                depth -= 1
+            elif value.upper() == "VEVENT":
+                yield props
+                props = None
+        elif props is not None and not depth:
+            if name == "EXDATE":
+                props["EXDATE"].extend((params, v) for v in value.split(","))
+            else:
+                props.setdefault(name, (params, value))
+
+
+# ────────────────────────────────────────────────────────────
+# VEVENT → 予定
+# ────────────────────────────────────────────────────────────
+
+def _parse_datetime(params: dict, value: str):
+    """DATE / DATE-TIME の値を date か（ローカル時刻の）datetime に変換します。"""
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d").date()
+    dt = datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        return dt.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    tzid = params.get("TZID")
+    if tzid and ZoneInfo is not None:
+        try:
+            return dt.replace(tzinfo=ZoneInfo(tzid.strip('"'))).astimezone().replace(tzinfo=None)
+        except (KeyError, ValueError, OSError):
+            pass
+    # TZID のない時刻、または不明なタイムゾーンはそのままの時刻として扱う
+    return dt
+
+
+def _parse_duration(value: str) -> timedelta | None:
+    m = _DURATION_RE.match(value.strip())
+    if not m:
+        return None
+    sign, weeks, days, hours, minutes, seconds = m.groups()
+    delta = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                      minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
+
+
+def _event_id(props: dict) -> str | None:
+    """
+    UID（＋RECURRENCE-ID）から決まる予定 ID。同じファイルを再インポートしても重複しない。
+    このアプリが書き出した UID（"<予定 ID>@calendar_app"）は元の予定 ID に戻すので、
+    書き出したファイルを取り込み直しても同じ予定として扱われます。
+    """
+    uid = props.get("UID")
+    if uid is None:
+        return None
+    recurrence_id = props.get("RECURRENCE-ID", ({}, ""))[1]
+    value = uid[1].strip()
+    if value.endswith(UID_SUFFIX) and len(value) > len(UID_SUFFIX) and not recurrence_id:
+        return value[:-len(UID_SUFFIX)]
+    key = uid[1] + "#" + recurrence_id
+    return hashlib.sha1(("ics:" + key).encode("utf-8")).hexdigest()[:32]
+
+
+def vevent_to_event(props: dict) -> tuple[str, dict] | None:
+    """
+    VEVENT のプロパティを (日付キー, 予定 dict) に変換します。DTSTART がなければ None。
+    SUMMARY → title、DESCRIPTION → memo、DTEND / DURATION → end_time に対応させます。
+    終日の予定は時刻なし、日をまたぐ予定は開始日に終了時刻なしで登録します。
+    """
+    if "DTSTART" not in props:
+        return None
+    start = _parse_datetime(*props["DTSTART"])
+    end = None
+    if "DTEND" in props:
+        end = _parse_datetime(*props["DTEND"])
+    elif "DURATION" in props and isinstance(start, datetime):
+        duration = _parse_duration(props["DURATION"][1])
+        end = start + duration if duration is not None else None
+
+    start_time = end_time = ""
+    if isinstance(start, datetime):
+        start_time = start.strftime("%H:%M")
+        if isinstance(end, datetime) and end.date() == start.date() and end > start:
+            end_time = end.strftime("%H:%M")
+
+    event = {
+        "id":         _event_id(props) or event_manager.new_event_id(),
+        "title":      _unescape(props.get("SUMMARY", ({}, ""))[1]) or "(無題)",
+        "start_time": start_time,
+        "end_time":   end_time,
+        "memo":       _unescape(props.get("DESCRIPTION", ({}, ""))[1]),
+    }
+    day = start.date() if isinstance(start, datetime) else start
+    return day.isoformat(), event
+
+
+def vevent_to_rule(props: dict) -> dict | None:
+    """
+    RRULE を持つ VEVENT を繰り返しルールに変換します。
+    対応していない指定（BYSETPOS や時間単位の繰り返しなど）を含む場合は None。
+    """
+    if "RRULE" not in props:
+        return None
+    item = vevent_to_event(props)
+    if item is None:
+        return None
+    date_str, event = item
+    parts = dict(p.partition("=")[::2] for p in props["RRULE"][1].upper().split(";") if p)
+    freq = _FREQS.get(parts.get("FREQ"))
+    if freq is None or set(parts) - {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY",
+                                      "BYMONTHDAY", "WKST", "BYMONTH"}:
+        return None
+
+    weekdays, ordinals = [], set()
+    for token in filter(None, parts.get("BYDAY", "").split(",")):
+        m = re.match(r"^([+-]?\d+)?([A-Z]{2})$", token)
+        if not m or m.group(2) not in _WEEKDAYS:
+            return None
+        weekdays.append(_WEEKDAYS[m.group(2)])
+        ordinals.add(int(m.group(1)) if m.group(1) else None)
+    if len(ordinals) > 1:
+        # 「第 1 月曜と最終金曜」のように曜日ごとに順番が違う指定は表せない
+        return None
+    nth = ordinals.pop() if ordinals else None
+    if weekdays and nth is None and freq in ("monthly", "yearly"):
+        # 「毎月のすべての月曜」のような指定は繰り返しルールで表せない
+        return None
+    monthday = None
+    if "BYMONTHDAY" in parts:
+        # 月末から数える日（-1）や複数の日は表せない
+        if not parts["BYMONTHDAY"].isdigit():
+            return None
+        monthday = int(parts["BYMONTHDAY"])
+    if "BYMONTH" in parts and (freq != "yearly" or not parts["BYMONTH"].isdigit()
+                               or int(parts["BYMONTH"]) != int(date_str[5:7])):
+        # 月の指定は「毎年、初回（DTSTART）と同じ月」のときだけ表せる
+        return None
+    until = None
+    if parts.get("UNTIL"):
+        until_dt = _parse_datetime({}, parts["UNTIL"])
+        until = (until_dt.date() if isinstance(until_dt, datetime) else until_dt).isoformat()
+
+    rule = make_rule(
+        event["title"], date_str, freq, event["start_time"], event["end_time"], event["memo"],
+        interval=int(parts.get("INTERVAL", "1") or 1), weekdays=weekdays or None,
+        monthday=monthday, nth=nth, until=until,
+        count=int(parts["COUNT"]) if parts.get("COUNT", "").isdigit() else None,
+    )
+    rule["id"] = event["id"]
+    exdates = []
+    for params, value in props.get("EXDATE", []):
+        d = _parse_datetime(params, value)
+        exdates.append((d.date() if isinstance(d, datetime) else d).isoformat())
+    rule["exdates"] = sorted(set(exdates))
+    return rule
+
+
+def _convert(props: dict, with_rules: bool):
+    """VEVENT 1 件を ("rule", ルール) / ("event", (日付, 予定)) / None に変換します。"""
+    if with_rules:
+        rule = vevent_to_rule(props)
+        if rule is not None:
+            return "rule", rule
+    item = vevent_to_event(props)
+    return ("event", item) if item is not None else None
+
+
+# ────────────────────────────────────────────────────────────
+# ファイルの読み込み（逐次／プロセスプール）
+# ────────────────────────────────────────────────────────────
+
+def _iter_converted(path: str, with_rules: bool) -> Iterator[tuple]:
+    """ファイルを先頭から 1 行ずつ読み、変換結果を順に返します（ファイル全体は読み込まない）。"""
+    with open(path, "rb") as f:
+        for props in iter_vevents(_iter_lines(f)):
+            converted = _convert(props, with_rules)
+            if converted is not None:
+                yield converted
+
+
+def _chunk_offsets(path: str, chunks: int) -> list[int]:
+    """ファイルをおおよそ均等に分ける位置を、VEVENT の区切り（BEGIN:VEVENT の行頭）に合わせて返します。"""
+    size = os.path.getsize(path)
+    offsets = [0]
+    with open(path, "rb") as f:
+        for i in range(1, chunks):
+            f.seek(max(size * i // chunks, offsets[-1]))
+            f.readline()  # 途中から読み始めた行は捨てる
+            while True:
+                pos = f.tell()
+                line = f.readline()
+                if not line or line.startswith(b"BEGIN:VEVENT"):
+                    break
+            if pos > offsets[-1]:
+                offsets.append(pos)
+    offsets.append(size)
+    return offsets
+
+
+def _parse_chunk(args) -> list:
+    """プロセスプールのワーカー：start〜end の範囲にある VEVENT を変換して返します。"""
+    path, start, end, with_rules = args
+    with open(path, "rb") as f:
+        f.seek(start)
+        return [
+            converted
+            for converted in map(lambda p: _convert(p, with_rules), iter_vevents(_iter_lines(f, end)))
+            if converted is not None
+        ]
+
+
+def _iter_converted_parallel(path: str, with_rules: bool, workers: int) -> Iterator[tuple]:
+    """ファイルを VEVENT の区切りで分割し、プロセスプールで並列に変換します（結果はファイル順）。"""
+    offsets = _chunk_offsets(path, workers * 4)
+    tasks = [(path, offsets[i], offsets[i + 1], with_rules) for i in range(len(offsets) - 1)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(_parse_chunk, tasks):
+            yield from chunk
+
+
+def iter_ics_events(path: str, workers: int | None = None, with_rules: bool = False) -> Iterator[tuple]:
+    """
+    .ics ファイルの VEVENT を順に変換して返すイテレータです。
+    workers に 2 以上を指定すると、大きなファイルはプロセスプールで分割して読みます。
+    """
+    if workers and workers > 1 and os.path.getsize(path) >= PARALLEL_MIN_BYTES:
+        return _iter_converted_parallel(path, with_rules, workers)
+    return _iter_converted(path, with_rules)
+
+
+def import_ics(events: dict, path: str, store=None, recurrences=None,
+               workers: int | None = None) -> tuple[int, int]:
+    """
+    .ics ファイルの予定を events に一括で取り込み、1 回の書き込みで保存します。
+
+    - store:       保存先の EventStore（省略時は events.json）
+    - recurrences: RecurrenceSet を渡すと、RRULE 付きの予定を繰り返しルールとして取り込む
+    - workers:     大きなファイルを読むときのプロセス数（省略時は 1 プロセスで逐次読み込み）
+    同じ UID の予定がすでにあれば追加しません。(追加した予定の件数, 追加したルールの件数) を返します。
+    """
+    rules = []
+
+    def items():
+        for kind, value in iter_ics_events(path, workers, with_rules=recurrences is not None):
+            if kind == "rule":
+                rules.append(value)
+            else:
+                yield value
+
+    if store is None:
+        added = event_manager.add_events(events, items())
+    else:
+        added = store.add_events(events, items())
+
+    new_rules = [rule for rule in rules if rule["id"] not in recurrences.rules] if rules else []
+    if new_rules:
+        for rule in new_rules:
+            recurrences.rules[rule["id"]] = rule
+            recurrences.invalidate(rule["id"])
+        save_recurrences(recurrences)
+    return added, len(new_rules)
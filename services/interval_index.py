@@ -0,0 +1,117 @@
+# calendar_app/services/interval_index.py
+
+from bisect import bisect_left, insort
+from datetime import date
+
+from services.event_manager import EventCollection
+from services.event_model import Event, parse_time
+
+# 1 日の分数
+MINUTES_PER_DAY = 24 * 60
+
+
+class IntervalIndex:
+    """
+    予定の時間帯を [開始, 終了) の区間として持つ索引。
+
+    区間は「日付の通し番号 × 1440 + 分」の通算分で表し、開始位置でソートした配列を
+    二分探索します。予定は日をまたがないため区間の長さは最大でも 1 日分で、
+    [q_start, q_end) と重なりうるのは開始が [q_start - 最大長, q_end) にある区間だけです。
+    そのため検索は O(log n + k) で済みます。
+
+    時刻のない予定は索引に含めません。開始時刻だけの予定は 1 分間の区間として扱います。
+    EventCollection の listener として登録すると、予定の追加・更新・削除に追従します。
+    """
+
+    def __init__(self, events: dict | None = None):
+        # (開始, 終了, 予定 ID) を開始順に並べた配列
+        self._intervals = []
+        # 予定 ID → 配列の要素
+        self._by_id = {}
+        # これまでに登録した区間の最大長（削除しても縮めない＝安全側）
+        self._max_len = 0
+        if events:
+            for date_str, day in events.items():
+                for data in day:
+                    entry = self._entry(Event.from_dict(date_str, data))
+                    if entry is not None:
+                        self._intervals.append(entry)
+                        self._by_id[entry[2]] = entry
+                        self._max_len = max(self._max_len, entry[1] - entry[0])
+            self._intervals.sort()
+
+    def __len__(self):
+        return len(self._intervals)
+
+    @staticmethod
+    def _entry(event: Event):
+        """Event を (通算開始分, 通算終了分, ID) に変換します。時刻がなければ None。"""
+        if event.start is None:
+            return None
+        end = event.end if event.end is not None and event.end > event.start else event.start + 1
+        base = event.ordinal * MINUTES_PER_DAY
+        return base + event.start, base + end, event.id
+
+    def add(self, event: Event) -> None:
+        entry = self._entry(event)
+        if entry is None:
+            return
+        self.remove(event.id)
+        insort(self._intervals, entry)
+        self._by_id[entry[2]] = entry
+        self._max_len = max(self._max_len, entry[1] - entry[0])
+
+    def remove(self, event_id: str) -> None:
+        entry = self._by_id.pop(event_id, None)
+        if entry is None:
+            return
+        i = bisect_left(self._intervals, entry)
+        if i < len(self._intervals) and self._intervals[i] == entry:
+            self._intervals.pop(i)
+
+    # ─── EventCollection からの通知 ───
+    def on_event_added(self, date_str: str, data: dict) -> None:
+        self.add(Event.from_dict(date_str, data))
+
+    def on_event_removed(self, date_str: str, data: dict) -> None:
+        self.remove(data.get("id"))
+
+    def query(self, start: int, end: int) -> list[str]:
+        """通算分の区間 [start, end) と重なる予定の ID を開始順に返します。"""
+        lo = bisect_left(self._intervals, (start - self._max_len,))
+        hi = bisect_left(self._intervals, (end,))
+        return [event_id for s, e, event_id in self._intervals[lo:hi] if e > start]
+
+    def overlapping(self, date_str: str, start_time: str, end_time: str = "") -> list[str]:
+        """
+        date_str の start_time〜end_time（"HH:MM"）と重なる予定の ID を返します。
+        終了時刻を省略すると開始時刻の 1 分間として扱います。
+        """
+        start = parse_time(start_time)
+        if start is None:
+            return []
+        end = parse_time(end_time)
+        if end is None or end <= start:
+            end = start + 1
+        base = date.fromisoformat(date_str).toordinal() * MINUTES_PER_DAY
+        return self.query(base + start, base + end)
+
+
+def get_interval_index(events: dict) -> IntervalIndex:
+    """
+    events の区間索引を返します。EventCollection なら一度だけ作って以後の変更に追従させ、
+    ただの dict ならその場で作ります。
+    """
+    if isinstance(events, EventCollection):
+        return events.get_index(IntervalIndex)
+    return IntervalIndex(events)
+
+
+def find_overlaps(events: dict, date_str: str, start_time: str, end_time: str = "",
+                  exclude_id: str | None = None) -> list[str]:
+    """
+    date_str の start_time〜end_time と時間が重なる予定の ID を返します。
+    編集中の予定自身は exclude_id で除外します。
+    """
+    ids = get_interval_index(events).overlapping(date_str, start_time, end_time)
+    return [event_id for event_id in ids if event_id != exclude_id]
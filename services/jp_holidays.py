@@ -0,0 +1,141 @@
+# calendar_app/services/jp_holidays.py
+
+from datetime import date, timedelta
+from functools import lru_cache
+
+# 計算できる年の範囲（祝日法の施行翌年から、春分・秋分の近似式が使える年まで）
+MIN_YEAR = 1949
+MAX_YEAR = 2150
+
+# 振替休日・国民の休日の名前
+SUBSTITUTE_SUFFIX = "振替休日"
+NATIONAL_HOLIDAY = "国民の休日"
+
+# 一度だけの祝日（皇室の儀式など）
+_SPECIAL_DAYS = {
+    date(1959, 4, 10): "皇太子明仁親王の結婚の儀",
+    date(1989, 2, 24): "昭和天皇の大喪の礼",
+    date(1990, 11, 12): "即位礼正殿の儀",
+    date(1993, 6, 9): "皇太子徳仁親王の結婚の儀",
+    date(2019, 5, 1): "天皇の即位の日",
+    date(2019, 10, 22): "即位礼正殿の儀",
+}
+
+# 東京オリンピック・パラリンピックに合わせて移動した年の 海の日・山の日・スポーツの日
+_MOVED_DAYS = {
+    2020: {"海の日": date(2020, 7, 23), "スポーツの日": date(2020, 7, 24), "山の日": date(2020, 8, 10)},
+    2021: {"海の日": date(2021, 7, 22), "スポーツの日": date(2021, 7, 23), "山の日": date(2021, 8, 8)},
+}
+
+
+def _nth_monday(year: int, month: int, n: int) -> date:
+    """year 年 month 月の第 n 月曜日（ハッピーマンデー）"""
+    first = date(year, month, 1)
+    return first + timedelta(days=(7 - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _equinox_day(year: int, base_1900: float, base_1980: float, base_2100: float) -> int:
+    """春分・秋分の日（日にち）を求める近似式（1900〜2150 年向け）"""
+    if year < 1980:
+        return int(base_1900 + 0.242194 * (year - 1980) - int((year - 1983) / 4))
+    base = base_1980 if year < 2100 else base_2100
+    return int(base + 0.242194 * (year - 1980) - int((year - 1980) / 4))
+
+
+def vernal_equinox(year: int) -> date:
+    """春分の日"""
+    return date(year, 3, _equinox_day(year, 20.8357, 20.8431, 21.8510))
+
+
+def autumnal_equinox(year: int) -> date:
+    """秋分の日"""
+    return date(year, 9, _equinox_day(year, 23.2588, 23.2488, 24.2488))
+
+
+def _national_holidays(year: int) -> dict[date, str]:
+    """祝日法の「国民の祝日」（振替休日・国民の休日を含まない）"""
+    days = {
+        date(year, 1, 1): "元日",
+        vernal_equinox(year): "春分の日",
+        date(year, 5, 3): "憲法記念日",
+        date(year, 5, 5): "こどもの日",
+        autumnal_equinox(year): "秋分の日",
+        date(year, 11, 3): "文化の日",
+        date(year, 11, 23): "勤労感謝の日",
+    }
+    days[date(year, 1, 15) if year < 2000 else _nth_monday(year, 1, 2)] = "成人の日"
+    if year >= 1967:
+        days[date(year, 2, 11)] = "建国記念の日"
+    if year <= 1988:
+        days[date(year, 4, 29)] = "天皇誕生日"
+    elif year <= 2018:
+        days[date(year, 12, 23)] = "天皇誕生日"
+    elif year >= 2020:
+        days[date(year, 2, 23)] = "天皇誕生日"
+    if 1989 <= year <= 2006:
+        days[date(year, 4, 29)] = "みどりの日"
+    elif year >= 2007:
+        days[date(year, 4, 29)] = "昭和の日"
+        days[date(year, 5, 4)] = "みどりの日"
+    if year >= 1966:
+        days[date(year, 9, 15) if year < 2003 else _nth_monday(year, 9, 3)] = "敬老の日"
+        if year < 2000:
+            days[date(year, 10, 10)] = "体育の日"
+        else:
+            days[_nth_monday(year, 10, 2)] = "体育の日" if year < 2020 else "スポーツの日"
+    if year >= 1996:
+        days[date(year, 7, 20) if year < 2003 else _nth_monday(year, 7, 3)] = "海の日"
+    if year >= 2016:
+        days[date(year, 8, 11)] = "山の日"
+
+    # 特別措置法で移動した年は、元の日を取り除いて移動先の日にする
+    moved = _MOVED_DAYS.get(year, {})
+    if moved:
+        days = {day: name for day, name in days.items() if name not in moved}
+        days.update((day, name) for name, day in moved.items())
+    days.update((day, name) for day, name in _SPECIAL_DAYS.items() if day.year == year)
+    return days
+
+
+@lru_cache(maxsize=64)
+def _holidays(year: int) -> tuple[tuple[str, str], ...]:
+    national = _national_holidays(year)
+    days = dict(national)
+
+    # 振替休日: 1973-04-12 以降、日曜日の祝日の翌日（2007 年以降は、その後の最初の祝日でない日）
+    for day, name in sorted(national.items()):
+        if day.weekday() != 6 or day < date(1973, 4, 12):
+            continue
+        substitute = day + timedelta(days=1)
+        if year >= 2007:
+            while substitute in days:
+                substitute += timedelta(days=1)
+        elif substitute in days:
+            continue
+        days[substitute] = f"{name} {SUBSTITUTE_SUFFIX}"
+
+    # 国民の休日: 1986 年以降、前日と翌日がともに国民の祝日である日
+    # （2006 年までは日曜日と振替休日を除く）
+    if year >= 1986:
+        for day in sorted(national):
+            between = day + timedelta(days=1)
+            if (between + timedelta(days=1) in national and between not in days
+                    and (year >= 2007 or between.weekday() != 6)):
+                days[between] = NATIONAL_HOLIDAY
+
+    return tuple(sorted((day.isoformat(), name) for day, name in days.items() if day.year == year))
+
+
+def holidays_for_year(year) -> dict[str, str]:
+    """
+    year 年の日本の祝日・休日を、API と同じ 日付（"YYYY-MM-DD"）→ 祝日名 の dict で返します。
+
+    固定日の祝日、ハッピーマンデー、春分・秋分の日の近似式、振替休日、国民の休日を
+    ネットワークなしで計算します（結果は年ごとにキャッシュ）。計算できない年
+    （MIN_YEAR 〜 MAX_YEAR の外）は空の dict です。春分・秋分の日は、将来の年については
+    官報で公表される前の推定値です。
+    """
+    year = int(year)
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        return {}
+    return dict(_holidays(year))
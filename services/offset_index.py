@@ -0,0 +1,246 @@
+# calendar_app/services/offset_index.py
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from json.decoder import scanstring
+from typing import Iterator
+
+# 索引ファイル（サイドカー）の先頭の識別子と形式のバージョン
+MAGIC = b"CALIDX1\0"
+VERSION = 1
+
+# ヘッダー: 識別子, バージョン, 元の JSON の (更新時刻 ns, サイズ), 日付キーの数
+_HEADER = struct.Struct("<8sIqqI")
+
+_WS = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def _pack(typecode: str, values) -> bytes:
+    data = array(typecode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _unpack(typecode: str, buf, offset: int, count: int) -> tuple[array, int]:
+    data = array(typecode)
+    end = offset + count * data.itemsize
+    data.frombytes(buf[offset:end])
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data, end
+
+
+def scan_spans(buf, start: int | None = None) -> list[tuple[str, int, int, int]]:
+    """
+    JSON のトップレベルのオブジェクト（日付キー → 予定リスト）を走査し、
+    (キー, キーの開始位置, 値の開始位置, 値の終了位置) をファイル内のバイト位置で返します。
+
+    start を省略すると先頭から、指定すると「その位置の直前で 1 つの値が終わっている」
+    ものとして続きから走査します。区切りの文字はすべて ASCII なので、UTF-8 のバイト列の
+    途中で切っても文字が割れることはありません。値の終わりは json の C 実装で求めます。
+    """
+    offset = start or 0
+    text = buf[offset:].decode("utf-8")
+    if text.isascii():
+        def to_byte(i: int) -> int:
+            return offset + i
+    else:
+        # 文字位置 → バイト位置。位置は増える一方なので、差分だけエンコードして足していく
+        last = [0, offset]
+
+        def to_byte(i: int) -> int:
+            last[1] += len(text[last[0]:i].encode("utf-8"))
+            last[0] = i
+            return last[1]
+
+    i = _WS.match(text, 0).end()
+    if start is None:
+        if text[i:i + 1] != "{":
+            raise ValueError("トップレベルがオブジェクトではありません")
+        i = _WS.match(text, i + 1).end()
+        after_value = False
+    else:
+        after_value = True
+
+    spans = []
+    while True:
+        ch = text[i:i + 1]
+        if ch == "}":
+            return spans
+        if after_value:
+            if ch != ",":
+                raise ValueError(f"位置 {to_byte(i)} に ',' がありません")
+            i = _WS.match(text, i + 1).end()
+        if text[i:i + 1] != '"':
+            raise ValueError(f"位置 {to_byte(i)} に日付キーがありません")
+        key_start = i
+        key, i = scanstring(text, i + 1)
+        i = _WS.match(text, i).end()
+        if text[i:i + 1] != ":":
+            raise ValueError(f"位置 {to_byte(i)} に ':' がありません")
+        value_start = _WS.match(text, i + 1).end()
+        _, value_end = _DECODER.raw_decode(text, value_start)
+        spans.append((key, to_byte(key_start), to_byte(value_start), to_byte(value_end)))
+        i = _WS.match(text, value_end).end()
+        after_value = True
+
+
+class OffsetIndex:
+    """
+    日付キー → events.json 内の値（その日の予定リスト）のバイト範囲 の索引。
+
+    索引はサイドカーファイル（events.idx）に保存し、events.json をメモリマップして
+    1 日分の範囲だけを切り出してデコードします。巨大な events.json でも、1 日分を読むのに
+    ファイル全体をパースする必要はありません。
+
+    範囲の読み込みは 1 日ずつ行い、日と日の間は events.json を開いたままにしません
+    （Windows では開いているファイルを置き換えられないため）。途中で置き換えられたら
+    索引を合わせ直して、続きの日から読みます。
+
+    events.json の (更新時刻 ns, サイズ) が変わったら作り直します。各キーの終わりまでの
+    CRC32 を先頭からの累積で持っているので、内容が変わっていない先頭側の範囲はそのまま使い、
+    最初に変わったキーから後ろだけを走査し直します。
+    """
+
+    def __init__(self, source_path: str, index_path: str):
+        self.source_path = source_path
+        self.index_path = index_path
+        # 索引を作ったときの events.json の (更新時刻 ns, サイズ)
+        self.source_stat = None
+        # ファイル内の順の (キー, キーの開始位置, 値の開始位置, 値の終了位置, 累積 CRC32)
+        self.entries = []
+        # キー → (値の開始位置, 値の終了位置)
+        self.spans = {}
+        # 日付キー（昇順。範囲の先頭と末尾を二分探索で求める）
+        self.keys = []
+        # 索引の更新と読み込みを、同じプロセスのスレッド間で排他する
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """サイドカーファイルを読み込みます。ない・壊れているときは空の索引のままにします。"""
+        try:
+            with open(self.index_path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    magic, version, mtime_ns, size, count = _HEADER.unpack_from(buf, 0)
+                    if magic != MAGIC or version != VERSION:
+                        raise ValueError("形式が違います")
+                    offset = _HEADER.size
+                    columns = []
+                    for typecode in "QQQI":
+                        column, offset = _unpack(typecode, buf, offset, count)
+                        columns.append(column)
+                    keys = json.loads(buf[offset:].decode("utf-8"))
+        except (OSError, ValueError, struct.error) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"[warning] 予定の索引ファイルを読み込めませんでした: {e}", file=sys.stderr)
+            return
+        if len(keys) != count:
+            return
+        self._set_entries(list(zip(keys, *columns)), (mtime_ns, size))
+
+    def _save(self) -> None:
+        """索引をサイドカーファイルに書き出します。失敗しても次回作り直すだけなので警告にとどめます。"""
+        keys = [entry[0] for entry in self.entries]
+        parts = [_HEADER.pack(MAGIC, VERSION, self.source_stat[0], self.source_stat[1], len(keys))]
+        parts.extend(_pack(typecode, [entry[i] for entry in self.entries])
+                     for i, typecode in enumerate("QQQI", start=1))
+        parts.append(json.dumps(keys, ensure_ascii=False).encode("utf-8"))
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.writelines(parts)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"[warning] 予定の索引ファイルを書き出せませんでした: {e}", file=sys.stderr)
+
+    def _set_entries(self, entries: list, source_stat: tuple[int, int]) -> None:
+        self.entries = entries
+        self.source_stat = source_stat
+        self.spans = {key: (value_start, value_end) for key, _, value_start, value_end, _ in entries}
+        self.keys = sorted(self.spans)
+
+    def keys_between(self, start: str, end: str) -> list[str]:
+        """start 〜 end（両端を含む）の日付キーを昇順で返します。"""
+        return self.keys[bisect_left(self.keys, start):bisect_right(self.keys, end)]
+
+    def _sync(self, buf, source_stat: tuple[int, int]) -> None:
+        """buf（events.json の中身）に合わせて索引を更新します。変わっていなければ何もしません。"""
+        if self.source_stat == source_stat:
+            return
+        # 先頭から累積の CRC32 が一致するキーまでは、位置も内容も変わっていない
+        kept = []
+        crc = 0
+        with memoryview(buf) as view:
+            previous_end = 0
+            for entry in self.entries:
+                value_end = entry[3]
+                if value_end > len(buf):
+                    break
+                crc = zlib.crc32(view[previous_end:value_end], crc)
+                if crc != entry[4]:
+                    break
+                kept.append(entry)
+                previous_end = value_end
+
+            start = kept[-1][3] if kept else None
+            entries = list(kept)
+            crc = kept[-1][4] if kept else 0
+            previous_end = start or 0
+            for key, key_start, value_start, value_end in scan_spans(buf, start):
+                crc = zlib.crc32(view[previous_end:value_end], crc)
+                entries.append((key, key_start, value_start, value_end, crc))
+                previous_end = value_end
+        self._set_entries(entries, source_stat)
+        self._save()
+
+    def _read_next(self, start: str, end: str, after: str | None) -> tuple[str, list] | None:
+        """
+        索引を events.json に合わせてから、start 〜 end のうち after より後で予定のある
+        最初の日付キーと、その日の予定リストを返します（もうなければ None）。
+        """
+        try:
+            f = open(self.source_path, "rb")
+        except FileNotFoundError:
+            return None
+        with f, self._lock:
+            st = os.fstat(f.fileno())
+            if st.st_size == 0:
+                raise ValueError("イベントファイルが空です")
+            # 置き換えで更新されるファイルなので、開いたファイルの中身と stat は常に一致する
+            source_stat = (st.st_mtime_ns, st.st_size)
+            if self.source_stat != source_stat:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    self._sync(buf, source_stat)
+            keys = self.keys
+            i = bisect_left(keys, start) if after is None else bisect_right(keys, after)
+            for date_str in keys[i:bisect_right(keys, end)]:
+                value_start, value_end = self.spans[date_str]
+                f.seek(value_start)
+                day = json.loads(f.read(value_end - value_start))
+                if isinstance(day, list) and day:
+                    return date_str, day
+        return None
+
+    def iter_between(self, start: str, end: str) -> Iterator[tuple[str, list]]:
+        """
+        start 〜 end（"YYYY-MM-DD"、両端を含む）の予定を (日付キー, 予定リスト) として
+        日付順に返すジェネレータです。1 日分ずつ読み込んでデコードするので、範囲全体を
+        メモリに持たず、途中でやめれば残りの日は読みません。予定のない日付は含めません。
+        events.json がなければ何も返さず、JSON が壊れていて索引を作れないときは
+        ValueError を送出します。
+        """
+        after = None
+        while (item := self._read_next(start, end, after)) is not None:
+            yield item
+            after = item[0]
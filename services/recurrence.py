@@ -0,0 +1,313 @@
+# calendar_app/services/recurrence.py
+
+import calendar
+import json
+import os
+import sys
+from datetime import date, timedelta
+from typing import Iterator
+
+from services.event_manager import atomic_write_text, new_event_id
+from utils.resource import resource_path
+
+# 繰り返し予定のルールを保存するファイル（各回の予定は保存せず、表示時に展開する）
+RECURRENCES_FILE = resource_path("data/recurrences.json", writable=True)
+
+# 繰り返しの単位
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly")
+
+
+def make_rule(title: str, start: str, freq: str, start_time: str = "", end_time: str = "",
+              memo: str = "", interval: int = 1, weekdays: list[int] | None = None,
+              monthday: int | None = None, nth: int | None = None,
+              until: str | None = None, count: int | None = None) -> dict:
+    """
+    繰り返しルールの dict を作ります（RRULE を簡略化したもの）。
+
+    - start:    初回の日付 "YYYY-MM-DD"
+    - freq:     "daily" / "weekly" / "monthly" / "yearly"
+    - interval: 何日・何週・何か月・何年おきか
+    - weekdays: 曜日（月曜=0 〜 日曜=6）。weekly では対象の曜日、monthly では nth と組み合わせる
+    - monthday: monthly で毎月の何日か
+    - nth:      monthly で第何週か（1〜5、-1 は最終週）。weekdays と組み合わせて「第 2 火曜」など
+    - until:    最終日 "YYYY-MM-DD"（この日を含む）
+    - count:    回数
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"未対応の繰り返し単位です: {freq}")
+    return {
+        "id":         new_event_id(),
+        "title":      title,
+        "start_time": start_time,
+        "end_time":   end_time,
+        "memo":       memo,
+        "freq":       freq,
+        "interval":   max(int(interval), 1),
+        "start":      start,
+        "weekdays":   sorted(weekdays) if weekdays else None,
+        "monthday":   monthday,
+        "nth":        nth,
+        "until":      until,
+        "count":      count,
+        "exdates":    [],
+    }
+
+
+def make_repeat_rule(kind: str, date_str: str, title: str, start_time: str = "",
+                     end_time: str = "", memo: str = "") -> dict:
+    """
+    予定追加画面の「繰り返し」の選択から、date_str を初回とするルールを作ります。
+    kind: "daily" / "weekly" / "monthly_day" / "monthly_nth"（第 n 何曜日）/ "yearly"
+    """
+    d = date.fromisoformat(date_str)
+    fields = dict(start_time=start_time, end_time=end_time, memo=memo)
+    if kind == "monthly_day":
+        return make_rule(title, date_str, "monthly", monthday=d.day, **fields)
+    if kind == "monthly_nth":
+        # 月末の週なら「最終○曜日」にする（第 5 週がない月でも発生するように）
+        last_day = calendar.monthrange(d.year, d.month)[1]
+        nth = -1 if d.day + 7 > last_day else (d.day - 1) // 7 + 1
+        return make_rule(title, date_str, "monthly", weekdays=[d.weekday()], nth=nth, **fields)
+    if kind == "weekly":
+        return make_rule(title, date_str, "weekly", weekdays=[d.weekday()], **fields)
+    return make_rule(title, date_str, kind, **fields)
+
+
+def _month_dates(rule: dict, year: int, month: int, start: date) -> list[date]:
+    """monthly / yearly ルールで、ある月に該当する日付を昇順に返します。"""
+    last_day = calendar.monthrange(year, month)[1]
+    weekdays = rule.get("weekdays")
+    nth = rule.get("nth")
+    if weekdays and nth:
+        result = []
+        for wd in weekdays:
+            first_wd = (wd - date(year, month, 1).weekday()) % 7 + 1
+            days = list(range(first_wd, last_day + 1, 7))
+            if -len(days) <= (nth - 1 if nth > 0 else nth) < len(days):
+                result.append(date(year, month, days[nth - 1 if nth > 0 else nth]))
+        return sorted(result)
+    day = rule.get("monthday") or start.day
+    if day > last_day:
+        # 31 日指定の 30 日の月などは、その月は発生しない
+        return []
+    return [date(year, month, day)]
+
+
+def _candidate_dates(rule: dict, first: date, last: date) -> Iterator[date]:
+    """
+    ルールの発生日を昇順に返します。first より前の周期はまとめて読み飛ばし、
+    周期の開始日が last を過ぎたら終わります。
+    ただし回数指定（count）があるときは、何回目かを数えるため初回から順にたどります。
+    """
+    start = date.fromisoformat(rule["start"])
+    freq = rule["freq"]
+    interval = rule.get("interval") or 1
+    skip = rule.get("count") is None and first > start
+
+    if freq == "daily":
+        p = (first - start).days // interval if skip else 0
+        while True:
+            d = start + timedelta(days=p * interval)
+            if d > last:
+                return
+            yield d
+            p += 1
+
+    elif freq == "weekly":
+        weekdays = rule.get("weekdays") or [start.weekday()]
+        monday = start - timedelta(days=start.weekday())
+        p = (first - monday).days // 7 // interval if skip else 0
+        while True:
+            base = monday + timedelta(weeks=p * interval)
+            if base > last:
+                return
+            for wd in weekdays:
+                d = base + timedelta(days=wd)
+                if d >= start:
+                    yield d
+            p += 1
+
+    elif freq == "monthly":
+        m0 = start.year * 12 + start.month - 1
+        p = (first.year * 12 + first.month - 1 - m0) // interval if skip else 0
+        while True:
+            year, month = divmod(m0 + p * interval, 12)
+            month += 1
+            if date(year, month, 1) > last:
+                return
+            for d in _month_dates(rule, year, month, start):
+                if d >= start:
+                    yield d
+            p += 1
+
+    elif freq == "yearly":
+        p = (first.year - start.year) // interval if skip else 0
+        while True:
+            year = start.year + p * interval
+            if date(year, start.month, 1) > last:
+                return
+            for d in _month_dates(rule, year, start.month, start):
+                if d >= start:
+                    yield d
+            p += 1
+
+
+def expand_rule(rule: dict, first: str, last: str) -> list[str]:
+    """first 〜 last（両端を含む）の範囲に発生する日付 "YYYY-MM-DD" のリストを返します。"""
+    first_d = date.fromisoformat(first)
+    last_d = date.fromisoformat(last)
+    if rule.get("until"):
+        last_d = min(last_d, date.fromisoformat(rule["until"]))
+    count = rule.get("count")
+    exdates = set(rule.get("exdates") or ())
+
+    result = []
+    for n, d in enumerate(_candidate_dates(rule, first_d, last_d), start=1):
+        if count is not None and n > count:
+            break
+        if d < first_d or d > last_d:
+            continue
+        date_str = d.isoformat()
+        # 除外日は回数には数える（RFC 5545 の EXDATE と同じ扱い）
+        if date_str not in exdates:
+            result.append(date_str)
+    return result
+
+
+def make_occurrence(rule: dict, date_str: str) -> dict:
+    """ルールの 1 回分を、通常の予定と同じ形の dict にします。"""
+    return {
+        "id":         f"{rule['id']}:{date_str}",
+        "title":      rule["title"],
+        "start_time": rule.get("start_time", ""),
+        "end_time":   rule.get("end_time", ""),
+        "memo":       rule.get("memo", ""),
+        "rule_id":    rule["id"],
+    }
+
+
+class RecurrenceSet:
+    """
+    繰り返しルールの集合。
+
+    各回の予定は保存せず、表示する月の分だけを展開します。展開結果は
+    (ルール ID, 年, 月) ごとにキャッシュし、ルールが変わったときはそのルールの分だけ捨てます。
+    """
+
+    def __init__(self, rules: list[dict] | None = None):
+        # ルール ID → ルール
+        self.rules = {rule["id"]: rule for rule in rules or ()}
+        # (ルール ID, 年, 月) → その月の発生日のリスト
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def invalidate(self, rule_id: str | None = None) -> None:
+        """rule_id の展開キャッシュを捨てます。None ならすべて捨てます。"""
+        if rule_id is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[0] == rule_id]:
+            del self._cache[key]
+
+    def _dates_in_month(self, rule: dict, year: int, month: int) -> list[str]:
+        key = (rule["id"], year, month)
+        dates = self._cache.get(key)
+        if dates is None:
+            last_day = calendar.monthrange(year, month)[1]
+            dates = expand_rule(rule, f"{year}-{month:02d}-01", f"{year}-{month:02d}-{last_day:02d}")
+            self._cache[key] = dates
+        return dates
+
+    def occurrences_for_month(self, year: int, month: int) -> dict[str, list[dict]]:
+        """その月の各回を 日付キー → 予定リスト の形で返します。"""
+        result = {}
+        for rule in self.rules.values():
+            for date_str in self._dates_in_month(rule, year, month):
+                result.setdefault(date_str, []).append(make_occurrence(rule, date_str))
+        for day in result.values():
+            day.sort(key=lambda ev: ev["start_time"])
+        return result
+
+    def occurrences_on(self, date_str: str) -> list[dict]:
+        """指定日の各回のリストを返します。"""
+        return self.occurrences_for_month(int(date_str[:4]), int(date_str[5:7])).get(date_str, [])
+
+
+def iter_occurrences(recurrences: RecurrenceSet, start: str, end: str) -> Iterator[tuple[str, dict]]:
+    """
+    start 〜 end（両端を含む）の各回を (日付, 予定) として日付順に返すイテレータです。
+    1 か月ずつ展開するので、長い期間でも保持するのは 1 か月分だけです（キャッシュは使わない）。
+    """
+    year, month = int(start[:4]), int(start[5:7])
+    while f"{year}-{month:02d}-01" <= end:
+        last_day = calendar.monthrange(year, month)[1]
+        first = max(start, f"{year}-{month:02d}-01")
+        last = min(end, f"{year}-{month:02d}-{last_day:02d}")
+        items = [
+            (date_str, rule.get("start_time", ""), make_occurrence(rule, date_str))
+            for rule in recurrences.rules.values()
+            for date_str in expand_rule(rule, first, last)
+        ]
+        items.sort(key=lambda item: item[:2])
+        for date_str, _, occurrence in items:
+            yield date_str, occurrence
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def load_recurrences() -> RecurrenceSet:
+    """recurrences.json を読み込みます。ファイルがなければ空の集合を返します。"""
+    if not os.path.exists(RECURRENCES_FILE):
+        return RecurrenceSet()
+    try:
+        with open(RECURRENCES_FILE, "r", encoding="utf-8") as f:
+            return RecurrenceSet(json.load(f))
+    except (json.JSONDecodeError, OSError, KeyError, TypeError) as e:
+        print(f"[warning] recurrences.json の読み込みに失敗しました: {e}", file=sys.stderr)
+        return RecurrenceSet()
+
+
+def save_recurrences(recurrences: RecurrenceSet) -> None:
+    """ルールを recurrences.json に保存します（ルールの数だけなので同期で書き込む）。"""
+    os.makedirs(os.path.dirname(RECURRENCES_FILE) or ".", exist_ok=True)
+    text = json.dumps(list(recurrences.rules.values()), ensure_ascii=False, indent=2)
+    atomic_write_text(RECURRENCES_FILE, text)
+
+
+def add_recurrence(recurrences: RecurrenceSet, rule: dict) -> str:
+    """ルールを追加して保存し、ルール ID を返します。"""
+    recurrences.rules[rule["id"]] = rule
+    recurrences.invalidate(rule["id"])
+    save_recurrences(recurrences)
+    return rule["id"]
+
+
+def update_recurrence(recurrences: RecurrenceSet, rule_id: str, **changes) -> bool:
+    """ルールの項目を変更して保存します。ルールがなければ False。"""
+    rule = recurrences.rules.get(rule_id)
+    if rule is None:
+        return False
+    rule.update(changes)
+    recurrences.invalidate(rule_id)
+    save_recurrences(recurrences)
+    return True
+
+
+def delete_recurrence(recurrences: RecurrenceSet, rule_id: str) -> bool:
+    """ルールを削除して保存します。ルールがなければ False。"""
+    if recurrences.rules.pop(rule_id, None) is None:
+        return False
+    recurrences.invalidate(rule_id)
+    save_recurrences(recurrences)
+    return True
+
+
+def add_exception(recurrences: RecurrenceSet, rule_id: str, date_str: str) -> bool:
+    """ルールの date_str の回だけを取り消します（除外日に追加）。"""
+    rule = recurrences.rules.get(rule_id)
+    if rule is None:
+        return False
+    exdates = set(rule.get("exdates") or ())
+    exdates.add(date_str)
+    return update_recurrence(recurrences, rule_id, exdates=sorted(exdates))
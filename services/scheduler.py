@@ -0,0 +1,115 @@
+# calendar_app/services/scheduler.py
+
+import heapq
+from datetime import date, timedelta
+from typing import Iterator
+
+from services.date_index import iter_events_between
+from services.event_model import format_time, parse_time
+from services.holiday_service import peek_holidays
+from services.jp_holidays import holidays_for_year
+from services.recurrence import iter_occurrences
+
+# 空き時間を探すときの既定値
+DEFAULT_DAY_START = "09:00"
+DEFAULT_DAY_END = "18:00"
+# 平日（月曜=0 〜 金曜=4）
+BUSINESS_DAYS = (0, 1, 2, 3, 4)
+
+
+def holidays_between(start: str, end: str) -> dict:
+    """
+    start 〜 end の年の祝日をまとめて返します（日付 → 祝日名）。
+    予定入力画面の空き時間検索から UI スレッドで呼ばれるので API は待たず、
+    メモリ上（とキャッシュファイル）にない年は計算した祝日で代用します。
+    """
+    holidays = {}
+    for year in range(int(start[:4]), int(end[:4]) + 1):
+        found = peek_holidays(year)
+        holidays.update(found if found is not None else holidays_for_year(year))
+    return holidays
+
+
+def _busy_intervals(items) -> Iterator[tuple[int, int]]:
+    """
+    (日付, 予定) の並びを、通算分（日付の通し番号 × 1440 + 分）の区間 [開始, 終了) にします。
+    時刻のない予定は空き時間を塞がないものとして除き、開始時刻だけの予定は 1 分間として扱います。
+    """
+    for date_str, event in items:
+        start = parse_time(event.get("start_time", ""))
+        if start is None:
+            continue
+        end = parse_time(event.get("end_time", ""))
+        if end is None or end <= start:
+            end = start + 1
+        base = date.fromisoformat(date_str).toordinal() * 1440
+        yield base + start, base + end
+
+
+def _windows(start: str, end: str, day_start: int, day_end: int,
+             weekdays, holidays: dict) -> Iterator[tuple[int, int]]:
+    """対象日（曜日が weekdays に含まれ、祝日でない日）の探す時間帯を日付順に返します。"""
+    d = date.fromisoformat(start)
+    last = date.fromisoformat(end)
+    while d <= last:
+        if d.weekday() in weekdays and d.isoformat() not in holidays:
+            base = d.toordinal() * 1440
+            yield base + day_start, base + day_end
+        d += timedelta(days=1)
+
+
+def sweep_free_slots(busy, windows, duration: int) -> Iterator[tuple[int, int]]:
+    """
+    開始順にソートした忙しい区間 busy と、日付順の時間帯 windows を 1 回ずつ走査し、
+    各時間帯の中で duration 分以上空いている区間 [開始, 終了) を返します。
+    """
+    busy = iter(busy)
+    current = next(busy, None)
+    for win_start, win_end in windows:
+        cursor = win_start
+        # この時間帯より前に終わる予定は読み飛ばす
+        while current is not None and current[1] <= cursor:
+            current = next(busy, None)
+        while current is not None and current[0] < win_end:
+            if current[0] - cursor >= duration:
+                yield cursor, current[0]
+            cursor = max(cursor, current[1])
+            if current[1] > win_end:
+                # 次の時間帯にかかる予定は残しておく
+                break
+            current = next(busy, None)
+        if win_end - cursor >= duration:
+            yield cursor, win_end
+
+
+def find_free_slots(events: dict, start: str, end: str, duration: int = 60,
+                    day_start: str = DEFAULT_DAY_START, day_end: str = DEFAULT_DAY_END,
+                    weekdays=BUSINESS_DAYS, holidays: dict | None = None,
+                    recurrences=None, limit: int | None = None) -> list[tuple[str, str, str]]:
+    """
+    start 〜 end（"YYYY-MM-DD"、両端を含む）の各日の day_start 〜 day_end のうち、
+    duration 分以上空いている時間帯を (日付, 開始 "HH:MM", 終了 "HH:MM") のリストで返します。
+
+    対象は weekdays の曜日（既定は平日）で、祝日は除きます。holidays を省略すると
+    holiday_service から取得します。予定の区間を一度ソートして走査するので O(n log n) です。
+    """
+    first, last = parse_time(day_start), parse_time(day_end)
+    if first is None or last is None or last <= first or duration <= 0:
+        raise ValueError("探す時間帯の指定が正しくありません")
+    if holidays is None:
+        holidays = holidays_between(start, end)
+
+    items = iter_events_between(events, start, end)
+    if recurrences:
+        items = heapq.merge(items, iter_occurrences(recurrences, start, end), key=lambda item: item[0])
+    busy = sorted(_busy_intervals(items))
+
+    result = []
+    for slot_start, slot_end in sweep_free_slots(busy, _windows(start, end, first, last, weekdays, holidays),
+                                                 duration):
+        ordinal, minutes = divmod(slot_start, 1440)
+        result.append((date.fromordinal(ordinal).isoformat(), format_time(minutes),
+                       format_time(slot_end - ordinal * 1440)))
+        if limit is not None and len(result) >= limit:
+            break
+    return result
@@ -0,0 +1,137 @@
+# calendar_app/services/search_index.py
+
+import heapq
+import unicodedata
+
+from services.event_manager import EventCollection
+
+
+def normalize(text: str) -> str:
+    """
+    検索用に文字列を正規化します。
+    全角英数・半角カナなどを NFKC でそろえ、英字は小文字にします。
+    """
+    return unicodedata.normalize("NFKC", text or "").lower()
+
+
+def tokenize(text: str) -> set[str]:
+    """
+    正規化済みの文字列を 1 文字と 2 文字（bigram）のトークンに分けます。
+    形態素解析なしで「東北出張」のような日本語も部分一致で引けるようにするためです。
+    空白をまたぐ bigram は作りません。
+    """
+    tokens = set()
+    for word in text.split():
+        tokens.update(word)
+        tokens.update(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def _query_tokens(word: str) -> set[str]:
+    """検索語 1 つ分のトークン。2 文字以上なら bigram だけで絞り込めます。"""
+    if len(word) == 1:
+        return {word}
+    return {word[i:i + 2] for i in range(len(word) - 1)}
+
+
+def _descending(text: str) -> tuple:
+    """日付の降順に並べつつ、同じ日の中では開始時刻を昇順にするためのキー"""
+    return tuple(-ord(c) for c in text)
+
+
+class SearchIndex:
+    """
+    予定のタイトルとメモに対する転置索引。
+
+    トークン → 予定 ID の集合を持ち、検索語のトークンの集合を小さい順に積集合して
+    候補を絞り、最後に本文に検索語が連続して含まれるかを確かめます。
+    EventCollection の listener として登録すると、予定の追加・更新・削除に追従します。
+    """
+
+    def __init__(self, events: dict | None = None):
+        # トークン → 予定 ID の集合
+        self._postings = {}
+        # 予定 ID → (日付, 開始時刻の並び替えキー, 正規化したタイトル＋メモ)
+        self._docs = {}
+        if events:
+            for date_str, day in events.items():
+                for data in day:
+                    self.add(date_str, data)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, date_str: str, data: dict) -> None:
+        event_id = data.get("id")
+        if event_id is None:
+            return
+        self.remove(event_id)
+        text = normalize(f"{data.get('title', '')}\n{data.get('memo', '')}")
+        self._docs[event_id] = (date_str, _descending(data.get("start_time", "")), text)
+        for token in tokenize(text):
+            self._postings.setdefault(token, set()).add(event_id)
+
+    def remove(self, event_id: str) -> None:
+        doc = self._docs.pop(event_id, None)
+        if doc is None:
+            return
+        for token in tokenize(doc[2]):
+            ids = self._postings.get(token)
+            if ids is not None:
+                ids.discard(event_id)
+                if not ids:
+                    del self._postings[token]
+
+    # ─── EventCollection からの通知 ───
+    def on_event_added(self, date_str: str, data: dict) -> None:
+        self.add(date_str, data)
+
+    def on_event_removed(self, date_str: str, data: dict) -> None:
+        self.remove(data.get("id"))
+
+    def search(self, query: str, limit: int | None = None) -> list[tuple[str, str]]:
+        """
+        query を空白で区切ったすべての語を含む予定を探し、(日付, 予定 ID) のリストを
+        新しい日付順（同じ日は開始時刻順）で返します。
+        """
+        words = normalize(query).split()
+        if not words:
+            return []
+
+        # 件数の少ないトークンから積集合をとると、途中の集合が小さく済む
+        tokens = set().union(*(_query_tokens(word) for word in words))
+        postings = sorted((self._postings.get(t, set()) for t in tokens), key=len)
+        candidates = postings[0]
+        for ids in postings[1:]:
+            if not candidates:
+                return []
+            candidates = candidates & ids
+
+        # 3 文字以上の語は bigram がそろっていても連続しているとは限らないので本文で確認する
+        docs = self._docs
+        long_words = [word for word in words if len(word) > 2]
+        hits = [
+            (docs[event_id][0], docs[event_id][1], event_id)
+            for event_id in candidates
+            if all(word in docs[event_id][2] for word in long_words)
+        ]
+        if limit is not None and limit < len(hits):
+            hits = heapq.nlargest(limit, hits)
+        else:
+            hits.sort(reverse=True)
+        return [(date_str, event_id) for date_str, _, event_id in hits]
+
+
+def get_search_index(events: dict) -> SearchIndex:
+    """
+    events の検索索引を返します。EventCollection なら一度だけ作って以後の変更に追従させ、
+    ただの dict ならその場で作ります。
+    """
+    if isinstance(events, EventCollection):
+        return events.get_index(SearchIndex)
+    return SearchIndex(events)
+
+
+def search_events(events: dict, query: str, limit: int | None = None) -> list[tuple[str, str]]:
+    """タイトルかメモに query を含む予定の (日付, 予定 ID) を新しい順に返します。"""
+    return get_search_index(events).search(query, limit)
@@ -0,0 +1,136 @@
+# calendar_app/services/stats.py
+
+import heapq
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+from services.event_model import TITLE_CHOICES, parse_time
+from services.recurrence import iter_occurrences
+
+# 集計の単位
+PERIODS = ("day", "week", "month")
+
+# 分類（予定のタイトルの選択肢）。選択肢にないタイトルは「その他」に入れる
+CATEGORIES = list(TITLE_CHOICES)
+_OTHER = CATEGORIES.index("その他")
+_CATEGORY_INDEX = {name: i for i, name in enumerate(CATEGORIES)}
+
+# 時刻の文字列は高々 1440 通りなので、変換結果をキャッシュして使い回す
+_parse_time = lru_cache(maxsize=4096)(parse_time)
+
+# date.toordinal() と numpy の datetime64[D]（1970-01-01 が 0）の差
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class EventStats:
+    """
+    予定の集計エンジン。
+
+    予定を日付（date.toordinal() の値）・開始分・終了分・分類番号の 4 本の NumPy 配列として
+    一度だけ読み込み、日・週・月ごとの時間や、曜日 × 時間帯のヒートマップをすべて配列演算で求めます。
+    時刻のない予定や、終了時刻が開始時刻以前の予定は時間 0 として扱います。
+    """
+
+    def __init__(self, ordinals, starts, ends, categories):
+        self.ordinals = np.asarray(ordinals, dtype=np.int64)
+        self.starts = np.asarray(starts, dtype=np.int32)
+        self.ends = np.asarray(ends, dtype=np.int32)
+        self.categories = np.asarray(categories, dtype=np.int8)
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    @classmethod
+    def from_items(cls, items) -> "EventStats":
+        """(日付, 予定 dict) の並びから作ります。"""
+        ordinals, starts, ends, categories = [], [], [], []
+        # 同じ日の予定が続くので、日付の変換は日付が変わったときだけ行う
+        last_date, ordinal = None, 0
+        for date_str, event in items:
+            if date_str != last_date:
+                last_date, ordinal = date_str, date.fromisoformat(date_str).toordinal()
+            start = _parse_time(event.get("start_time", ""))
+            end = _parse_time(event.get("end_time", ""))
+            if start is None or end is None or end <= start:
+                start = end = 0
+            ordinals.append(ordinal)
+            starts.append(start)
+            ends.append(end)
+            categories.append(_CATEGORY_INDEX.get(event.get("title"), _OTHER))
+        return cls(ordinals, starts, ends, categories)
+
+    @property
+    def minutes(self) -> np.ndarray:
+        """各予定の長さ（分）"""
+        return self.ends - self.starts
+
+    def between(self, start: str | None = None, end: str | None = None,
+                category: str | None = None) -> "EventStats":
+        """start 〜 end（両端を含む）、category の予定だけに絞った EventStats を返します。"""
+        mask = np.ones(len(self), dtype=bool)
+        if start:
+            mask &= self.ordinals >= date.fromisoformat(start).toordinal()
+        if end:
+            mask &= self.ordinals <= date.fromisoformat(end).toordinal()
+        if category is not None:
+            mask &= self.categories == _CATEGORY_INDEX.get(category, _OTHER)
+        return EventStats(self.ordinals[mask], self.starts[mask], self.ends[mask], self.categories[mask])
+
+    def _period_keys(self, period: str) -> tuple[np.ndarray, callable]:
+        """各予定の集計単位のキーと、キーを見出しの文字列にする関数を返します。"""
+        if period == "day":
+            return self.ordinals, lambda key: date.fromordinal(int(key)).isoformat()
+        if period == "week":
+            # 月曜始まりの週（0001-01-01 は月曜）
+            return self.ordinals - (self.ordinals - 1) % 7, lambda key: date.fromordinal(int(key)).isoformat()
+        if period == "month":
+            months = (self.ordinals - _EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]")
+            return months.astype(np.int64), lambda key: str(np.datetime64(int(key), "M"))
+        raise ValueError(f"未対応の集計単位です: {period}")
+
+    def hours_by(self, period: str) -> tuple[list[str], np.ndarray]:
+        """
+        period（"day" / "week" / "month"）ごとの合計時間を返します。
+        見出し（"2025-07-14" や "2025-07"）のリストと、時間の配列の組です。
+        """
+        keys, label = self._period_keys(period)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        hours = np.bincount(inverse, weights=self.minutes, minlength=len(unique)) / 60
+        return [label(key) for key in unique], hours
+
+    def hours_by_category(self, period: str) -> tuple[list[str], np.ndarray]:
+        """
+        period ごと × 分類ごとの合計時間を返します。
+        見出しのリストと、形が (見出しの数, len(CATEGORIES)) の配列の組です。
+        """
+        keys, label = self._period_keys(period)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        n = len(CATEGORIES)
+        flat = np.bincount(inverse * n + self.categories, weights=self.minutes, minlength=len(unique) * n)
+        return [label(key) for key in unique], flat.reshape(len(unique), n) / 60
+
+    def heatmap(self) -> np.ndarray:
+        """
+        曜日（月曜=0 〜 日曜=6）× 時間帯（0〜23 時）ごとの合計時間を、形が (7, 24) の配列で返します。
+        予定がまたがる時間帯には、それぞれ重なっている分だけを加えます。
+        """
+        weekdays = (self.ordinals - 1) % 7
+        result = np.empty((7, 24))
+        for hour in range(24):
+            overlap = np.minimum(self.ends, (hour + 1) * 60) - np.maximum(self.starts, hour * 60)
+            result[:, hour] = np.bincount(weekdays, weights=np.clip(overlap, 0, None), minlength=7)
+        return result / 60
+
+
+def load_stats(store, start: str | None = None, end: str | None = None,
+               recurrences=None) -> EventStats:
+    """
+    store の start 〜 end の予定を読み込んで EventStats を作ります。
+    recurrences を渡すと、start と end を両方指定したときだけ繰り返し予定の回も含めます。
+    """
+    items = store.iter_events(start, end)
+    if recurrences and start and end:
+        items = heapq.merge(items, iter_occurrences(recurrences, start, end), key=lambda item: item[0])
+    return EventStats.from_items(items)
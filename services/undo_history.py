@@ -0,0 +1,141 @@
+# calendar_app/services/undo_history.py
+
+from collections import deque
+
+from services.event_manager import find_event
+from services.event_store import EventStore
+
+# 元に戻せる操作の数（古いものから捨てる）
+UNDO_LIMIT = 100
+
+_FIELDS = ("title", "start_time", "end_time", "memo")
+
+
+class UndoHistory(EventStore):
+    """
+    予定の編集を記録し、元に戻す（undo）／やり直す（redo）ためのストア。
+
+    store の追加・更新・削除・移動をそのまま呼び出し、その逆操作（差分）だけを記録します。
+    events 全体のコピーは持たないので、メモリ使用量は編集の回数に比例します。
+    undo / redo も逆操作を store に対して行うだけなので、通常の編集 1 回と同じ書き込みで済みます。
+
+    差分は次の形のタプルです。
+    - ("delete", ID)
+    - ("restore", 日付, その日の何番目か, 予定)
+    - ("update", ID, {"title": ..., "start_time": ..., "end_time": ..., "memo": ...})
+    - ("move", ID, 日付)
+    """
+
+    def __init__(self, store: EventStore, limit: int = UNDO_LIMIT):
+        self.store = store
+        self._undo = deque(maxlen=limit)
+        self._redo = deque(maxlen=limit)
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+
+    # ─── 記録しながら store を呼び出す ───
+    def add_event(self, events, date_str, title, start_time="", end_time="", memo=""):
+        event_id = self.store.add_event(events, date_str, title, start_time, end_time, memo)
+        self._record(("delete", event_id))
+        return event_id
+
+    def update_event(self, events, event_id, title, start_time="", end_time="", memo=""):
+        fields = dict(title=title, start_time=start_time, end_time=end_time, memo=memo)
+        return self._do(events, ("update", event_id, fields))
+
+    def delete_event(self, events, event_id):
+        return self._do(events, ("delete", event_id))
+
+    def move_event(self, events, event_id, new_date):
+        return self._do(events, ("move", event_id, new_date))
+
+    def restore_event(self, events, date_str, event, position=None):
+        return self._do(events, ("restore", date_str, position, event))
+
+    # ─── そのまま store に任せる（記録しない） ───
+    def load_events(self, start=None, end=None):
+        return self.store.load_events(start, end)
+
+    def iter_events(self, start=None, end=None):
+        return self.store.iter_events(start, end)
+
+    def add_events(self, events, items):
+        return self.store.add_events(events, items)
+
+    def close(self):
+        self.store.close()
+
+    # ─── undo / redo ───
+    def undo(self, events: dict) -> set[str] | None:
+        """
+        直前の編集を取り消し、影響を受けた日付キーの集合を返します。
+        取り消す編集がないときや、対象の予定がもう存在しないときは None を返します。
+        """
+        return self._replay(events, self._undo, self._redo)
+
+    def redo(self, events: dict) -> set[str] | None:
+        """取り消した編集をやり直し、影響を受けた日付キーの集合を返します。"""
+        return self._replay(events, self._redo, self._undo)
+
+    def _record(self, inverse: tuple) -> None:
+        """新しい編集の逆操作を積みます。新しい編集をしたら、やり直しの履歴は捨てます。"""
+        self._undo.append(inverse)
+        self._redo.clear()
+
+    def _do(self, events: dict, delta: tuple) -> bool:
+        result = self._apply(events, delta)
+        if result is None:
+            return False
+        self._record(result[0])
+        return True
+
+    def _replay(self, events: dict, source: deque, target: deque) -> set[str] | None:
+        if not source:
+            return None
+        result = self._apply(events, source.pop())
+        if result is None:
+            # ほかのプロセスで消された予定などは、取り消せないので履歴から捨てる
+            return None
+        inverse, dates = result
+        target.append(inverse)
+        return dates
+
+    def _apply(self, events: dict, delta: tuple) -> tuple[tuple, set[str]] | None:
+        """
+        差分を store に適用し、(逆操作, 影響を受けた日付キーの集合) を返します。
+        適用できなかったときは None を返します。
+        """
+        op = delta[0]
+        if op == "restore":
+            _, date_str, position, event = delta
+            if not self.store.restore_event(events, date_str, event, position):
+                return None
+            return ("delete", event["id"]), {date_str}
+
+        found = find_event(events, delta[1])
+        if found is None:
+            return None
+        date_str, event = found
+        if op == "delete":
+            position = next(i for i, ev in enumerate(events[date_str]) if ev is event)
+            if not self.store.delete_event(events, event["id"]):
+                return None
+            return ("restore", date_str, position, event), {date_str}
+        if op == "update":
+            old = {key: event.get(key, "") for key in _FIELDS}
+            if not self.store.update_event(events, event["id"], **delta[2]):
+                return None
+            return ("update", event["id"], old), {date_str}
+        if op == "move":
+            if not self.store.move_event(events, event["id"], delta[2]):
+                return None
+            return ("move", event["id"], date_str), {date_str, delta[2]}
+        raise ValueError(f"未対応の操作です: {op}")
@@ -1,13 +1,20 @@
 # services/weather_service.py
 import requests
+import os
 import sys
 import json
+import threading
+import time
 from datetime import datetime
+from services.http_client import get_client
 
 # 気象庁の予報概況JSONデータのURL
 # 140000 は神奈川県の地域コード
 JSON_URL = "https://www.jma.go.jp/bosai/forecast/data/overview_forecast/140000.json"
 
+# 天気を取得し直すまでの時間（秒）。これより古い天気も表示は続け、裏で取得し直す
+WEATHER_TTL_SEC = int(os.environ.get("CALENDAR_APP_WEATHER_TTL", 30 * 60))
+
 def get_weather_for_today() -> dict | None:
     """
     気象庁APIから横浜市の今日の天気概況を取得
@@ -15,25 +22,9 @@ def get_weather_for_today() -> dict | None:
     """
     try:
         # print(f"URLにアクセス中: {JSON_URL}")
-        res = requests.get(JSON_URL)
-        res.raise_for_status() # HTTPエラーチェック
-        
-        data = res.json()
-        
-        weather_text = data.get("text", "")
-        
-        kanagawa_weather = _extract_kanagawa_weather(weather_text)
-        
-        if not kanagawa_weather:
-             return None
-        
-        icons = _get_weather_icon_from_text(kanagawa_weather)
-        
-        # 修正: publishing_officeを返さない
-        return {
-            "icon": icons,
-            "description": kanagawa_weather
-        }
+        # タイムアウト・再試行・ETag による再検証つきで取得（HTTPエラーは例外になる）
+        data = get_client().get_json(JSON_URL)
+        return _weather_from_data(data)
 
     except requests.exceptions.RequestException as e:
         print(f"[ERROR] HTTPリクエストエラー: {e}", file=sys.stderr)
@@ -45,6 +36,113 @@ def get_weather_for_today() -> dict | None:
         print(f"[ERROR] 天気情報取得で不明なエラー: {e}", file=sys.stderr)
         return None
 
+class WeatherCache:
+    """
+    TTL つきの天気のキャッシュ（stale-while-revalidate）。
+
+    get() はメモリ上の天気をすぐに返し、ttl 秒より古い（またはまだない）ときだけ
+    ワーカースレッドで取得し直して、取得できたら callback(天気) を呼びます。
+    起動直後は、前回 HTTP クライアントが保存した応答から天気を復元して表示します。
+    """
+
+    def __init__(self, ttl: float | None = None):
+        self.ttl = WEATHER_TTL_SEC if ttl is None else ttl
+        self._weather = None
+        # 天気を取得した時刻（time.time()）。None はまだ取得していない
+        self._fetched_at = None
+        self._restored = False
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _restore(self) -> None:
+        """前回保存された応答から天気を復元します（_lock 取得済みで呼ぶこと）。"""
+        self._restored = True
+        entry = get_client().load_cached(JSON_URL)
+        if entry is None:
+            return
+        try:
+            self._weather = _weather_from_data(json.loads(entry["body"]))
+        except (ValueError, AttributeError):
+            return
+        self._fetched_at = entry.get("fetched_at")
+
+    def is_stale(self) -> bool:
+        return self._fetched_at is None or time.time() - self._fetched_at >= self.ttl
+
+    def get(self, callback=None) -> dict | None:
+        """
+        キャッシュの天気を返します（ネットワークを待たない）。古ければ裏で取得し直し、
+        取得できたらワーカースレッドから callback(天気) を呼びます。
+        """
+        with self._lock:
+            if not self._restored:
+                self._restore()
+            weather = self._weather
+            if self._refreshing or not self.is_stale():
+                return weather
+            self._refreshing = True
+        threading.Thread(target=self._refresh, args=(callback,),
+                         name="weather-refresh", daemon=True).start()
+        return weather
+
+    def _refresh(self, callback) -> None:
+        try:
+            weather = get_weather_for_today()
+        finally:
+            with self._lock:
+                self._refreshing = False
+        if weather is None:
+            # 取得できなければ古い天気のまま（次の get() で再試行する）
+            return
+        with self._lock:
+            self._weather = weather
+            self._fetched_at = time.time()
+        if callback is not None:
+            callback(weather)
+
+    def invalidate(self) -> None:
+        """メモリ上の天気を破棄します。"""
+        with self._lock:
+            self._weather = None
+            self._fetched_at = None
+            self._restored = False
+
+
+_cache = WeatherCache()
+
+
+def get_cached_weather(callback=None) -> dict | None:
+    """
+    キャッシュの天気をすぐに返します。WEATHER_TTL_SEC より古ければバックグラウンドで
+    取得し直し、取得できたら callback(天気) を呼びます（ワーカースレッドから）。
+    """
+    return _cache.get(callback)
+
+
+def invalidate_weather_cache() -> None:
+    """メモリ上の天気を破棄します（次の get_cached_weather() で復元・取得し直す）。"""
+    _cache.invalidate()
+
+
+def _weather_from_data(data: dict) -> dict | None:
+    """
+    予報概況の JSON から、表示する天気（アイコンと概況文）を取り出す
+    """
+    weather_text = data.get("text", "")
+
+    kanagawa_weather = _extract_kanagawa_weather(weather_text)
+
+    if not kanagawa_weather:
+        return None
+
+    icons = _get_weather_icon_from_text(kanagawa_weather)
+
+    # 修正: publishing_officeを返さない
+    return {
+        "icon": icons,
+        "description": kanagawa_weather
+    }
+
 def _get_weather_icon_from_text(text: str) -> list[str]:
     """
     天気概況のテキストから対応するアイコンのファイル名を返す
@@ -0,0 +1,55 @@
+import argparse
+import os
+from datetime import date
+
+from services.event_store import open_store
+from services.recurrence import load_recurrences
+from services.stats import CATEGORIES, PERIODS, load_stats
+
+_WEEKDAY_NAMES = ["月", "火", "水", "木", "金", "土", "日"]
+
+
+def main(argv=None):
+    """予定の時間を集計して表示するコマンドライン版の統計"""
+    year = date.today().year
+    parser = argparse.ArgumentParser(description="予定の時間を日・週・月・分類ごとに集計します。")
+    parser.add_argument("--from", dest="start", metavar="YYYY-MM-DD", default=f"{year}-01-01",
+                        help="集計の開始日（省略時は今年の 1 月 1 日）")
+    parser.add_argument("--to", dest="end", metavar="YYYY-MM-DD", default=f"{year}-12-31",
+                        help="集計の終了日（省略時は今年の 12 月 31 日）")
+    parser.add_argument("--by", choices=PERIODS, default="month", help="集計の単位")
+    parser.add_argument("--category", choices=CATEGORIES, help="この分類の予定だけを集計する")
+    parser.add_argument("--by-category", action="store_true", help="分類ごとの列に分けて表示する")
+    parser.add_argument("--heatmap", action="store_true", help="曜日 × 時間帯の表を表示する")
+    parser.add_argument("--store", default=os.environ.get("CALENDAR_APP_STORE", "json"),
+                        choices=("json", "sqlite", "shards"), help="読み込むストアの種類")
+    parser.add_argument("--no-recurring", action="store_true", help="繰り返し予定を含めない")
+    args = parser.parse_args(argv)
+
+    store = open_store(args.store)
+    recurrences = None if args.no_recurring else load_recurrences()
+    try:
+        stats = load_stats(store, args.start, args.end, recurrences)
+    finally:
+        store.close()
+    if args.category:
+        stats = stats.between(category=args.category)
+
+    if args.heatmap:
+        print("\t".join(["曜日"] + [f"{hour}時" for hour in range(24)]))
+        for name, row in zip(_WEEKDAY_NAMES, stats.heatmap()):
+            print("\t".join([name] + [f"{hours:.1f}" for hours in row]))
+    elif args.by_category:
+        labels, table = stats.hours_by_category(args.by)
+        print("\t".join(["期間"] + CATEGORIES))
+        for label, row in zip(labels, table):
+            print("\t".join([label] + [f"{hours:.1f}" for hours in row]))
+    else:
+        labels, hours = stats.hours_by(args.by)
+        print("期間\t時間")
+        for label, value in zip(labels, hours):
+            print(f"{label}\t{value:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# tests/conftest.py
+
+import pytest
+
+from services import event_manager, holiday_service, weather_service
+
+
+@pytest.fixture(autouse=True)
+def _reset_service_caches():
+    """
+    サービス層のモジュール内キャッシュをテストごとにリセットする。
+    （前のテストで読み込んだ実ファイルの内容が、モックしたテストに混ざらないように）
+    """
+    event_manager.invalidate_events_cache()
+    holiday_service.invalidate_holiday_cache()
+    weather_service.invalidate_weather_cache()
+    yield
+    event_manager.invalidate_events_cache()
+    holiday_service.invalidate_holiday_cache()
+    weather_service.invalidate_weather_cache()
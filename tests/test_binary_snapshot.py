@@ -0,0 +1,100 @@
+# tests/test_binary_snapshot.py
+
+import json
+import os
+
+from services import event_manager
+from services.binary_snapshot import dump_snapshot, load_snapshot
+
+
+# UT-54: バイナリのスナップショットの書き出しと読み込み
+def test_binary_snapshot_round_trip(tmp_path):
+    """
+    dump_snapshot() で書き出した内容が load_snapshot() で同じ dict に戻ること、
+    項目の欠けた予定や列以外の項目・文字列以外の値も保たれること、
+    元の JSON と鮮度が合わないときや壊れているときは None になることを確認する。
+    """
+    path = str(tmp_path / "events.bin")
+    events = {
+        "2025-07-25": [
+            {"id": "a", "title": "会議", "start_time": "10:00", "end_time": "11:00", "memo": "ZOOM\n資料"},
+            {"id": "b", "title": "会議", "start_time": "", "end_time": "", "memo": "😀"},
+        ],
+        "2025-07-26": [
+            {"id": "c", "title": "旧形式", "start_time": "09:00"},                  # 項目が欠けている
+            {"id": "d", "title": "取り込み", "memo": None, "location": ["東京"]},   # 文字列以外・列以外
+        ],
+    }
+    dump_snapshot(path, events, (123, 456))
+    assert load_snapshot(path, (123, 456)) == events
+    assert load_snapshot(path, (123, 457)) is None
+    assert load_snapshot(path, None) is None
+    assert load_snapshot(str(tmp_path / "missing.bin"), (123, 456)) is None
+
+    dump_snapshot(path, {"2025-07-25": events["2025-07-25"]}, (1, 2))
+    assert load_snapshot(path, (1, 2)) == {"2025-07-25": events["2025-07-25"]}
+
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)
+    assert load_snapshot(path, (1, 2)) is None
+
+
+# UT-55: 起動時は鮮度の合うバイナリのスナップショットを優先すること
+def test_load_events_prefers_fresh_binary_snapshot(tmp_path, monkeypatch):
+    """
+    読み込むだけではバイナリ版を作らず、スナップショットを書き出すと作られること、
+    次回からは JSON をパースせずにそれが使われること、JSON が書き換えられたら
+    JSON を読み直すことを確認する。
+    """
+    events_file = tmp_path / "events.json"
+    events_file.write_text(json.dumps({
+        "2025-07-25": [{"title": "既存", "start_time": "10:00", "end_time": "11:00", "memo": ""}]
+    }), encoding="utf-8")
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(events_file))
+
+    first = event_manager.load_events()
+    assert not (tmp_path / "events.bin").exists()
+    assert event_manager.save_events(first) is True
+    assert (tmp_path / "events.bin").exists()
+
+    # 2 回目はバイナリから読むので JSON はパースしない
+    event_manager.invalidate_events_cache()
+    parse_calls = []
+    original_parse = event_manager._parse_snapshot
+    monkeypatch.setattr(event_manager, "_parse_snapshot",
+                        lambda text: (parse_calls.append(text), original_parse(text))[1])
+    second = event_manager.load_events()
+    assert second == first
+    assert second.by_id.keys() == first.by_id.keys()
+    assert parse_calls == []
+
+    # ジャーナルの操作はバイナリの内容に対して再生される
+    event_id = event_manager.add_event(second, "2025-07-26", "追加")
+    assert event_manager.flush_pending_saves(timeout=5)
+    event_manager.invalidate_events_cache()
+    assert event_manager.find_event(event_manager.load_events(), event_id)[0] == "2025-07-26"
+    assert parse_calls == []
+
+    # ほかのアプリが JSON を書き換えたらバイナリは古いものとして使わない
+    events_file.write_text(json.dumps({"2025-08-01": [{"id": "x", "title": "外部"}]}), encoding="utf-8")
+    event_manager.invalidate_events_cache()
+    third = event_manager.load_events()
+    assert len(parse_calls) == 1
+    assert third.by_id.keys() >= {"x", event_id}
+
+
+# UT-74: 単独のサロゲートを含む予定
+def test_binary_snapshot_lone_surrogate(tmp_path, monkeypatch):
+    """
+    JSON として正しい "\\ud800" のような単独のサロゲートを含む予定でも、
+    読み込みが失敗せず、バイナリ版も同じ文字列のまま往復できることを確認する。
+    """
+    events_file = tmp_path / "events.json"
+    events_file.write_text('{"2025-01-01": [{"id": "a", "title": "\\ud800x", "memo": ""}]}', encoding="utf-8")
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(events_file))
+    events = event_manager.load_events()
+    assert events["2025-01-01"][0]["title"] == "\ud800x"
+
+    path = str(tmp_path / "events.bin")
+    dump_snapshot(path, events, (1, 2))
+    assert load_snapshot(path, (1, 2)) == events
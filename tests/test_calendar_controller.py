@@ -180,3 +180,72 @@ def test_add_event_to_date():
             ]
         }
         assert called_args[0] == expected_events_at_call
+
+
+# UT-59: 月を移動しても年が変わらなければ祝日を読み込み直さないこと
+def test_controller_loads_holidays_only_when_year_changes():
+    """
+    同じ年の中での月移動では get_holidays_for_year() を呼ばず、
+    年をまたいだときだけその年の祝日を取得することを確認する。
+    """
+    holidays = {2025: {"2025-12-31": "大晦日"}, 2026: {"2026-01-01": "元日"}}
+    with patch("controllers.calendar_controller.get_holidays_for_year",
+               side_effect=lambda year: holidays.get(year, {})) as mock_get, \
+         patch("controllers.calendar_controller.load_events", return_value={}), \
+         patch("controllers.calendar_controller.get_weather_for_today", return_value=None):
+        controller = CalendarController()
+        controller.go_to_date("2025-10-01")
+        mock_get.reset_mock()
+
+        controller.next_month()
+        controller.next_month()
+        controller.prev_month()
+        mock_get.assert_not_called()
+
+        controller.next_month()
+        controller.next_month()
+        assert (controller.current_year, controller.current_month) == (2026, 1)
+        mock_get.assert_called_once_with(2026)
+        assert controller.holidays == {"2026-01-01": "元日"}
+
+
+# UT-64: holiday_notifier を指定すると、年をまたいでも祝日 API の応答を待たないこと
+def test_controller_prefetches_holidays_in_background(tmp_path, monkeypatch):
+    """
+    API の応答が返らない間も next_month() がすぐに戻って計算した祝日を表示し、
+    ワーカースレッドで取得した祝日が notifier 経由で反映されることを確認する。
+    """
+    import threading
+    from services import holiday_service
+    from services.jp_holidays import holidays_for_year
+
+    monkeypatch.setattr(holiday_service, "CACHE_FILE", str(tmp_path / "holidays.json"))
+    release = threading.Event()
+    fetched = {2026: {"2026-01-01": "元日（API）"}}
+
+    def slow_fetch(year):
+        release.wait(timeout=5)
+        return fetched.get(year, {})
+
+    delivered = []
+    with patch("services.holiday_service.fetch_holidays_from_api", side_effect=slow_fetch), \
+         patch("controllers.calendar_controller.load_events", return_value={}), \
+         patch("controllers.calendar_controller.get_weather_for_today", return_value=None):
+        controller = CalendarController(holiday_notifier=lambda year, holidays: delivered.append((year, holidays)))
+        controller.go_to_date("2025-12-01")
+        controller.next_month()
+        # まだ API は応答していないので、計算した祝日を表示している
+        assert controller.current_year == 2026
+        assert controller.holidays == holidays_for_year(2026)
+
+        release.set()
+        for thread in threading.enumerate():
+            if thread.name == "holiday-prefetch":
+                thread.join(timeout=5)
+
+    assert (2026, fetched[2026]) in delivered
+    assert {2025, 2027} <= {year for year, _ in delivered}
+    for year, holidays in delivered:
+        changed = controller.apply_prefetched_holidays(year, holidays)
+        assert changed == (year == 2026)
+    assert controller.holidays == fetched[2026]
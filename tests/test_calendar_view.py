@@ -124,4 +124,29 @@ def test_calendar_view_update_display(calendar_view_fixture, mocker):
     # tkinter.Label.call_count は、各日のラベル生成でたくさん呼ばれるので注意
 
     # このテストは update() が render() を適切に呼び、属性が更新されることに焦点を当てています。
-    # 実際のUI要素のテストは別途詳細なテストが必要です。
\ No newline at end of file
+    # 実際のUI要素のテストは別途詳細なテストが必要です。
+
+# UT-77: 表示中の月の予定だけを日付キー索引から集めること
+def test_month_events_uses_date_index(calendar_view_fixture):
+    """
+    繰り返し予定があるとき、_month_events() が表示中の月の予定と繰り返し予定の回を合わせ、
+    ほかの月の予定を含めないことを確認する。
+    """
+    from services.event_manager import EventCollection
+    from services.recurrence import RecurrenceSet, make_rule
+
+    view, _, _, _ = calendar_view_fixture
+    view.events = EventCollection({
+        "2025-06-30": [{"id": "a", "title": "前月", "start_time": "", "end_time": "", "memo": ""}],
+        "2025-07-03": [{"id": "b", "title": "会議", "start_time": "10:00", "end_time": "", "memo": ""}],
+        "2025-07-31": [{"id": "c", "title": "月末", "start_time": "", "end_time": "", "memo": ""}],
+        "2025-08-01": [{"id": "d", "title": "翌月", "start_time": "", "end_time": "", "memo": ""}],
+    })
+    recs = RecurrenceSet()
+    rule = make_rule("朝会", "2025-07-03", "monthly", "09:00", monthday=3)
+    recs.rules[rule["id"]] = rule
+    view.recurrences = recs
+
+    merged = view._month_events()
+    assert sorted(merged) == ["2025-07-03", "2025-07-31"]
+    assert [event["title"] for event in merged["2025-07-03"]] == ["朝会", "会議"]
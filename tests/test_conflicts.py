@@ -0,0 +1,61 @@
+# tests/test_conflicts.py
+
+from services.event_manager import EventCollection, attach_event, detach_event, replace_event
+from services.conflicts import ConflictIndex, find_day_conflicts, get_conflict_index, scan_conflicts
+
+
+def _ev(event_id, start, end=""):
+    return {"id": event_id, "title": event_id, "start_time": start, "end_time": end, "memo": ""}
+
+
+# UT-50: 1 日分の走査による重なりの検出
+def test_find_day_conflicts():
+    """
+    入れ子・連鎖・ちょうど接する予定・時刻のない予定・開始時刻だけの予定を含む日で、
+    重なっている組だけが漏れなく返ることを確認する。
+    """
+    day = [
+        _ev("long", "09:00", "12:00"),
+        _ev("inner", "10:00", "10:30"),
+        _ev("chain", "11:30", "13:00"),
+        _ev("touch", "13:00", "14:00"),   # chain とは接するだけ
+        _ev("allday", ""),                # 時刻なしは対象外
+        _ev("point", "13:30"),            # 開始時刻だけは 1 分間
+    ]
+    assert set(find_day_conflicts(day)) == {
+        ("long", "inner"), ("long", "chain"), ("touch", "point"),
+    }
+    assert find_day_conflicts([_ev("a", "09:00", "10:00")]) == []
+
+    items = [("2025-07-01", ev) for ev in day[:2]] + [("2025-07-02", _ev("x", "09:00", "10:00"))]
+    assert scan_conflicts(iter(items)) == {"2025-07-01": [("long", "inner")]}
+
+
+# UT-51: 編集された日だけを計算し直す重なり索引
+def test_conflict_index_follows_edits(mocker):
+    """
+    ConflictIndex が追加・更新・削除に追従し、参照時には変更のあった日だけを
+    計算し直すことを確認する。
+    """
+    events = EventCollection({
+        "2025-07-01": [_ev("a", "09:00", "10:00"), _ev("b", "09:30", "10:30")],
+        "2025-07-02": [_ev("c", "09:00", "10:00")],
+    })
+    index = get_conflict_index(events)
+    assert index is get_conflict_index(events)
+    assert index.conflict_dates() == ["2025-07-01"]
+
+    spy = mocker.patch("services.conflicts.find_day_conflicts", wraps=find_day_conflicts)
+    attach_event(events, "2025-07-02", _ev("d", "09:45", "11:00"))
+    replace_event(events, "b", _ev("b", "10:00", "10:30"))
+    assert list(index.iter_conflicts()) == [("2025-07-02", "c", "d")]
+    # 変更のあった 2 日分だけを計算し直している
+    assert spy.call_count == 2
+
+    detach_event(events, "d")
+    assert index.conflicts_on("2025-07-02") == []
+    assert index.conflict_dates() == []
+
+    # ただの dict でもその場で作れる
+    assert ConflictIndex({"2025-07-03": [_ev("e", "09:00", "10:00"), _ev("f", "09:00")]}).conflict_dates() \
+        == ["2025-07-03"]
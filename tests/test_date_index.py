@@ -0,0 +1,62 @@
+# tests/test_date_index.py
+
+import pytest
+from unittest.mock import patch
+
+from services import event_manager
+from services.event_manager import EventCollection
+from services.date_index import DateKeyIndex, get_date_index, iter_events_between
+
+
+@pytest.fixture
+def events():
+    data = EventCollection({
+        "2025-07-31": [{"id": "a", "title": "月末", "start_time": "", "end_time": "", "memo": ""}],
+        "2025-08-01": [
+            {"id": "b", "title": "朝会", "start_time": "09:00", "end_time": "09:15", "memo": ""},
+            {"id": "c", "title": "会議", "start_time": "13:00", "end_time": "14:00", "memo": ""},
+        ],
+        "2025-08-10": [{"id": "d", "title": "旅行", "start_time": "", "end_time": "", "memo": ""}],
+        "2025-09-01": [{"id": "e", "title": "始業", "start_time": "", "end_time": "", "memo": ""}],
+    })
+    # ジャーナルへの書き込みは行わない
+    with patch('services.event_manager._append_journal'):
+        yield data
+
+
+# UT-33: 日付範囲の予定を日付順に取得
+def test_iter_events_between(events):
+    """
+    両端を含む範囲の予定だけが日付順に返り、結果がイテレータであることを確認する。
+    """
+    result = iter_events_between(events, "2025-08-01", "2025-08-31")
+    assert not isinstance(result, list)
+    assert [(d, ev["id"]) for d, ev in result] == [
+        ("2025-08-01", "b"), ("2025-08-01", "c"), ("2025-08-10", "d"),
+    ]
+    assert list(iter_events_between(events, "2025-08-02", "2025-08-09")) == []
+    # ただの dict でも使える
+    assert [ev["id"] for _, ev in iter_events_between(dict(events), "2025-07-01", "2025-08-01")] == ["a", "b", "c"]
+
+
+# UT-34: 予定の追加・移動・削除への追従
+def test_date_index_follows_mutations(events):
+    """
+    予定のある日付キーの配列が、予定の追加・移動・削除に合わせて更新されることを確認する。
+    """
+    index = get_date_index(events)
+    assert list(index.keys_between("2025-01-01", "2025-12-31")) == [
+        "2025-07-31", "2025-08-01", "2025-08-10", "2025-09-01",
+    ]
+
+    new_id = event_manager.add_event(events, "2025-08-05", "通院")
+    event_manager.move_event(events, "d", "2025-08-20")
+    event_manager.delete_event(events, "b")
+    assert list(index.keys_between("2025-08-01", "2025-08-31")) == ["2025-08-01", "2025-08-05", "2025-08-20"]
+
+    # その日の最後の予定が消えたら日付キーも消える
+    event_manager.delete_event(events, "c")
+    event_manager.delete_event(events, new_id)
+    assert list(index.keys_between("2025-08-01", "2025-08-31")) == ["2025-08-20"]
+    assert len(index) == 3
+    assert len(DateKeyIndex(events)) == 3
@@ -3,8 +3,13 @@
 import pytest
 from unittest.mock import patch, mock_open
 import json
+import os
 from services.event_manager import load_events, save_events
 
+def _without_ids(events):
+    """比較用に、各予定から "id" を取り除いたコピーを返す"""
+    return {d: [{k: v for k, v in ev.items() if k != "id"} for ev in day] for d, day in events.items()}
+
 # Eventクラスのインポートを一時的にコメントアウトまたは削除
 # from services.event_manager import Event # この行を削除、または先頭に # をつける
 
@@ -137,7 +142,9 @@ def test_load_events_valid_data():
         from services.event_manager import load_events 
 
         events = load_events()
-        assert events == expected_events # 読み込まれたデータが期待値と一致するか検証
+        # 旧形式のデータには読み込み時に ID が割り当てられる
+        assert all(ev["id"] for day in events.values() for ev in day)
+        assert _without_ids(events) == expected_events # 読み込まれたデータが期待値と一致するか検証
 
         m.assert_called_once_with(mock_events_file_path, encoding="utf-8")
         
@@ -148,7 +155,7 @@ def test_load_events_valid_data():
 def test_add_event():
     """
     add_event() が新しいイベントを既存のデータに追加し、
-    save_events() を呼び出して保存することを確認する。
+    _append_journal() を呼び出してジャーナルに記録することを確認する。
     """
     # 初期イベントデータ（空でもOKですが、追加されることを明確にするため既存データを用意）
     initial_events = {
@@ -188,8 +195,8 @@ def test_add_event():
         ]
     }
 
-    # save_events をモックして、実際にファイルに書き込まれないようにする
-    with patch('services.event_manager.save_events') as mock_save_events:
+    # _append_journal をモックして、実際にファイルに書き込まれないようにする
+    with patch('services.event_manager._append_journal') as mock_append_journal:
         # add_event を呼び出すための準備
         from services.event_manager import add_event
 
@@ -201,34 +208,37 @@ def test_add_event():
         # 別日のイベントも追加して、setdefaultの動作も確認
         add_event(events_data, "2025-07-26", "別日のイベント", "09:00", "10:00", "別日のイベント")
 
-        # 検証 1: events_data が正しく更新されたか
-        assert events_data == expected_events_after_add
+        # 検証 1: events_data が正しく更新されたか（追加された予定には ID が付く）
+        assert _without_ids(events_data) == expected_events_after_add
+        assert all(ev["id"] for ev in events_data["2025-07-26"])
 
-        # 検証 2: save_events がイベントが追加されるたびに呼び出されたか
-        # add_eventが2回呼ばれているので、save_eventsも2回呼ばれるはず
-        assert mock_save_events.call_count == 2
+        # 検証 2: _append_journal がイベントが追加されるたびに呼び出されたか
+        # add_eventが2回呼ばれているので、_append_journalも2回呼ばれるはず
+        assert mock_append_journal.call_count == 2
 
-        # 検証 3: save_events が期待されるデータで呼び出されたか (最後の呼び出しをチェック)
-        # 最後の save_events の呼び出しは expected_events_after_add と同じはず
-        mock_save_events.assert_called_with(expected_events_after_add)
+        # 検証 3: _append_journal が期待されるデータで呼び出されたか (最後の呼び出しをチェック)
+        # 最後の _append_journal の呼び出しは expected_events_after_add と同じはず
+        assert _without_ids(mock_append_journal.call_args[0][0]) == expected_events_after_add
 
 
 # UT-09: update_event() 既存イベントが正しく更新され、ファイルに保存される
 def test_update_event():
     """
     update_event() が既存のイベントを更新し、
-    save_events() を呼び出して保存することを確認する。
+    _append_journal() を呼び出してジャーナルに記録することを確認する。
     """
     # 初期イベントデータ
     initial_events = {
         "2025-07-25": [
             {
+                "id": "ev-1",
                 "title": "元のタイトル",
                 "start_time": "09:00",
                 "end_time": "10:00",
                 "memo": "元のメモ"
             },
             {
+                "id": "ev-2",
                 "title": "別のイベント",
                 "start_time": "14:00",
                 "end_time": "15:00",
@@ -241,12 +251,14 @@ def test_update_event():
     expected_events_after_update = {
         "2025-07-25": [
             {
+                "id": "ev-1",
                 "title": "更新されたタイトル", # ここが変更される
                 "start_time": "09:30",        # ここも変更される
                 "end_time": "10:30",          # ここも変更される
                 "memo": "更新されたメモ"      # ここも変更される
             },
             {
+                "id": "ev-2",
                 "title": "別のイベント",
                 "start_time": "14:00",
                 "end_time": "15:00",
@@ -255,73 +267,75 @@ def test_update_event():
         ]
     }
 
-    # save_events をモックして、実際にファイルに書き込まれないようにする
-    with patch('services.event_manager.save_events') as mock_save_events:
+    # _append_journal をモックして、実際にファイルに書き込まれないようにする
+    with patch('services.event_manager._append_journal') as mock_append_journal:
         # update_event を呼び出すための準備
         from services.event_manager import update_event # update_eventをインポート
 
         events_data = initial_events.copy() # オリジナルを保持するためコピー
 
-        # イベントを更新 (インデックス0のイベント)
-        update_event(events_data, "2025-07-25", 0, 
+        # イベントを更新 (ID で指定)
+        update_event(events_data, "ev-1", 
                      "更新されたタイトル", "09:30", "10:30", "更新されたメモ")
 
         # 検証 1: events_data が正しく更新されたか
         assert events_data == expected_events_after_update
 
-        # 検証 2: save_events が呼び出されたか
-        assert mock_save_events.called
-        assert mock_save_events.call_count == 1 # 1回呼び出されるはず
+        # 検証 2: _append_journal が呼び出されたか
+        assert mock_append_journal.called
+        assert mock_append_journal.call_count == 1 # 1回呼び出されるはず
 
-        # 検証 3: save_events が期待されるデータで呼び出されたか
-        mock_save_events.assert_called_with(expected_events_after_update)
+        # 検証 3: _append_journal が期待されるデータで呼び出されたか
+        assert mock_append_journal.call_args[0][0] == expected_events_after_update
 
-        # --- 存在しないインデックスを更新しようとした場合のテスト ---
+        # --- 存在しない ID を更新しようとした場合のテスト ---
         events_data_no_change = initial_events.copy()
-        initial_call_count = mock_save_events.call_count # ここまでの呼び出し回数を記録
+        initial_call_count = mock_append_journal.call_count # ここまでの呼び出し回数を記録
 
-        # 存在しないインデックスを更新しようとする
-        update_event(events_data_no_change, "2025-07-25", 99, 
+        # 存在しない ID を更新しようとする
+        update_event(events_data_no_change, "ev-99", 
                      "存在しない更新", "", "", "")
 
         # 検証 4: イベントデータが変更されていないこと
         assert events_data_no_change == initial_events
 
-        # 検証 5: save_events が追加で呼び出されていないこと
-        assert mock_save_events.call_count == initial_call_count
+        # 検証 5: _append_journal が追加で呼び出されていないこと
+        assert mock_append_journal.call_count == initial_call_count
 
-        # --- 存在しない日付のイベントを更新しようとした場合のテスト ---
-        events_data_no_change_date = initial_events.copy()
-        initial_call_count_date = mock_save_events.call_count
+        # --- 予定が 1 件もないデータを更新しようとした場合のテスト ---
+        events_data_no_change_date = {}
+        initial_call_count_date = mock_append_journal.call_count
 
-        # 存在しない日付を更新しようとする
-        update_event(events_data_no_change_date, "2025-08-01", 0, 
-                     "存在しない日付", "", "", "")
+        # 空のデータに対して更新しようとする
+        update_event(events_data_no_change_date, "ev-1", 
+                     "存在しない予定", "", "", "")
 
         # 検証 6: イベントデータが変更されていないこと
-        assert events_data_no_change_date == initial_events
+        assert events_data_no_change_date == {}
 
-        # 検証 7: save_events が追加で呼び出されていないこと
-        assert mock_save_events.call_count == initial_call_count_date
+        # 検証 7: _append_journal が追加で呼び出されていないこと
+        assert mock_append_journal.call_count == initial_call_count_date
         
 
 # UT-10: delete_event() イベントが正しく削除され、ファイルに保存される
 def test_delete_event():
     """
     delete_event() がイベントを正しく削除し、
-    save_events() を呼び出して保存することを確認する。
+    _append_journal() を呼び出してジャーナルに記録することを確認する。
     また、日付の全てのイベントが削除された場合に日付キーも削除されることを確認する。
     """
     # 初期イベントデータ
     initial_events = {
         "2025-07-25": [
             {
+                "id": "ev-a",
                 "title": "イベントA",
                 "start_time": "09:00",
                 "end_time": "10:00",
                 "memo": "メモA"
             },
             {
+                "id": "ev-b",
                 "title": "イベントB",
                 "start_time": "11:00",
                 "end_time": "12:00",
@@ -330,6 +344,7 @@ def test_delete_event():
         ],
         "2025-07-26": [
             {
+                "id": "ev-c",
                 "title": "イベントC",
                 "start_time": "14:00",
                 "end_time": "15:00",
@@ -343,6 +358,7 @@ def test_delete_event():
     expected_events_case1 = {
         "2025-07-25": [
             {
+                "id": "ev-b",
                 "title": "イベントB",
                 "start_time": "11:00",
                 "end_time": "12:00",
@@ -351,6 +367,7 @@ def test_delete_event():
         ],
         "2025-07-26": [
             {
+                "id": "ev-c",
                 "title": "イベントC",
                 "start_time": "14:00",
                 "end_time": "15:00",
@@ -358,20 +375,21 @@ def test_delete_event():
             }
         ]
     }
-    with patch('services.event_manager.save_events') as mock_save_events:
+    with patch('services.event_manager._append_journal') as mock_append_journal:
         from services.event_manager import delete_event
 
-        delete_event(events_data_case1, "2025-07-25", 0) # イベントAを削除
+        delete_event(events_data_case1, "ev-a") # イベントAを削除
 
         assert events_data_case1 == expected_events_case1
-        assert mock_save_events.called
-        assert mock_save_events.call_count == 1
-        mock_save_events.assert_called_with(expected_events_case1)
+        assert mock_append_journal.called
+        assert mock_append_journal.call_count == 1
+        assert mock_append_journal.call_args[0][0] == expected_events_case1
 
     # 検証 2: 日付の全てのイベントを削除した場合、日付キーも削除される
     events_data_case2 = {
         "2025-07-25": [
             {
+                "id": "ev-d",
                 "title": "イベントD",
                 "start_time": "09:00",
                 "end_time": "10:00",
@@ -380,34 +398,234 @@ def test_delete_event():
         ]
     }
     expected_events_case2 = {} # 空の辞書になるはず
-    with patch('services.event_manager.save_events') as mock_save_events:
+    with patch('services.event_manager._append_journal') as mock_append_journal:
         from services.event_manager import delete_event
 
-        delete_event(events_data_case2, "2025-07-25", 0) # イベントDを削除
+        delete_event(events_data_case2, "ev-d") # イベントDを削除
 
         assert events_data_case2 == expected_events_case2
-        assert mock_save_events.called
-        assert mock_save_events.call_count == 1
-        mock_save_events.assert_called_with(expected_events_case2)
+        assert mock_append_journal.called
+        assert mock_append_journal.call_count == 1
+        assert mock_append_journal.call_args[0][0] == expected_events_case2
 
-    # 検証 3: 存在しないインデックスを削除しようとした場合（変更なし、save_eventsも呼ばれない）
+    # 検証 3: 存在しない ID を削除しようとした場合（変更なし、_append_journalも呼ばれない）
     events_data_case3 = initial_events.copy()
-    initial_call_count_case3 = 0 # 初期のsave_events呼び出しを0とする（新しいpatchブロックなので）
-    with patch('services.event_manager.save_events') as mock_save_events:
+    initial_call_count_case3 = 0 # 初期の_append_journal呼び出しを0とする（新しいpatchブロックなので）
+    with patch('services.event_manager._append_journal') as mock_append_journal:
         from services.event_manager import delete_event
 
-        delete_event(events_data_case3, "2025-07-25", 99) # 存在しないインデックス
+        delete_event(events_data_case3, "ev-99") # 存在しない ID
 
         assert events_data_case3 == initial_events # 変更されていないこと
-        assert mock_save_events.call_count == initial_call_count_case3 # save_eventsが呼ばれていないこと
+        assert mock_append_journal.call_count == initial_call_count_case3 # _append_journalが呼ばれていないこと
 
-    # 検証 4: 存在しない日付のイベントを削除しようとした場合（変更なし、save_eventsも呼ばれない）
-    events_data_case4 = initial_events.copy()
-    initial_call_count_case4 = 0 # 初期のsave_events呼び出しを0とする
-    with patch('services.event_manager.save_events') as mock_save_events:
+    # 検証 4: 予定が 1 件もないデータから削除しようとした場合（変更なし、_append_journalも呼ばれない）
+    events_data_case4 = {}
+    initial_call_count_case4 = 0 # 初期の_append_journal呼び出しを0とする
+    with patch('services.event_manager._append_journal') as mock_append_journal:
         from services.event_manager import delete_event
 
-        delete_event(events_data_case4, "2025-08-01", 0) # 存在しない日付
+        delete_event(events_data_case4, "ev-a") # 空のデータ
+
+        assert events_data_case4 == {} # 変更されていないこと
+        assert mock_append_journal.call_count == initial_call_count_case4 # _append_journalが呼ばれていないこと
+
+# UT-19: ジャーナルの追記と再生
+def test_journal_replay(tmp_path, monkeypatch):
+    """
+    add/update/delete がジャーナルに追記され、load_events() で
+    スナップショット＋ジャーナルとして再現されることを確認する。
+    """
+    from services import event_manager
+
+    events_file = tmp_path / "events.json"
+    events_file.write_text(json.dumps({
+        "2025-07-25": [{"title": "既存", "start_time": "", "end_time": "", "memo": ""}]
+    }), encoding="utf-8")
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(events_file))
+
+    events = event_manager.load_events()
+    legacy_id = events["2025-07-25"][0]["id"]
+    meeting_id = event_manager.add_event(events, "2025-07-25", "会議", "10:00", "11:00", "")
+    event_manager.update_event(events, meeting_id, "会議", "10:30", "11:30", "変更")
+    trip_id = event_manager.add_event(events, "2025-07-26", "出張", "", "", "")
+    event_manager.move_event(events, trip_id, "2025-07-27")
+    event_manager.delete_event(events, legacy_id)
+    assert event_manager.flush_pending_saves(timeout=5)
+
+    # スナップショット自体は書き換えられていない
+    assert "2025-07-27" not in json.loads(events_file.read_text(encoding="utf-8"))
+    assert (tmp_path / "events.journal").exists()
+
+    event_manager.invalidate_events_cache()
+    reloaded = event_manager.load_events()
+    assert reloaded == events
+    assert reloaded.by_id.keys() == {meeting_id, trip_id}
+    assert event_manager.find_event(reloaded, trip_id)[0] == "2025-07-27"
+
+
+# UT-20: ジャーナルのコンパクション
+def test_journal_compaction(tmp_path, monkeypatch):
+    """
+    ジャーナルがしきい値を超えると書き込みスレッドがスナップショットを書き直し、
+    ジャーナルが空になることを確認する。
+    """
+    from services import event_manager
+
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(tmp_path / "events.json"))
+    monkeypatch.setattr(event_manager, "JOURNAL_COMPACT_THRESHOLD", 1)
+
+    events = {}
+    for i in range(5):
+        event_manager.add_event(events, "2025-07-25", f"予定{i}")
+    assert event_manager.flush_pending_saves(timeout=5)
+
+    assert not (tmp_path / "events.journal").exists()
+    assert json.loads((tmp_path / "events.json").read_text(encoding="utf-8")) == events
+    assert event_manager.load_events() == events
+
+
+# UT-24: 連続した変更の書き込みがまとめられ、途中のファイルが残らないこと
+def test_debounced_atomic_save(tmp_path, monkeypatch):
+    """
+    短時間に続いた変更が 1 回の書き込みにまとめられ、
+    save_events() が一時ファイルを残さずに置き換えることを確認する。
+    """
+    from services import event_manager
+
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(tmp_path / "events.json"))
+    monkeypatch.setattr(event_manager, "SAVE_DEBOUNCE_SEC", 0.2)
+
+    writes = []
+    original_write = event_manager._EventWriter._write
+    monkeypatch.setattr(event_manager._EventWriter, "_write",
+                        lambda self, batch: (writes.append(len(batch)), original_write(self, batch)))
 
-        assert events_data_case4 == initial_events # 変更されていないこと
-        assert mock_save_events.call_count == initial_call_count_case4 # save_eventsが呼ばれていないこと
\ No newline at end of file
+    events = {}
+    for i in range(10):
+        event_manager.add_event(events, "2025-07-25", f"予定{i}")
+    assert event_manager.flush_pending_saves(timeout=5)
+    assert writes == [10]
+
+    event_manager.save_events(events)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["events.bin", "events.json", "events.lock"]
+    assert event_manager.load_events() == events
+
+
+# UT-25: 変更のないファイルは再パースしないこと
+def test_load_events_reuses_parsed_data(tmp_path, monkeypatch):
+    """
+    ファイルが変わっていなければ load_events() が同じ dict を返し、
+    自分の書き込みでは再パースせず、外部の変更だけを読み直すことを確認する。
+    """
+    from services import event_manager
+
+    events_file = tmp_path / "events.json"
+    events_file.write_text(json.dumps({"2025-07-25": []}), encoding="utf-8")
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(events_file))
+
+    events = event_manager.load_events()
+    assert event_manager.load_events() is events
+
+    # 内容が同じなら更新時刻が変わっても読み込み済みのデータを返す
+    with patch('services.event_manager._parse_snapshot') as mock_parse:
+        os.utime(events_file, ns=(0, 0))
+        assert event_manager.load_events() is events
+        mock_parse.assert_not_called()
+
+    # 自分の書き込みは外部の変更とみなさない
+    event_manager.add_event(events, "2025-07-26", "会議")
+    assert event_manager.flush_pending_saves(timeout=5)
+    assert event_manager.load_events() is events
+
+    # 外部で書き換えられたら読み直す
+    events_file.write_text(json.dumps({"2025-08-01": [{"title": "出張"}]}), encoding="utf-8")
+    reloaded = event_manager.load_events()
+    assert reloaded is not events
+    assert "2025-08-01" in reloaded
+
+
+# UT-43: ほかのプロセスの変更の取り込みと楽観的なバージョンチェック
+def test_sync_external_changes(tmp_path, monkeypatch):
+    """
+    別のプロセスが同じ events.json に書き込んだ変更が、変わった日付とともに取り込まれること、
+    取り込む前のスナップショットの書き込みは相手の変更を上書きしないよう見送られることを確認する。
+    """
+    import subprocess
+    import sys
+    from services import event_manager
+
+    events_file = tmp_path / "events.json"
+    events_file.write_text(json.dumps({
+        "2025-07-01": [{"id": "a", "title": "会議", "start_time": "", "end_time": "", "memo": ""}],
+        "2025-07-02": [{"id": "b", "title": "来客", "start_time": "", "end_time": "", "memo": ""}],
+    }), encoding="utf-8")
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(events_file))
+    events = event_manager.load_events()
+    assert event_manager.sync_external_changes(events) == set()
+
+    # 別プロセス：a を 7/3 へ移動、b を削除、7/4 に追加
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1])\n"
+        "from services import event_manager\n"
+        "event_manager.EVENTS_FILE = sys.argv[2]\n"
+        "events = event_manager.load_events()\n"
+        "event_manager.move_event(events, 'a', '2025-07-03')\n"
+        "event_manager.delete_event(events, 'b')\n"
+        "event_manager.add_event(events, '2025-07-04', '出張')\n"
+        "event_manager.flush_pending_saves()\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script, root, str(events_file)], check=True, timeout=30)
+
+    # 取り込む前はスナップショットを書かない（相手の変更を上書きしない）
+    assert event_manager.save_events(events) is False
+
+    changed = event_manager.sync_external_changes(events)
+    assert changed == {"2025-07-01", "2025-07-02", "2025-07-03", "2025-07-04"}
+    assert sorted(events) == ["2025-07-03", "2025-07-04"]
+    assert events["2025-07-04"][0]["title"] == "出張"
+    assert event_manager.find_event(events, "a")[0] == "2025-07-03"
+
+    # 取り込んだあとは書き込める
+    assert event_manager.save_events(events) is True
+    assert event_manager.sync_external_changes(events) == set()
+
+
+# UT-72: スナップショットがまだないときも、ほかのプロセスのジャーナルへの追記を検出すること
+def test_sync_external_changes_without_snapshot(tmp_path, monkeypatch):
+    """
+    events.json がまだなく、2 つのプロセスがどちらもジャーナルに追記しているとき、
+    相手の追記が検出されてスナップショットの書き込みで失われないことを確認する。
+    """
+    import subprocess
+    import sys
+    from services import event_manager
+
+    events_file = tmp_path / "events.json"
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(events_file))
+    events = event_manager.load_events()
+    event_manager.add_event(events, "2025-07-01", "会議")
+    assert event_manager.flush_pending_saves(timeout=5)
+    assert not events_file.exists()
+
+    # 別プロセス：同じくスナップショットのないままジャーナルに追記する
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1])\n"
+        "from services import event_manager\n"
+        "event_manager.EVENTS_FILE = sys.argv[2]\n"
+        "events = event_manager.load_events()\n"
+        "event_manager.add_event(events, '2025-07-02', '来客')\n"
+        "event_manager.flush_pending_saves()\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script, root, str(events_file)], check=True, timeout=30)
+    assert not events_file.exists()
+
+    # 相手の追記を取り込む前はスナップショットを書かない
+    assert event_manager.save_events(events) is False
+    assert event_manager.sync_external_changes(events) == {"2025-07-02"}
+    assert event_manager.save_events(events) is True
+
+    event_manager.invalidate_events_cache()
+    assert sorted(event_manager.load_events()) == ["2025-07-01", "2025-07-02"]
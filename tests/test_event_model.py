@@ -0,0 +1,64 @@
+# tests/test_event_model.py
+
+import pytest
+
+from services.event_model import Event, parse_time, format_time, iter_events
+
+
+# UT-26: Event と events.json 形式の相互変換
+def test_event_round_trip():
+    """
+    Event.from_dict() → to_dict() で元の dict が損なわれずに戻ることを確認する。
+    """
+    samples = [
+        {"id": "a", "title": "会議/打合せ", "start_time": "10:00", "end_time": "10:30", "memo": "ZOOM"},
+        {"id": "b", "title": "休暇", "start_time": "", "end_time": "", "memo": ""},
+        # "HH:MM" 以外の自由入力もそのまま戻る
+        {"id": "c", "title": "外出", "start_time": "9:00", "end_time": "昼", "memo": ""},
+    ]
+    for data in samples:
+        event = Event.from_dict("2025-07-15", data)
+        assert event.to_dict() == data
+        assert event.date_str == "2025-07-15"
+
+    event = Event.from_dict("2025-07-15", samples[0])
+    assert (event.start, event.end, event.duration) == (600, 630, 30)
+
+
+# UT-27: __slots__ とタイトルの intern
+def test_event_is_compact():
+    """
+    Event がインスタンス辞書を持たず、同じタイトルの文字列オブジェクトを共有することを確認する。
+    """
+    events = {
+        "2025-07-03": [{"id": "1", "title": "出張", "start_time": "08:00", "end_time": "10:00", "memo": ""}],
+        "2025-07-15": [{"id": "2", "title": "".join(["出", "張"]), "start_time": "14:00", "end_time": "17:00", "memo": ""}],
+    }
+    first, second = iter_events(events)
+    assert not hasattr(first, "__dict__")
+    assert first.title is second.title
+
+
+# UT-28: 時刻文字列と分数の変換
+def test_parse_and_format_time():
+    """
+    parse_time() / format_time() が "HH:MM" と分数を正しく変換することを確認する。
+    """
+    assert parse_time("00:00") == 0
+    assert parse_time("23:59") == 23 * 60 + 59
+    assert parse_time("") is None
+    assert parse_time("24:00") is None
+    assert format_time(None) == ""
+    assert format_time(9 * 60 + 5) == "09:05"
+
+
+# UT-69: 比較はできるがハッシュ化はできない
+def test_event_is_unhashable():
+    """
+    内容で比較できる Event が、可変なのでハッシュ化できない（set や dict のキーにならない）ことを確認する。
+    """
+    data = {"id": "1", "title": "来客", "start_time": "10:00", "end_time": "11:00", "memo": ""}
+    first = Event.from_dict("2025-07-03", data)
+    assert first == Event.from_dict("2025-07-03", data)
+    with pytest.raises(TypeError):
+        hash(first)
@@ -0,0 +1,87 @@
+# tests/test_event_store.py
+
+import pytest
+
+from services.event_store import SqliteEventStore, migrate_json_to_sqlite
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SqliteEventStore(str(tmp_path / "events.db"))
+    yield store
+    store.close()
+
+
+# UT-21: SqliteEventStore の追加・更新・削除と範囲読み込み
+def test_sqlite_store_crud_and_range(sqlite_store):
+    """
+    SqliteEventStore が events 辞書と DB の両方を更新し、
+    load_events(start, end) がその範囲の行だけを返すことを確認する。
+    """
+    events = {}
+    meeting_id = sqlite_store.add_event(events, "2025-07-25", "会議", "10:00", "11:00", "ZOOM")
+    lunch_id = sqlite_store.add_event(events, "2025-07-25", "ランチ", "12:00", "13:00", "")
+    trip_id = sqlite_store.add_event(events, "2025-08-01", "出張", "", "", "東北出張")
+
+    sqlite_store.update_event(events, lunch_id, "ランチ会", "12:00", "13:30", "同僚と")
+    sqlite_store.delete_event(events, meeting_id)
+    sqlite_store.move_event(events, trip_id, "2025-08-02")
+
+    assert sqlite_store.load_events() == events
+    july = sqlite_store.load_events("2025-07-01", "2025-07-31")
+    assert july == {
+        "2025-07-25": [
+            {"id": lunch_id, "title": "ランチ会", "start_time": "12:00", "end_time": "13:30", "memo": "同僚と"}
+        ]
+    }
+    assert july.by_id.keys() == {lunch_id}
+
+
+# UT-22: events.json 形式から SQLite への移行
+def test_migrate_json_to_sqlite(sqlite_store):
+    """
+    migrate_json_to_sqlite() が既存データを順序どおりに移行し、
+    2 回目以降は何もしないことを確認する。
+    """
+    events = {
+        "2025-07-03": [{"title": "出張", "start_time": "08:00", "end_time": "10:00", "memo": "東北出張"}],
+        "2025-07-15": [
+            {"title": "会議/打合せ", "start_time": "10:00", "end_time": "10:30", "memo": "ZOOM"},
+            {"title": "出張", "start_time": "14:00", "end_time": "17:00", "memo": "東北出張"},
+        ],
+    }
+
+    assert migrate_json_to_sqlite(sqlite_store, events) == 3
+    # ID のなかった予定には移行時に ID が付き、そのまま保存される
+    assert sqlite_store.load_events() == events
+    assert all(ev["id"] for day in events.values() for ev in day)
+    assert migrate_json_to_sqlite(sqlite_store, events) == 0
+
+
+# UT-23: 月別シャードの遅延読み込みと部分書き込み
+def test_sharded_store_writes_only_changed_month(tmp_path):
+    """
+    ShardedJsonEventStore が変更のあった月のファイルだけを書き換え、
+    別インスタンスから範囲指定で読み込めることを確認する。
+    """
+    from services.event_store import ShardedJsonEventStore
+
+    store = ShardedJsonEventStore(str(tmp_path))
+    events = {}
+    meeting_id = store.add_event(events, "2025-07-25", "会議", "10:00", "11:00", "")
+    trip_id = store.add_event(events, "2025-08-01", "出張", "", "", "")
+
+    july = tmp_path / "2025-07.json"
+    july_mtime = july.stat().st_mtime_ns
+    store.update_event(events, trip_id, "出張", "08:00", "", "東北出張")
+    assert july.stat().st_mtime_ns == july_mtime
+
+    reopened = ShardedJsonEventStore(str(tmp_path))
+    assert reopened.load_events("2025-08-01", "2025-08-31") == {
+        "2025-08-01": [{"id": trip_id, "title": "出張", "start_time": "08:00", "end_time": "", "memo": "東北出張"}]
+    }
+    assert reopened._shards.keys() == {"2025-08"}
+
+    reopened.delete_event(events, meeting_id)
+    assert not july.exists()
+    assert ShardedJsonEventStore(str(tmp_path)).months == {"2025-08"}
@@ -0,0 +1,144 @@
+# tests/test_exporter.py
+
+import csv
+import json
+
+import pytest
+
+import export
+from services import event_manager, exporter, ics_import
+from services.event_manager import EventCollection
+from services.event_store import JsonEventStore, SqliteEventStore
+from services.recurrence import RecurrenceSet, make_repeat_rule
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteEventStore(str(tmp_path / "events.db"))
+    events = EventCollection()
+    store.add_events(events, [
+        ("2025-07-01", {"id": "a", "title": "会議, 定例", "start_time": "10:00", "end_time": "11:00",
+                        "memo": "議題:予算\n" + "長いメモ" * 30}),
+        ("2025-07-20", {"id": "b", "title": "休暇", "start_time": "", "end_time": "", "memo": ""}),
+        ("2025-09-01", {"id": "c", "title": "始業", "start_time": "08:30", "end_time": "", "memo": ""}),
+    ])
+    yield store
+    store.close()
+
+
+# UT-40: ICS への書き出しと取り込みの往復
+def test_export_ics_round_trip(store, tmp_path, monkeypatch):
+    """
+    書き出した ICS の行が 75 オクテット以内に折り返され、
+    取り込み直すと同じ予定・繰り返しルールに戻ることを確認する。
+    """
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(tmp_path / "events.json"))
+    monkeypatch.setattr("services.recurrence.RECURRENCES_FILE", str(tmp_path / "recurrences.json"))
+    recs = RecurrenceSet()
+    rule = make_repeat_rule("monthly_nth", "2025-07-08", "委員会", "15:00", "16:00")
+    rule["exdates"] = ["2025-08-12"]
+    recs.rules[rule["id"]] = rule
+
+    path = str(tmp_path / "out.ics")
+    exporter.export_to_file(store, path, recurrences=recs)
+    raw = open(path, "rb").read()
+    assert all(len(line) <= 75 for line in raw.split(b"\r\n"))
+
+    events, imported = EventCollection(), RecurrenceSet()
+    assert ics_import.import_ics(events, path, recurrences=imported) == (3, 1)
+    meeting = events["2025-07-01"][0]
+    assert (meeting["title"], meeting["start_time"], meeting["end_time"]) == ("会議, 定例", "10:00", "11:00")
+    assert meeting["memo"].startswith("議題:予算\n長いメモ")
+    assert events["2025-07-20"][0]["start_time"] == ""
+    assert sorted(imported.occurrences_for_month(2025, 8)) == []
+    assert sorted(imported.occurrences_for_month(2025, 9)) == ["2025-09-09"]
+
+
+# UT-70: 書き出した ICS を同じ保存先に取り込み直す
+def test_export_ics_reimport_is_idempotent(tmp_path, monkeypatch):
+    """
+    このアプリが書き出した ICS を同じ保存先に取り込み直しても、UID から元の予定 ID・ルール ID に
+    戻るので、予定も繰り返しルールも増えないことを確認する。
+    """
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(tmp_path / "events.json"))
+    monkeypatch.setattr("services.recurrence.RECURRENCES_FILE", str(tmp_path / "recurrences.json"))
+    store = JsonEventStore()
+    events = store.load_events()
+    store.add_event(events, "2025-07-01", "会議/打合せ", "10:00", "11:00", "週次")
+    store.add_event(events, "2025-07-20", "休暇")
+    recs = RecurrenceSet()
+    rule = make_repeat_rule("weekly", "2025-07-07", "朝会", "09:00", "09:15")
+    recs.rules[rule["id"]] = rule
+    before = [(date_str, dict(event)) for date_str, event in store.iter_events()]
+    assert [date_str for date_str, _ in before] == ["2025-07-01", "2025-07-20"]
+
+    path = str(tmp_path / "out.ics")
+    exporter.export_to_file(store, path, recurrences=recs)
+    assert ics_import.import_ics(events, path, store=store, recurrences=recs) == (0, 0)
+    assert list(recs.rules) == [rule["id"]]
+    assert event_manager.flush_pending_saves(timeout=5)
+    event_manager.invalidate_events_cache()
+    assert [(date_str, dict(event)) for date_str, event in store.iter_events()] == before
+
+
+# UT-41: 範囲を指定した CSV の逐次書き出し
+def test_export_csv_streaming(store, tmp_path):
+    """
+    CSV が 1 行ずつ生成され、指定範囲の予定と繰り返し予定の各回が日付順に並ぶことを確認する。
+    """
+    recs = RecurrenceSet()
+    rule = make_repeat_rule("weekly", "2025-07-14", "朝会", "09:00", "09:15")
+    recs.rules[rule["id"]] = rule
+
+    lines = exporter.iter_export(store, "csv", "2025-07-01", "2025-07-31", recs)
+    assert not isinstance(lines, (list, str))
+    assert next(lines) == "date,start_time,end_time,title,memo,id\r\n"
+    rows = list(csv.reader("".join(lines).splitlines()))
+    assert [(r[0], r[3]) for r in rows] == [
+        ("2025-07-01", "会議, 定例"), ("2025-07-14", "朝会"), ("2025-07-20", "休暇"),
+        ("2025-07-21", "朝会"), ("2025-07-28", "朝会"),
+    ]
+
+    with pytest.raises(ValueError):
+        exporter.iter_export(store, "xml")
+
+
+# UT-42: コマンドラインからの書き出し
+def test_export_cli(tmp_path, monkeypatch):
+    """
+    export.py が events.json の予定を拡張子に合わせた形式で書き出すことを確認する。
+    """
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(tmp_path / "events.json"))
+    monkeypatch.setattr("services.recurrence.RECURRENCES_FILE", str(tmp_path / "recurrences.json"))
+    events = event_manager.load_events()
+    event_manager.add_events(events, [("2025-07-01", {"title": "出張", "start_time": "", "end_time": "", "memo": ""})])
+
+    out = tmp_path / "out.csv"
+    export.main([str(out), "--from", "2025-01-01", "--to", "2025-12-31", "--store", "json"])
+    text = out.read_text(encoding="utf-8-sig")
+    assert text.splitlines()[1].startswith("2025-07-01,,,出張,")
+    assert list(JsonEventStore().iter_events("2025-08-01")) == []
+
+
+# UT-76: 範囲を指定しないコマンドラインの書き出しも全体を読み込まないこと
+def test_export_cli_streams_without_load_events(tmp_path, monkeypatch):
+    """
+    期間を指定せずに export.py で書き出しても、events.json 全体を load_events() で
+    読み込まず、日付順に 1 日ずつ読んで書き出すことを確認する。
+    """
+    events_file = tmp_path / "events.json"
+    events_file.write_text(json.dumps({
+        "2025-07-02": [{"id": "b", "title": "来客", "start_time": "10:00", "end_time": "11:00", "memo": ""}],
+        "2025-07-01": [{"id": "a", "title": "出張", "start_time": "", "end_time": "", "memo": ""}],
+    }, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(events_file))
+    monkeypatch.setattr("services.recurrence.RECURRENCES_FILE", str(tmp_path / "recurrences.json"))
+
+    def fail():
+        raise AssertionError("load_events() を呼び出しました")
+
+    monkeypatch.setattr(event_manager, "load_events", fail)
+    out = tmp_path / "out.ics"
+    export.main([str(out), "--store", "json"])
+    uids = [line for line in out.read_text(encoding="utf-8").splitlines() if line.startswith("UID:")]
+    assert uids == ["UID:a@calendar_app", "UID:b@calendar_app"]
@@ -0,0 +1,42 @@
+# tests/test_file_lock.py
+
+import os
+import subprocess
+import sys
+import time
+
+from services.file_lock import process_lock
+
+
+# UT-44: プロセス間の排他
+def test_process_lock_excludes_other_process(tmp_path):
+    """
+    別のプロセスがロックを持っている間は、ロックの取得が待たされることを確認する。
+    """
+    lock_path = tmp_path / "events.lock"
+    ready = tmp_path / "ready"
+    script = (
+        "import sys, time; sys.path.insert(0, sys.argv[1])\n"
+        "from services.file_lock import process_lock\n"
+        "with process_lock(sys.argv[2]):\n"
+        "    open(sys.argv[3], 'w').close()\n"
+        "    time.sleep(0.5)\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    child = subprocess.Popen([sys.executable, "-c", script, root, str(lock_path), str(ready)])
+    try:
+        deadline = time.monotonic() + 10
+        while not ready.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert ready.exists()
+
+        start = time.monotonic()
+        with process_lock(str(lock_path)):
+            waited = time.monotonic() - start
+        assert waited >= 0.2
+    finally:
+        child.wait(timeout=10)
+
+    # ディレクトリがなければロックせずに進む
+    with process_lock(str(tmp_path / "missing" / "events.lock")):
+        pass
@@ -0,0 +1,34 @@
+# tests/test_file_watcher.py
+
+import sys
+import threading
+
+import pytest
+
+from services.file_watcher import FileWatcher
+
+
+# UT-45: ファイル変更の検出（inotify とポーリング）
+@pytest.mark.parametrize("use_inotify", [
+    pytest.param(True, marks=pytest.mark.skipif(not sys.platform.startswith("linux"),
+                                                 reason="inotify は Linux のみ")),
+    False,
+])
+def test_file_watcher_detects_change(tmp_path, use_inotify):
+    """
+    監視対象のファイルが書き換えられると callback が呼ばれ、
+    関係のないファイルの変更では呼ばれないことを確認する。
+    """
+    target = tmp_path / "events.json"
+    target.write_text("{}", encoding="utf-8")
+    called = threading.Event()
+    watcher = FileWatcher([str(target)], called.set, interval=0.05, use_inotify=use_inotify).start()
+    try:
+        assert watcher.mode == ("inotify" if use_inotify else "polling")
+        (tmp_path / "other.txt").write_text("x", encoding="utf-8")
+        assert not called.wait(0.6)
+
+        target.write_text('{"2025-07-01": []}', encoding="utf-8")
+        assert called.wait(5)
+    finally:
+        watcher.stop()
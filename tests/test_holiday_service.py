@@ -50,4 +50,91 @@ def test_get_holidays_valid_data():
          assert holidays == expected_holidays_2025
          mock_fetch_api.assert_not_called()
 
-         mock_file_handle.assert_called_once_with(mock_holidays_file_path, encoding="utf-8")
\ No newline at end of file
+         mock_file_handle.assert_called_once_with(mock_holidays_file_path, encoding="utf-8")
+
+# UT-58: 祝日キャッシュファイルはプロセス内で一度だけ読み込まれること
+def test_holiday_cache_file_is_read_once(tmp_path, monkeypatch):
+    """
+    何度・何年分参照しても holidays.json は最初の 1 回しか開かず、
+    キャッシュにない年を API から取得したときだけ書き戻すことを確認する。
+    """
+    from services import holiday_service
+
+    cache_file = tmp_path / "holidays.json"
+    cache_file.write_text(json.dumps({"2025": {"2025-01-01": "元日"}}), encoding="utf-8")
+    monkeypatch.setattr(holiday_service, "CACHE_FILE", str(cache_file))
+
+    with patch("services.holiday_service.load_holiday_cache",
+               wraps=holiday_service.load_holiday_cache) as mock_load, \
+         patch("services.holiday_service.save_holiday_cache",
+               wraps=holiday_service.save_holiday_cache) as mock_save, \
+         patch("services.holiday_service.fetch_holidays_from_api",
+               return_value={"2026-01-01": "元日"}) as mock_fetch:
+        for _ in range(12):
+            assert holiday_service.get_holidays_for_year(2025) == {"2025-01-01": "元日"}
+        mock_save.assert_not_called()
+
+        assert holiday_service.get_holidays_for_year(2026) == {"2026-01-01": "元日"}
+        assert holiday_service.get_holidays_for_year(2026) == {"2026-01-01": "元日"}
+        mock_fetch.assert_called_once_with(2026)
+        mock_save.assert_called_once()
+        assert mock_load.call_count == 1
+
+    assert json.loads(cache_file.read_text(encoding="utf-8")) == {
+        "2025": {"2025-01-01": "元日"}, "2026": {"2026-01-01": "元日"}
+    }
+
+
+# UT-62: 祝日 API に届かないとき・"local" のときは計算した祝日を使うこと
+def test_holidays_fall_back_to_local_rules(tmp_path, monkeypatch):
+    """
+    API から取得できない年は計算した祝日を返してファイルには保存せず、同じ年は API を再試行しないこと、
+    HOLIDAY_SOURCE が "local" ならキャッシュファイルも API も使わないことを確認する。
+    """
+    from services import holiday_service
+    from services.jp_holidays import holidays_for_year
+
+    monkeypatch.setattr(holiday_service, "CACHE_FILE", str(tmp_path / "holidays.json"))
+    with patch("services.holiday_service.fetch_holidays_from_api", return_value={}) as mock_fetch:
+        assert holiday_service.get_holidays_for_year(2030) == holidays_for_year(2030)
+        assert holiday_service.get_holidays_for_year(2030) == holidays_for_year(2030)
+        mock_fetch.assert_called_once_with(2030)
+    assert not (tmp_path / "holidays.json").exists()
+
+    monkeypatch.setattr(holiday_service, "HOLIDAY_SOURCE", "local")
+    with patch("services.holiday_service.load_holiday_cache") as mock_load, \
+         patch("services.holiday_service.fetch_holidays_from_api") as mock_fetch:
+        assert holiday_service.get_holidays_for_year(2031)["2031-01-01"] == "元日"
+        mock_load.assert_not_called()
+        mock_fetch.assert_not_called()
+
+
+# UT-63: 祝日の先読みはワーカースレッドで、まだない年だけを取得すること
+def test_prefetch_holidays_on_worker_thread(tmp_path, monkeypatch):
+    """
+    prefetch_holidays() がキャッシュにない年だけをワーカースレッドで取得して callback に渡し、
+    取得後は peek_holidays() で API を使わずに参照できることを確認する。
+    """
+    import threading
+    from services import holiday_service
+
+    cache_file = tmp_path / "holidays.json"
+    cache_file.write_text(json.dumps({"2025": {"2025-01-01": "元日"}}), encoding="utf-8")
+    monkeypatch.setattr(holiday_service, "CACHE_FILE", str(cache_file))
+
+    delivered = []
+    with patch("services.holiday_service.fetch_holidays_from_api",
+               side_effect=lambda year: {f"{year}-01-01": "元日"}) as mock_fetch:
+        assert holiday_service.peek_holidays(2026) is None
+        thread = holiday_service.prefetch_holidays(
+            [2025, 2026, 2024], lambda year, holidays: delivered.append((year, threading.current_thread()))
+        )
+        thread.join(timeout=5)
+        assert [call.args[0] for call in mock_fetch.call_args_list] == [2026, 2024]
+        assert [year for year, _ in delivered] == [2026, 2024]
+        assert all(t is not threading.main_thread() for _, t in delivered)
+        assert holiday_service.peek_holidays(2026) == {"2026-01-01": "元日"}
+
+        # すべて取得済みなら何もしない
+        assert holiday_service.prefetch_holidays([2024, 2025, 2026]) is None
+        assert mock_fetch.call_count == 2
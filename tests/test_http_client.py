@@ -0,0 +1,105 @@
+# tests/test_http_client.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from services.http_client import HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """テスト用の HTTP サーバー。server.plan の応答を順に返し、受けたリクエストを記録する"""
+    protocol_version = "HTTP/1.1"  # keep-alive で接続を使い回せるようにする
+
+    def do_GET(self):
+        self.server.requests.append((self.client_address, dict(self.headers)))
+        status, headers, body, delay = self.server.plan.pop(0) if self.server.plan else self.server.default
+        time.sleep(delay)
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    httpd.plan = []
+    body = json.dumps({"2025-01-01": "元日"}, ensure_ascii=False)
+    httpd.default = (200, {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT",
+                           "Content-Type": "application/json"}, body, 0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+# UT-65: ETag / Last-Modified による再検証と、接続の使い回し
+def test_get_json_revalidates_with_disk_cache(server, tmp_path):
+    """
+    2 回目は If-None-Match / If-Modified-Since を付けて問い合わせ、304 なら保存済みの本文を返すこと、
+    別のクライアント（次回の起動）でもディスクの保存内容を使えること、同じ接続を使い回すことを確認する。
+    """
+    url = f"http://127.0.0.1:{server.server_port}/api/2025.json"
+    client = HttpClient(cache_dir=str(tmp_path))
+    assert client.get_json(url) == {"2025-01-01": "元日"}
+    assert "If-None-Match" not in server.requests[0][1]
+
+    server.plan = [(304, {"ETag": '"v1"'}, "", 0)]
+    assert client.get_json(url) == {"2025-01-01": "元日"}
+    headers = server.requests[1][1]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+    # keep-alive で同じ接続（同じ送信元ポート）を使っている
+    assert server.requests[0][0] == server.requests[1][0]
+    client.close()
+
+    restarted = HttpClient(cache_dir=str(tmp_path))
+    server.plan = [(304, {}, "", 0)]
+    assert restarted.get_json(url) == {"2025-01-01": "元日"}
+    assert server.requests[2][1]["If-None-Match"] == '"v1"'
+
+    # 内容が変わっていれば新しい本文と ETag を保存する
+    server.plan = [(200, {"ETag": '"v2"'}, '{"2025-01-02": "休日"}', 0)]
+    assert restarted.get_json(url) == {"2025-01-02": "休日"}
+    assert restarted.load_cached(url)["etag"] == '"v2"'
+    restarted.close()
+
+
+# UT-66: 一時的なエラーの再試行と、応答しないサーバーのタイムアウト
+def test_retries_and_timeouts(server):
+    """
+    503 は待ち時間を置いて再試行して成功すること、再試行しても失敗する・応答が遅すぎるときは
+    固まらずに RequestException になることを確認する。
+    """
+    url = f"http://127.0.0.1:{server.server_port}/api/2025.json"
+    client = HttpClient(cache_dir=None, retries=2, backoff_factor=0)
+    server.plan = [(503, {}, "busy", 0), (503, {}, "busy", 0)]
+    assert client.get_json(url) == {"2025-01-01": "元日"}
+    assert len(server.requests) == 3
+
+    server.plan = [(500, {}, "error", 0)] * 3
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get_json(url)
+
+    slow = HttpClient(cache_dir=None, timeout=(1, 0.2), retries=0)
+    server.plan = [(200, {}, "{}", 1.0)]
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.RequestException):
+        slow.get_json(url)
+    assert time.monotonic() - started < 0.9
+    client.close()
+    slow.close()
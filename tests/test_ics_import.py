@@ -0,0 +1,131 @@
+# tests/test_ics_import.py
+
+import pytest
+from unittest.mock import patch
+
+from services import event_manager, ics_import
+from services.event_manager import EventCollection
+from services.recurrence import RecurrenceSet
+
+SAMPLE_ICS = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:meeting-1@example.com\r\n"
+    "DTSTART:20250715T100000\r\n"
+    "DTEND:20250715T113000\r\n"
+    "SUMMARY:会議\\, 定例\r\n"
+    "DESCRIPTION:議題:予算\\n場所:本社の大会議室で行います。長い説明文は折り返さ\r\n"
+    " れています\r\n"
+    "BEGIN:VALARM\r\n"
+    "TRIGGER:-PT15M\r\n"
+    "DESCRIPTION:アラーム\r\n"
+    "END:VALARM\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:holiday-1@example.com\r\n"
+    "DTSTART;VALUE=DATE:20250801\r\n"
+    "DTEND;VALUE=DATE:20250802\r\n"
+    "SUMMARY:夏季休暇\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:visit-1@example.com\r\n"
+    "DTSTART:20250716T140000\r\n"
+    "DURATION:PT45M\r\n"
+    "SUMMARY:来客\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:weekly-1@example.com\r\n"
+    "DTSTART:20250707T090000\r\n"
+    "DTEND:20250707T091500\r\n"
+    "RRULE:FREQ=WEEKLY;BYDAY=MO;COUNT=3\r\n"
+    "EXDATE:20250714T090000\r\n"
+    "SUMMARY:朝会\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+
+@pytest.fixture
+def ics_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(tmp_path / "events.json"))
+    path = tmp_path / "sample.ics"
+    path.write_bytes(SAMPLE_ICS.encode("utf-8"))
+    return str(path)
+
+
+# UT-38: VEVENT の変換と一括保存
+def test_import_ics_single_write(ics_file):
+    """
+    VEVENT が既存の予定の形式に変換され、全件の取り込みが 1 回の書き込みで保存されること、
+    同じファイルを再度取り込んでも予定が重複しないことを確認する。
+    """
+    events = EventCollection()
+    with patch('services.event_manager._write_snapshot', wraps=event_manager._write_snapshot) as mock_write:
+        added, rules = ics_import.import_ics(events, ics_file)
+    assert (added, rules) == (4, 0)
+    assert mock_write.call_count == 1
+
+    meeting = events["2025-07-15"][0]
+    assert meeting["title"] == "会議, 定例"
+    assert (meeting["start_time"], meeting["end_time"]) == ("10:00", "11:30")
+    assert meeting["memo"] == "議題:予算\n場所:本社の大会議室で行います。長い説明文は折り返されています"
+    assert events["2025-08-01"][0]["start_time"] == ""
+    assert events["2025-07-16"][0]["end_time"] == "14:45"
+    # RRULE を扱わない場合は初回だけの予定になる
+    assert events["2025-07-07"][0]["title"] == "朝会"
+
+    event_manager.invalidate_events_cache()
+    assert event_manager.load_events() == events
+    assert ics_import.import_ics(events, ics_file) == (0, 0)
+
+
+# UT-39: RRULE の取り込みとプロセスプールでの分割読み込み
+def test_import_ics_rules_and_parallel(ics_file, tmp_path, monkeypatch):
+    """
+    RRULE 付きの予定が繰り返しルールとして取り込まれること、
+    プロセスプールで分割して読んでも逐次読み込みと同じ結果になることを確認する。
+    """
+    monkeypatch.setattr("services.recurrence.RECURRENCES_FILE", str(tmp_path / "recurrences.json"))
+    recs = RecurrenceSet()
+    events = EventCollection()
+    assert ics_import.import_ics(events, ics_file, recurrences=recs) == (3, 1)
+    assert "2025-07-07" not in events
+    assert [d for d in recs.occurrences_for_month(2025, 7)] == ["2025-07-07", "2025-07-21"]
+
+    monkeypatch.setattr(ics_import, "PARALLEL_MIN_BYTES", 0)
+    serial = list(ics_import.iter_ics_events(ics_file))
+    parallel = list(ics_import.iter_ics_events(ics_file, workers=2))
+    assert parallel == serial
+    assert len(ics_import._chunk_offsets(ics_file, 8)) > 2
+
+
+# UT-75: 繰り返しルールで表せない RRULE は取り込まない
+@pytest.mark.parametrize("rrule, supported", [
+    ("FREQ=MONTHLY;BYMONTHDAY=7", True),
+    ("FREQ=MONTHLY;BYMONTHDAY=-1", False),          # 月末から数える日
+    ("FREQ=MONTHLY;BYMONTHDAY=1,15", False),        # 複数の日
+    ("FREQ=YEARLY;BYMONTH=3", True),                # 初回と同じ月
+    ("FREQ=YEARLY;BYMONTH=3,9", False),             # 複数の月
+    ("FREQ=MONTHLY;BYMONTH=3", False),              # 毎月の繰り返しを月で絞る
+    ("FREQ=MONTHLY;BYDAY=1MO,1FR", True),
+    ("FREQ=MONTHLY;BYDAY=1MO,-1FR", False),         # 曜日ごとに順番が違う
+])
+def test_vevent_to_rule_rejects_unsupported(rrule, supported):
+    """
+    月末からの日・複数の日や月・初回以外の月・曜日ごとに違う順番の指定を含む RRULE が、
+    別のルールに化けずに None（単発の予定として取り込む）になることを確認する。
+    """
+    props = {
+        "UID": ({}, "rule-1@example.com"),
+        "DTSTART": ({}, "20250307T100000"),
+        "SUMMARY": ({}, "定例"),
+        "RRULE": ({}, rrule),
+        "EXDATE": [],
+    }
+    rule = ics_import.vevent_to_rule(props)
+    assert (rule is not None) == supported
+    if rrule.endswith("BYMONTHDAY=7"):
+        assert rule["monthday"] == 7
+    if rrule.endswith("1MO,1FR"):
+        assert (rule["weekdays"], rule["nth"]) == ([0, 4], 1)
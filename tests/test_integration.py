@@ -178,8 +178,10 @@ def test_holiday_api_failure(mocker):
     mock_save_cache = mocker.patch('services.holiday_service.save_holiday_cache')
 
     from services.holiday_service import get_holidays_for_year
+    from services.jp_holidays import holidays_for_year
     result = get_holidays_for_year(2099)
-    assert result == {}
+    assert result == holidays_for_year(2099)  # 取得できなければ計算した祝日で代用
+    assert result["2099-01-01"] == "元日"
     mock_fetch_api.assert_called_once_with(2099)
     mock_save_cache.assert_not_called()  # データなければキャッシュ保存しない
 
@@ -0,0 +1,61 @@
+# tests/test_interval_index.py
+
+import pytest
+from unittest.mock import patch
+
+from services import event_manager
+from services.event_manager import EventCollection
+from services.interval_index import IntervalIndex, find_overlaps, get_interval_index
+
+
+@pytest.fixture
+def events():
+    data = EventCollection({
+        "2025-07-15": [
+            {"id": "meeting", "title": "会議/打合せ", "start_time": "10:00", "end_time": "10:30", "memo": ""},
+            {"id": "trip", "title": "出張", "start_time": "14:00", "end_time": "17:00", "memo": ""},
+            {"id": "allday", "title": "休暇", "start_time": "", "end_time": "", "memo": ""},
+        ],
+        "2025-07-16": [
+            {"id": "next", "title": "来客", "start_time": "14:30", "end_time": "15:00", "memo": ""},
+        ],
+    })
+    # ジャーナルへの書き込みは行わない
+    with patch('services.event_manager._append_journal'):
+        yield data
+
+
+# UT-29: 時間帯が重なる予定の検索
+def test_overlapping_query(events):
+    """
+    指定した時間帯と重なる予定だけが返り、境界が接するだけの予定や
+    別の日の予定、時刻のない予定は含まれないことを確認する。
+    """
+    index = IntervalIndex(events)
+    assert index.overlapping("2025-07-15", "14:00", "15:30") == ["trip"]
+    assert index.overlapping("2025-07-15", "10:30", "14:00") == []
+    assert index.overlapping("2025-07-15", "09:00", "18:00") == ["meeting", "trip"]
+    assert index.overlapping("2025-07-16", "14:59") == ["next"]
+    assert len(index) == 3
+
+
+# UT-30: 予定の追加・更新・削除への追従
+def test_index_follows_mutations(events):
+    """
+    EventCollection に登録した索引が、event_manager の操作のたびに更新されることを確認する。
+    """
+    index = get_interval_index(events)
+    assert get_interval_index(events) is index
+
+    new_id = event_manager.add_event(events, "2025-07-15", "外出", "15:00", "16:00")
+    assert find_overlaps(events, "2025-07-15", "15:30", "15:45") == ["trip", new_id]
+
+    event_manager.update_event(events, "trip", "出張", "08:00", "09:00")
+    assert find_overlaps(events, "2025-07-15", "15:30", "15:45") == [new_id]
+
+    event_manager.move_event(events, new_id, "2025-07-16")
+    assert find_overlaps(events, "2025-07-16", "14:00", "16:00") == ["next", new_id]
+    assert find_overlaps(events, "2025-07-16", "14:00", "16:00", exclude_id=new_id) == ["next"]
+
+    event_manager.delete_event(events, "next")
+    assert find_overlaps(events, "2025-07-16", "14:00", "16:00") == [new_id]
@@ -0,0 +1,59 @@
+# tests/test_jp_holidays.py
+
+import json
+import os
+
+import pytest
+
+from services.jp_holidays import MAX_YEAR, MIN_YEAR, holidays_for_year
+
+HOLIDAYS_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "holidays.json")
+
+
+def _normalize(name: str) -> str:
+    # API のデータは振替休日を「休日 山の日」と書く年もあるので、種類だけをそろえて比べる
+    if name.endswith("振替休日") or name.startswith("休日 "):
+        return "振替休日"
+    return name
+
+
+# UT-60: 計算した祝日が同梱の holidays.json（祝日 API のデータ）と一致すること
+def test_holidays_match_bundled_cache():
+    """
+    holidays.json にあるすべての年について、日付と祝日名が一致することを確認する。
+    """
+    with open(HOLIDAYS_FILE, encoding="utf-8") as f:
+        bundled = json.load(f)
+    assert bundled
+    for year, expected in bundled.items():
+        computed = holidays_for_year(int(year))
+        assert computed.keys() == expected.keys(), year
+        for day, name in expected.items():
+            assert _normalize(computed[day]) == _normalize(name), day
+
+
+# UT-61: 年によって異なる規則（移動した祝日・一度だけの祝日・国民の休日）
+@pytest.mark.parametrize("day, name", [
+    ("1988-05-04", "国民の休日"),            # 2006 年までの 5/4
+    ("1999-01-15", "成人の日"),              # ハッピーマンデー前
+    ("2000-01-10", "成人の日"),              # 1 月の第 2 月曜日
+    ("2006-04-29", "みどりの日"),
+    ("2007-04-29", "昭和の日"),
+    ("2008-05-06", "みどりの日 振替休日"),    # 2007 年以降は次の祝日でない日へ振り替える
+    ("2015-09-22", "国民の休日"),            # シルバーウィーク
+    ("2018-12-23", "天皇誕生日"),
+    ("2019-05-01", "天皇の即位の日"),
+    ("2019-04-30", "国民の休日"),
+    ("2020-07-24", "スポーツの日"),          # 東京オリンピックで移動
+    ("2021-08-08", "山の日"),
+    ("2021-08-09", "山の日 振替休日"),
+])
+def test_holiday_rules_by_year(day, name):
+    """
+    法改正や特別措置法で変わった祝日が、その年の規則どおりに計算されることを確認する。
+    """
+    holidays = holidays_for_year(int(day[:4]))
+    assert holidays[day] == name
+    assert "2019-12-23" not in holidays_for_year(2019)        # 2019 年は天皇誕生日がない
+    assert "2020-10-12" not in holidays_for_year(2020)        # 移動した元の日は祝日ではない
+    assert holidays_for_year(MIN_YEAR - 1) == {} and holidays_for_year(MAX_YEAR + 1) == {}
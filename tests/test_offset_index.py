@@ -0,0 +1,137 @@
+# tests/test_offset_index.py
+
+import json
+
+from services import event_manager, offset_index
+from services.date_index import DateKeyIndex
+from services.event_store import JsonEventStore
+from services.offset_index import OffsetIndex
+
+
+def _events(n_days: int) -> dict:
+    return {
+        f"2025-07-{day:02d}": [
+            {"id": f"{day}-{i}", "title": "会議", "start_time": "10:00", "end_time": "11:00",
+             "memo": "「資料」\\n😀 \"引用\" {括弧}"}
+            for i in range(2)
+        ]
+        for day in range(1, n_days + 1)
+    }
+
+
+def _read_day(date_str: str) -> list:
+    return dict(event_manager.iter_days_between(date_str, date_str)).get(date_str, [])
+
+
+# UT-56: 日付キーのバイト範囲の索引で 1 日分だけを読めること
+def test_offset_index_reads_single_days(tmp_path, monkeypatch):
+    """
+    整形済み・1 行の JSON のどちらでも 1 日分・範囲だけを正しく読めること、
+    索引ファイルが保存されて次回はそのまま使われること、JSON が書き換えられたら
+    変わったキーから後ろだけを走査し直すことを確認する。
+    """
+    source = tmp_path / "events.json"
+    events = _events(10)
+    calls = []
+    original_scan = offset_index.scan_spans
+    monkeypatch.setattr(offset_index, "scan_spans",
+                        lambda buf, start=None: (calls.append(start), original_scan(buf, start))[1])
+
+    for text in (json.dumps(events, ensure_ascii=False, indent=2),
+                 json.dumps(events, ensure_ascii=True, separators=(",", ":"))):
+        source.write_text(text, encoding="utf-8")
+        index = OffsetIndex(str(source), str(tmp_path / "events.idx"))
+        assert dict(index.iter_between("2025-07-03", "2025-07-03")) == {"2025-07-03": events["2025-07-03"]}
+        assert list(index.iter_between("2025-08-01", "2025-08-01")) == []
+        assert [key for key, _ in index.iter_between("2025-07-09", "2025-07-31")] == ["2025-07-09", "2025-07-10"]
+
+    # 保存された索引を使うので、走査し直さない
+    calls.clear()
+    index = OffsetIndex(str(source), str(tmp_path / "events.idx"))
+    assert dict(index.iter_between("2025-07-05", "2025-07-05"))["2025-07-05"] == events["2025-07-05"]
+    assert calls == []
+
+    # 8 日目だけが変わったら、7 日目の終わりから後ろだけを走査する
+    events["2025-07-08"].append({"id": "new", "title": "追加"})
+    source.write_text(json.dumps(events, ensure_ascii=True, separators=(",", ":")), encoding="utf-8")
+    assert dict(index.iter_between("2025-07-08", "2025-07-08"))["2025-07-08"] == events["2025-07-08"]
+    assert dict(index.iter_between("2025-07-10", "2025-07-10"))["2025-07-10"] == events["2025-07-10"]
+    assert len(calls) == 1 and calls[0] == index.spans["2025-07-07"][1]
+
+
+# UT-57: まだ全体を読み込んでいないときは events.json の必要な範囲だけを読むこと
+def test_iter_days_between_uses_offset_index(tmp_path, monkeypatch):
+    """
+    load_events() の前は索引から範囲の日だけを返し（JSON 全体はパースしない）、
+    ジャーナルに未反映の操作があるときや読み込み済みのときは load_events() の内容を返すことを確認する。
+    """
+    events_file = tmp_path / "events.json"
+    events = _events(5)
+    events["2025-07-02"].append({"title": "旧形式"})  # ID のない予定
+    events_file.write_text(json.dumps(events, ensure_ascii=False, indent=2), encoding="utf-8")
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(events_file))
+    event_manager.invalidate_events_cache()
+
+    parse_calls = []
+    original_parse = event_manager._parse_snapshot
+    monkeypatch.setattr(event_manager, "_parse_snapshot",
+                        lambda text: (parse_calls.append(text), original_parse(text))[1])
+
+    store = JsonEventStore()
+    items = list(store.iter_events("2025-07-02", "2025-07-03"))
+    assert [date_str for date_str, _ in items] == ["2025-07-02"] * 3 + ["2025-07-03"] * 2
+    assert parse_calls == []
+    assert (tmp_path / "events.idx").exists()
+
+    # ID のない予定には load_events() と同じ ID が付く
+    legacy_id = _read_day("2025-07-02")[-1]["id"]
+    loaded = event_manager.load_events()
+    assert event_manager.find_event(loaded, legacy_id)[1]["title"] == "旧形式"
+    assert len(parse_calls) == 1
+
+    # 読み込み済みならメモリ上の（まだ書き込まれていない変更も含む）内容を返す
+    event_manager.add_event(loaded, "2025-07-04", "追加")
+    assert [event["title"] for event in _read_day("2025-07-04")][-1] == "追加"
+    # 範囲のキーは全キーの走査ではなく、日付キー索引から取り出す
+    days = dict(event_manager.iter_days_between("2025-07-03", "2025-07-31"))
+    assert list(days) == ["2025-07-03", "2025-07-04", "2025-07-05"]
+    assert DateKeyIndex in loaded._indexes
+    assert event_manager.flush_pending_saves(timeout=5)
+
+    # ジャーナルに操作が残っていれば、索引ではなくジャーナルを再生した内容を返す
+    event_manager.invalidate_events_cache()
+    assert _read_day("2025-07-04")[-1]["title"] == "追加"
+
+
+# UT-71: 範囲を指定した iter_events() が 1 日ずつ読むこと
+def test_iter_events_streams_days(tmp_path, monkeypatch):
+    """
+    JsonEventStore.iter_events() が範囲全体を読み込まず、取り出すたびに 1 日分ずつ
+    events.json から読むこと、途中で events.json が置き換えられたら続きの日から新しい内容を
+    読むことを確認する。
+    """
+    events_file = tmp_path / "events.json"
+    events = _events(5)
+    events_file.write_text(json.dumps(events, ensure_ascii=False, indent=2), encoding="utf-8")
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(events_file))
+    event_manager.invalidate_events_cache()
+
+    reads = []
+    original_read = OffsetIndex._read_next
+    monkeypatch.setattr(OffsetIndex, "_read_next",
+                        lambda self, start, end, after:
+                        (reads.append(after), original_read(self, start, end, after))[1])
+
+    items = JsonEventStore().iter_events("2025-07-01", "2025-07-31")
+    assert reads == []
+    assert next(items)[0] == "2025-07-01"
+    assert reads == [None]
+
+    del events["2025-07-02"]
+    events["2025-07-04"][0]["title"] = "変更"
+    events_file.write_text(json.dumps(events, ensure_ascii=False), encoding="utf-8")
+    rest = list(items)
+    assert [date_str for date_str, _ in rest] == [
+        "2025-07-01", "2025-07-03", "2025-07-03", "2025-07-04", "2025-07-04", "2025-07-05", "2025-07-05"]
+    assert rest[3][1]["title"] == "変更"
+    assert reads == [None, "2025-07-01", "2025-07-03", "2025-07-04", "2025-07-05"]
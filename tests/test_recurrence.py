@@ -0,0 +1,96 @@
+# tests/test_recurrence.py
+
+from unittest.mock import patch
+
+from services import recurrence
+from services.recurrence import (
+    RecurrenceSet, add_exception, add_recurrence, expand_rule, load_recurrences,
+    make_repeat_rule, make_rule, update_recurrence
+)
+
+
+# UT-35: 繰り返しルールの展開
+def test_expand_rule():
+    """
+    毎日・毎週・毎月（日付指定／第 n 曜日／最終曜日）・毎年の各ルールが、
+    指定した期間の日付だけに展開されることを確認する。
+    """
+    daily = make_rule("朝会", "2025-07-30", "daily", interval=2)
+    assert expand_rule(daily, "2025-08-01", "2025-08-07") == [
+        "2025-08-01", "2025-08-03", "2025-08-05", "2025-08-07",
+    ]
+
+    # 毎週 月・木（開始日より前は含まない）
+    weekly = make_rule("定例", "2025-07-03", "weekly", weekdays=[3, 0])
+    assert expand_rule(weekly, "2025-06-01", "2025-07-14") == [
+        "2025-07-03", "2025-07-07", "2025-07-10", "2025-07-14",
+    ]
+
+    # 毎月 31 日（31 日のない月は発生しない）
+    monthday = make_rule("締め", "2025-01-31", "monthly", monthday=31)
+    assert expand_rule(monthday, "2025-01-01", "2025-05-31") == [
+        "2025-01-31", "2025-03-31", "2025-05-31",
+    ]
+
+    # 第 2 火曜と最終金曜
+    second_tue = make_rule("委員会", "2025-01-14", "monthly", weekdays=[1], nth=2)
+    assert expand_rule(second_tue, "2025-09-01", "2025-10-31") == ["2025-09-09", "2025-10-14"]
+    assert make_repeat_rule("monthly_nth", "2025-10-31", "月末会")["nth"] == -1
+    last_fri = make_repeat_rule("monthly_nth", "2025-10-31", "月末会")
+    assert expand_rule(last_fri, "2025-11-01", "2025-12-31") == ["2025-11-28", "2025-12-26"]
+
+    # 毎年（2/29 はうるう年だけ）
+    leap = make_rule("記念日", "2024-02-29", "yearly")
+    assert expand_rule(leap, "2024-01-01", "2028-12-31") == ["2024-02-29", "2028-02-29"]
+
+
+# UT-36: 回数・終了日・除外日
+def test_expand_rule_limits():
+    """
+    回数（除外日も 1 回に数える）と終了日で展開が打ち切られ、除外日が取り除かれることを確認する。
+    """
+    rule = make_rule("研修", "2025-07-07", "weekly", count=4)
+    rule["exdates"] = ["2025-07-14"]
+    assert expand_rule(rule, "2025-07-01", "2025-12-31") == ["2025-07-07", "2025-07-21", "2025-07-28"]
+    assert expand_rule(rule, "2025-07-20", "2025-12-31") == ["2025-07-21", "2025-07-28"]
+
+    rule = make_rule("夏期", "2025-07-01", "daily", until="2025-07-03")
+    assert expand_rule(rule, "2025-06-01", "2025-07-31") == ["2025-07-01", "2025-07-02", "2025-07-03"]
+
+
+# UT-37: 月ごとの展開キャッシュと保存
+def test_recurrence_set_cache_and_save(tmp_path, monkeypatch):
+    """
+    月ごとの展開結果がキャッシュされ、ルールを変更するとそのルールの分だけ捨てられること、
+    ルールは 1 件として保存・読み込みされることを確認する。
+    """
+    monkeypatch.setattr(recurrence, "RECURRENCES_FILE", str(tmp_path / "recurrences.json"))
+    recs = RecurrenceSet()
+    weekly = make_repeat_rule("weekly", "2025-07-01", "定例", "10:00", "11:00")
+    daily = make_repeat_rule("daily", "2025-07-30", "日報", "17:00")
+    add_recurrence(recs, weekly)
+    add_recurrence(recs, daily)
+
+    month = recs.occurrences_for_month(2025, 7)
+    assert sorted(month) == ["2025-07-01", "2025-07-08", "2025-07-15", "2025-07-22",
+                             "2025-07-29", "2025-07-30", "2025-07-31"]
+    assert month["2025-07-08"][0]["title"] == "定例"
+    assert month["2025-07-08"][0]["rule_id"] == weekly["id"]
+
+    # 2 回目は展開し直さない
+    with patch('services.recurrence.expand_rule') as mock_expand:
+        recs.occurrences_for_month(2025, 7)
+        mock_expand.assert_not_called()
+
+    # 変更したルールの分だけ展開し直す
+    add_exception(recs, weekly["id"], "2025-07-15")
+    with patch('services.recurrence.expand_rule', wraps=recurrence.expand_rule) as mock_expand:
+        month = recs.occurrences_for_month(2025, 7)
+        assert mock_expand.call_count == 1
+    assert "2025-07-15" not in month
+
+    update_recurrence(recs, weekly["id"], title="週次定例")
+    loaded = load_recurrences()
+    assert len(loaded) == 2
+    assert loaded.occurrences_on("2025-07-22")[0]["title"] == "週次定例"
+    assert loaded.occurrences_on("2025-07-15") == []
@@ -0,0 +1,67 @@
+# tests/test_scheduler.py
+
+from unittest.mock import patch
+
+from services.event_manager import EventCollection
+from services.recurrence import RecurrenceSet, make_rule
+from services.scheduler import find_free_slots, sweep_free_slots
+
+
+# UT-48: 区間の走査による空き時間の検出
+def test_sweep_free_slots():
+    """
+    重なった予定・時間帯の外にはみ出す予定・翌日にまたがる予定があっても、
+    duration 分以上の空きだけが正しく返ることを確認する。
+    """
+    busy = sorted([(540, 600), (570, 630), (700, 720), (1000, 1500), (1500, 1510)])
+    windows = [(540, 1080), (1980, 2520)]
+    assert list(sweep_free_slots(busy, windows, 60)) == [
+        (630, 700), (720, 1000),   # 1 日目：9:00-10:30 は重なった 2 件で埋まる
+        (1980, 2520),              # 2 日目：翌日に入る予定は時間帯より前に終わる
+    ]
+    assert list(sweep_free_slots(busy, windows, 80)) == [(720, 1000), (1980, 2520)]
+    assert list(sweep_free_slots([], windows, 600)) == []
+
+
+# UT-49: 平日・祝日・繰り返し予定を考慮した空き時間の検索
+def test_find_free_slots_skips_weekends_and_holidays():
+    """
+    find_free_slots() が週末と祝日を飛ばし、通常の予定と繰り返し予定の両方を避け、
+    時刻のない予定では時間を塞がないことを確認する。
+    """
+    events = EventCollection({
+        "2025-07-14": [
+            {"id": "a", "title": "会議", "start_time": "09:00", "end_time": "12:00", "memo": ""},
+            {"id": "b", "title": "出張", "start_time": "", "end_time": "", "memo": ""},
+        ],
+    })
+    recurrences = RecurrenceSet([
+        make_rule("昼休み", "2025-07-01", "daily", start_time="12:00", end_time="13:00"),
+    ])
+    holidays = {"2025-07-21": "海の日"}
+
+    slots = find_free_slots(events, "2025-07-14", "2025-07-22", 60,
+                            holidays=holidays, recurrences=recurrences)
+    assert slots[:3] == [
+        ("2025-07-14", "13:00", "18:00"),
+        ("2025-07-15", "09:00", "12:00"),
+        ("2025-07-15", "13:00", "18:00"),
+    ]
+    dates = {date_str for date_str, _, _ in slots}
+    # 土日（19・20 日）と祝日（21 日）は含まれない
+    assert dates == {"2025-07-14", "2025-07-15", "2025-07-16", "2025-07-17", "2025-07-18", "2025-07-22"}
+
+    assert find_free_slots(events, "2025-07-14", "2025-07-14", 300, holidays={}) == [
+        ("2025-07-14", "12:00", "18:00")
+    ]
+    assert len(find_free_slots(events, "2025-07-14", "2025-07-31", 60, holidays={}, limit=2)) == 2
+
+    # holidays を省略すると holiday_service のメモリ上の祝日を使う（API は待たない）
+    with patch("services.scheduler.peek_holidays", return_value=holidays) as mock_peek, \
+            patch("services.holiday_service.fetch_holidays_from_api") as mock_fetch:
+        assert find_free_slots(events, "2025-07-21", "2025-07-21", 60) == []
+        mock_peek.assert_called_once_with(2025)
+        # まだ取得していない年は計算した祝日で代用する（2025-07-21 は海の日）
+        mock_peek.return_value = None
+        assert find_free_slots(events, "2025-07-21", "2025-07-21", 60) == []
+        mock_fetch.assert_not_called()
@@ -0,0 +1,65 @@
+# tests/test_search_index.py
+
+import pytest
+from unittest.mock import patch
+
+from services import event_manager
+from services.event_manager import EventCollection
+from services.search_index import SearchIndex, search_events, tokenize
+
+
+@pytest.fixture
+def events():
+    data = EventCollection({
+        "2025-06-02": [
+            {"id": "tohoku", "title": "東北出張", "start_time": "09:00", "end_time": "18:00", "memo": "仙台支社"},
+        ],
+        "2025-07-15": [
+            {"id": "kaigi", "title": "会議/打合せ", "start_time": "10:00", "end_time": "10:30", "memo": "ＡＢＣ社と定例"},
+            {"id": "kyushu", "title": "九州出張", "start_time": "08:00", "end_time": "", "memo": ""},
+        ],
+    })
+    # ジャーナルへの書き込みは行わない
+    with patch('services.event_manager._append_journal'):
+        yield data
+
+
+# UT-31: bigram による日本語の部分一致検索
+def test_search_japanese_bigram(events):
+    """
+    形態素解析なしで部分一致検索でき、結果は新しい日付順で返ることを確認する。
+    全角英字や 1 文字の検索語、複数語の AND 検索も扱えること。
+    """
+    assert tokenize("東北出張") == {"東", "北", "出", "張", "東北", "北出", "出張"}
+
+    index = SearchIndex(events)
+    assert index.search("出張") == [("2025-07-15", "kyushu"), ("2025-06-02", "tohoku")]
+    assert index.search("東北") == [("2025-06-02", "tohoku")]
+    assert index.search("abc") == [("2025-07-15", "kaigi")]     # メモの全角英字も一致
+    assert index.search("仙") == [("2025-06-02", "tohoku")]
+    assert index.search("出張 仙台") == [("2025-06-02", "tohoku")]
+    # bigram はそろっていても連続していない語は一致しない
+    assert index.search("張出") == []
+    assert index.search("   ") == []
+    assert index.search("出張", limit=1) == [("2025-07-15", "kyushu")]
+
+
+# UT-32: 予定の追加・更新・削除への追従
+def test_search_follows_mutations(events):
+    """
+    EventCollection に登録した索引が、event_manager の操作のたびに更新されることを確認する。
+    """
+    assert search_events(events, "出張") == [("2025-07-15", "kyushu"), ("2025-06-02", "tohoku")]
+
+    new_id = event_manager.add_event(events, "2025-08-01", "北海道出張", "", "", "")
+    assert search_events(events, "北海道") == [("2025-08-01", new_id)]
+
+    event_manager.update_event(events, "kyushu", "九州視察", "08:00", "", "")
+    assert search_events(events, "出張") == [("2025-08-01", new_id), ("2025-06-02", "tohoku")]
+    assert search_events(events, "視察") == [("2025-07-15", "kyushu")]
+
+    event_manager.move_event(events, "tohoku", "2025-09-10")
+    assert search_events(events, "東北") == [("2025-09-10", "tohoku")]
+
+    event_manager.delete_event(events, new_id)
+    assert search_events(events, "北海道") == []
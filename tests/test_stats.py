@@ -0,0 +1,103 @@
+# tests/test_stats.py
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import stats as stats_cli
+from services import event_manager
+from services.event_store import JsonEventStore
+from services.recurrence import RecurrenceSet, make_rule
+from services.stats import CATEGORIES, EventStats, load_stats
+
+
+def _ev(title, start="", end=""):
+    return {"title": title, "start_time": start, "end_time": end, "memo": ""}
+
+
+ITEMS = [
+    ("2025-06-30", _ev("会議/打合せ", "09:00", "10:30")),   # 月曜
+    ("2025-07-01", _ev("会議/打合せ", "09:30", "11:00")),   # 火曜
+    ("2025-07-01", _ev("来客", "13:00", "14:00")),
+    ("2025-07-06", _ev("旅行", "10:00", "12:00")),          # 日曜・選択肢にないタイトル
+    ("2025-07-07", _ev("休暇")),                            # 時刻なし
+    ("2025-07-07", _ev("外出", "15:00", "14:00")),          # 終了が開始より前
+]
+
+
+# UT-52: 日・週・月・分類ごとの時間とヒートマップ
+def test_event_stats_aggregates():
+    """
+    EventStats が期間・分類ごとの合計時間と、曜日 × 時間帯の時間を正しく求め、
+    時刻のない予定や終了時刻の誤った予定を 0 時間として扱うことを確認する。
+    """
+    stats = EventStats.from_items(ITEMS)
+    assert len(stats) == 6
+
+    labels, hours = stats.hours_by("month")
+    assert labels == ["2025-06", "2025-07"]
+    assert hours.tolist() == [1.5, 4.5]
+
+    labels, hours = stats.hours_by("week")
+    assert labels == ["2025-06-30", "2025-07-07"]
+    assert hours.tolist() == [6.0, 0.0]
+
+    labels, table = stats.hours_by_category("month")
+    assert table.shape == (2, len(CATEGORIES))
+    assert table[1, CATEGORIES.index("会議/打合せ")] == 1.5
+    assert table[1, CATEGORIES.index("その他")] == 2.0
+
+    meetings = stats.between("2025-07-01", "2025-07-31", category="会議/打合せ")
+    assert meetings.hours_by("day") == (["2025-07-01"], pytest.approx(np.array([1.5])))
+
+    heatmap = stats.heatmap()
+    assert heatmap.shape == (7, 24)
+    assert heatmap[1, 9] == 0.5 and heatmap[1, 10] == 1.0   # 火曜 9:30-11:00
+    assert heatmap[6, 10] == 1.0 and heatmap[6, 11] == 1.0  # 日曜 10:00-12:00
+    assert heatmap.sum() == pytest.approx(stats.minutes.sum() / 60)
+
+    with pytest.raises(ValueError):
+        stats.hours_by("year")
+
+
+# UT-53: ストアからの読み込みとコマンドライン版の集計
+def test_load_stats_and_cli(tmp_path, monkeypatch, capsys):
+    """
+    load_stats() が範囲内の予定と繰り返し予定の回を読み込み、
+    stats.py が月ごとの時間を表示することを確認する。
+    """
+    monkeypatch.setattr(event_manager, "EVENTS_FILE", str(tmp_path / "events.json"))
+    monkeypatch.setattr("services.recurrence.RECURRENCES_FILE", str(tmp_path / "recurrences.json"))
+    events = event_manager.load_events()
+    event_manager.add_events(events, [(date_str, dict(ev)) for date_str, ev in ITEMS])
+
+    recurrences = RecurrenceSet([
+        make_rule("会議/打合せ", "2025-07-01", "weekly", start_time="17:00", end_time="18:00", count=2),
+    ])
+    stats = load_stats(JsonEventStore(), "2025-07-01", "2025-07-31", recurrences)
+    assert stats.between(category="会議/打合せ").hours_by("month")[1].tolist() == [3.5]
+
+    stats_cli.main(["--from", "2025-01-01", "--to", "2025-12-31", "--store", "json"])
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == ["期間\t時間", "2025-06\t1.5", "2025-07\t4.5"]
+
+
+# UT-73: 統計を使わなければ NumPy・UI を読み込まないこと
+def test_stats_are_loaded_lazily():
+    """
+    コントローラーを読み込んだだけでは NumPy を読み込まず（起動を遅くしない）、
+    services.stats がサービス層の外（ui.theme）に依存しないことを確認する。
+    """
+    import os
+    import subprocess
+    import sys
+
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1])\n"
+        "import controllers.calendar_controller\n"
+        "assert 'numpy' not in sys.modules\n"
+        "import services.stats\n"
+        "assert 'numpy' in sys.modules and 'ui.theme' not in sys.modules\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", script, root], check=True, timeout=30)
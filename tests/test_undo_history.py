@@ -0,0 +1,87 @@
+# tests/test_undo_history.py
+
+import copy
+
+import pytest
+
+from services import event_manager
+from services.event_store import JsonEventStore, ShardedJsonEventStore, SqliteEventStore
+from services.undo_history import UndoHistory
+
+
+class _ReloadingJsonStore(JsonEventStore):
+    """load_events() のたびにキャッシュを捨て、スナップショット＋ジャーナルから読み直す"""
+
+    def load_events(self, start=None, end=None):
+        assert event_manager.flush_pending_saves(timeout=5)
+        event_manager.invalidate_events_cache()
+        return super().load_events(start, end)
+
+
+@pytest.fixture(params=["json", "sqlite", "shards"])
+def store(request, tmp_path, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(event_manager, "EVENTS_FILE", str(tmp_path / "events.json"))
+        store = _ReloadingJsonStore()
+    elif request.param == "sqlite":
+        store = SqliteEventStore(str(tmp_path / "events.db"))
+    else:
+        store = ShardedJsonEventStore(str(tmp_path / "events"))
+    yield store
+    store.close()
+
+
+# UT-46: 編集の取り消しとやり直し（保存先にも反映される）
+def test_undo_redo_round_trip(store):
+    """
+    追加・更新・移動・削除を UndoHistory 経由で行い、undo を繰り返すと
+    各段階の状態に戻り、redo で元の最終状態に戻ることを保存先も含めて確認する。
+    """
+    history = UndoHistory(store)
+    events = {}
+    states = [copy.deepcopy(events)]
+
+    first_id = history.add_event(events, "2025-07-25", "会議", "10:00", "11:00", "ZOOM")
+    states.append(copy.deepcopy(events))
+    lunch_id = history.add_event(events, "2025-07-25", "ランチ", "12:00", "13:00", "")
+    states.append(copy.deepcopy(events))
+    assert history.update_event(events, lunch_id, "ランチ会", "12:00", "13:30", "同僚と")
+    states.append(copy.deepcopy(events))
+    assert history.move_event(events, lunch_id, "2025-08-01")
+    states.append(copy.deepcopy(events))
+    assert history.delete_event(events, first_id)
+    states.append(copy.deepcopy(events))
+
+    for expected in reversed(states[:-1]):
+        assert history.undo(events) is not None
+        assert events == expected
+        assert store.load_events() == expected
+    assert not history.can_undo()
+    assert history.undo(events) is None
+
+    for expected in states[1:]:
+        assert history.redo(events) is not None
+        assert events == expected
+        assert store.load_events() == expected
+    assert not history.can_redo()
+
+
+# UT-47: 削除の取り消しは同じ ID・同じ位置に戻る
+def test_undo_delete_restores_position(store):
+    """
+    3 件ある日の真ん中の予定を削除して undo すると、同じ ID のまま元の位置に戻り、
+    影響を受けた日付が返ること、新しい編集でやり直し履歴が消えることを確認する。
+    """
+    history = UndoHistory(store)
+    events = {}
+    ids = [history.add_event(events, "2025-07-25", title) for title in ("朝会", "会議", "夕会")]
+
+    history.delete_event(events, ids[1])
+    assert history.undo(events) == {"2025-07-25"}
+    assert [ev["id"] for ev in events["2025-07-25"]] == ids
+    assert [ev["id"] for ev in store.load_events()["2025-07-25"]] == ids
+
+    history.redo(events)
+    history.undo(events)
+    history.add_event(events, "2025-07-26", "新しい予定")
+    assert not history.can_redo()
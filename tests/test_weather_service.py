@@ -0,0 +1,79 @@
+# tests/test_weather_service.py
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+from services import weather_service
+from services.http_client import HttpClient
+from services.weather_service import WeatherCache
+
+
+def _join_refresh():
+    for thread in threading.enumerate():
+        if thread.name == "weather-refresh":
+            thread.join(timeout=5)
+
+
+# UT-67: 天気のキャッシュは古いデータをすぐに返し、裏で 1 回だけ取得し直すこと
+def test_weather_cache_serves_stale_while_revalidating(tmp_path):
+    """
+    起動直後は保存済みの応答から天気を復元して待たずに返すこと、TTL を過ぎていれば
+    バックグラウンドで 1 回だけ取得して callback に渡すこと、TTL 内なら取得しないことを確認する。
+    """
+    client = HttpClient(cache_dir=str(tmp_path))
+    client._store(weather_service.JSON_URL, {
+        "url": weather_service.JSON_URL, "etag": '"v1"', "last_modified": None,
+        "fetched_at": time.time() - 3600,
+        "body": json.dumps({"text": "神奈川県は、晴れています。"}, ensure_ascii=False),
+    })
+    release = threading.Event()
+    fresh = {"icon": ["rain_icon.png"], "description": "神奈川県は、雨となっています"}
+
+    def slow_fetch():
+        release.wait(timeout=5)
+        return fresh
+
+    delivered = []
+    cache = WeatherCache(ttl=600)
+    with patch("services.weather_service.get_client", return_value=client), \
+         patch("services.weather_service.get_weather_for_today", side_effect=slow_fetch) as mock_fetch:
+        # 1 時間前の天気（TTL 切れ）をすぐに返し、取得は裏で行う
+        assert cache.get(delivered.append)["description"] == "神奈川県は、晴れています"
+        assert cache.get(delivered.append)["description"] == "神奈川県は、晴れています"
+        release.set()
+        _join_refresh()
+        assert mock_fetch.call_count == 1
+        assert delivered == [fresh]
+
+        # 取得したばかりなので TTL 内は取得しない
+        assert cache.get(delivered.append) == fresh
+        _join_refresh()
+        assert mock_fetch.call_count == 1
+
+
+# UT-68: 月の移動では天気を取得しないこと
+def test_navigation_does_not_fetch_weather():
+    """
+    weather_notifier を指定したコントローラは、起動時にキャッシュの天気を使い、
+    前月・次月・今日への移動では天気を取得しないことを確認する。
+    """
+    weather = {"icon": ["sun_icon.png"], "description": "晴れ"}
+    with patch("controllers.calendar_controller.get_cached_weather", return_value=weather) as mock_cached, \
+         patch("controllers.calendar_controller.get_weather_for_today") as mock_fetch, \
+         patch("controllers.calendar_controller.get_holidays_for_year", return_value={}), \
+         patch("controllers.calendar_controller.load_events", return_value={}):
+        from controllers.calendar_controller import CalendarController
+        notifier = lambda weather: None
+        controller = CalendarController(weather_notifier=notifier)
+        assert controller.get_weather_info() == weather
+        mock_cached.assert_called_once_with(notifier)
+
+        controller.next_month()
+        controller.prev_month()
+        controller.go_to_today()
+        controller.go_to_date("2025-01-15")
+        assert mock_cached.call_count == 1
+        mock_fetch.assert_not_called()
+        assert controller.get_weather_info() == weather
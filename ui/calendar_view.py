@@ -4,6 +4,9 @@ from utils.calendar_utils import generate_calendar_matrix
 from ui.theme import COLORS, FONTS
 from services.theme_manager import ThemeManager
 from ui.tooltip import ToolTip
+from services.conflicts import find_day_conflicts, get_conflict_index
+from services.date_index import get_date_index
+from services.event_manager import EventCollection
 
 class CalendarView:
     """カレンダー表示用の UI コンポーネント"""
@@ -17,7 +20,8 @@ class CalendarView:
         events: dict,
         on_date_click,  # 日付クリック時コールバック
         on_prev,        # 前月ボタンコールバック
-        on_next         # 次月ボタンコールバック
+        on_next,        # 次月ボタンコールバック
+        recurrences=None  # 繰り返し予定（RecurrenceSet、任意）
     ):
         self.parent = parent
         self.year = year
@@ -27,6 +31,9 @@ class CalendarView:
         self.on_date_click = on_date_click
         self.on_prev = on_prev
         self.on_next = on_next
+        self.recurrences = recurrences
+        # 表示中の月の 日付キー → 予定リスト（通常の予定＋繰り返し予定の各回）
+        self.day_events = {}
         self.footer_frame = None
         self.holiday_label = None
 
@@ -176,62 +183,138 @@ class CalendarView:
                 pady=4
             ).grid(row=1, column=idx, padx=1, pady=4)
 
+    def _month_events(self) -> dict:
+        """
+        表示中の月の 日付キー → 予定リスト を作る。
+        繰り返し予定はこの月の分だけを展開する（展開結果は RecurrenceSet がキャッシュ）。
+        """
+        if not self.recurrences:
+            return self.events
+        merged = self.recurrences.occurrences_for_month(self.year, self.month)
+        for key, day in merged.items():
+            if key in self.events:
+                merged[key] = sorted(self.events[key] + day, key=lambda ev: ev["start_time"])
+        # 全キーを走査せず、日付キー索引からこの月の日付だけを取り出す
+        prefix = f"{self.year}-{self.month:02d}-"
+        for key in get_date_index(self.events).keys_between(prefix + "01", prefix + "31"):
+            if key not in merged:
+                merged[key] = self.events[key]
+        return merged
+
     def _draw_days(self):
         """各日付セルを生成し、イベントや祝日を反映"""
         matrix = generate_calendar_matrix(self.year, self.month)
+        self.day_events = self._month_events()
+        # 日付キー → (行, 列, 日, セルのウィジェット)。一部のセルだけ描き直すときに使う
+        self.day_cells = {}
 
         for row_index, week in enumerate(matrix, start=2):
-                for col_index, day in enumerate(week):
-                    if not day:
-                        text, key = '', None
-                        fg_color = ThemeManager.get('text') 
-                    else:
-                        key = f"{self.year}-{self.month:02d}-{day:02d}"
-                        text = str(day)
-                        # 今日だけ色を変える
-                        fg_color = ThemeManager.get('today_fg') if self._is_today(day) else ThemeManager.get('text')
-                    
-                    bg = self._get_day_bg(day, col_index, key)
-
-                    lbl = tk.Label(
-                        self.frame,
-                        text=text,
-                        font=FONTS['base'],
-                        bg=bg,
-                        fg=fg_color,
-                        width=6,
-                        height=2,
-                        bd=1,
-                        padx=2,  # 左右の余白を増やす
-                        pady=2,  # 上下の余白を減らす
-                        relief='ridge'
-                    )
-                    lbl.grid(row=row_index, column=col_index, padx=1, pady=1)
-
-                    # ↓この下に追加！祝日セルに㊗マークバッジを右上に表示
-                    badge = None
-                    if key in self.holidays:
-                        badge = tk.Label(
-                            self.frame,
-                            text="㊗",
-                            font=("Meiryo", 12, "bold"),
-                            fg=ThemeManager.get('badge_fg', ThemeManager.get('bg')),
-                            bg=ThemeManager.get('badge_bg', bg),
-                            bd=0
-                        )
-                        # セルの中で右上に配置（relx=1.0で右端、y=+4で少し下げる）
-                        badge.place(in_=lbl, relx=1.0, rely=0.0, anchor="ne", x=-2, y=2)
-                    
-                    # --- ホバー効果（祝日バッジがあれば連動） ---
-                    self._add_hover_effect(lbl, bg, badge=badge)
-                    
-                    if day:
-                        # クリック時の挙動設定
-                        lbl.bind('<Button-1>', lambda e, d=key: self.on_date_click(d))
-                        # イベントがある日はツールチップ表示
-                        if key in self.events:
-                            tip_text = self._make_event_summary(self.events[key])
-                            ToolTip(lbl, tip_text)
+            for col_index, day in enumerate(week):
+                self._draw_cell(row_index, col_index, day)
+
+    def _draw_cell(self, row_index, col_index, day):
+        """1 つの日付セル（と祝日バッジ）を生成"""
+        if not day:
+            text, key = '', None
+            fg_color = ThemeManager.get('text')
+        else:
+            key = f"{self.year}-{self.month:02d}-{day:02d}"
+            text = str(day)
+            # 今日だけ色を変える
+            fg_color = ThemeManager.get('today_fg') if self._is_today(day) else ThemeManager.get('text')
+
+        bg = self._get_day_bg(day, col_index, key)
+
+        lbl = tk.Label(
+            self.frame,
+            text=text,
+            font=FONTS['base'],
+            bg=bg,
+            fg=fg_color,
+            width=6,
+            height=2,
+            bd=1,
+            padx=2,  # 左右の余白を増やす
+            pady=2,  # 上下の余白を減らす
+            relief='ridge'
+        )
+        lbl.grid(row=row_index, column=col_index, padx=1, pady=1)
+
+        # ↓この下に追加！祝日セルに㊗マークバッジを右上に表示
+        badge = None
+        if key in self.holidays:
+            badge = tk.Label(
+                self.frame,
+                text="㊗",
+                font=("Meiryo", 12, "bold"),
+                fg=ThemeManager.get('badge_fg', ThemeManager.get('bg')),
+                bg=ThemeManager.get('badge_bg', bg),
+                bd=0
+            )
+            # セルの中で右上に配置（relx=1.0で右端、y=+4で少し下げる）
+            badge.place(in_=lbl, relx=1.0, rely=0.0, anchor="ne", x=-2, y=2)
+
+        # 時間の重なっている予定がある日は左下に⚠マークを表示
+        conflicts = self._conflicts_on(key) if day else []
+        marker = None
+        if conflicts:
+            marker = tk.Label(
+                self.frame,
+                text="⚠",
+                font=FONTS['small'],
+                fg=ThemeManager.get('conflict_fg', '#D9534F'),
+                bg=bg,
+                bd=0
+            )
+            marker.place(in_=lbl, relx=0.0, rely=1.0, anchor="sw", x=2, y=-2)
+            marker.bind('<Button-1>', lambda e, d=key: self.on_date_click(d))
+
+        # --- ホバー効果（祝日バッジ・⚠マークがあれば連動） ---
+        self._add_hover_effect(lbl, bg, badge=badge, marker=marker)
+
+        if day:
+            # クリック時の挙動設定
+            lbl.bind('<Button-1>', lambda e, d=key: self.on_date_click(d))
+            # イベントがある日はツールチップ表示
+            if key in self.day_events:
+                tip_text = self._make_event_summary(self.day_events[key])
+                if conflicts:
+                    tip_text += f"\n⚠ 時間の重なり {len(conflicts)} 件"
+                ToolTip(lbl, tip_text)
+            self.day_cells[key] = (row_index, col_index, day, [w for w in (lbl, badge, marker) if w])
+
+    def refresh_dates(self, events, date_keys):
+        """
+        指定した日付のセルだけを描き直す（ほかのプロセスで予定が変わったときなど）。
+        表示中の月に含まれない日付は無視する。
+        """
+        self.events = events
+        targets = [key for key in date_keys if key in self.day_cells]
+        if not targets:
+            return
+        month_events = self._month_events()
+        for key in targets:
+            if key in month_events:
+                self.day_events[key] = month_events[key]
+            else:
+                self.day_events.pop(key, None)
+            row_index, col_index, day, widgets = self.day_cells.pop(key)
+            for widget in widgets:
+                widget.destroy()
+            self._draw_cell(row_index, col_index, day)
+
+    def _conflicts_on(self, key) -> list:
+        """
+        その日の時間が重なっている予定 ID の組を返す。
+        通常の予定だけの日は events の重なり索引（編集された日だけ計算し直す）を使い、
+        繰り返し予定の回がある日はその日の予定だけを調べる。
+        """
+        day = self.day_events.get(key)
+        if not day or len(day) < 2:
+            return []
+        if isinstance(self.events, EventCollection) and day is self.events.get(key):
+            return get_conflict_index(self.events).conflicts_on(key)
+        return find_day_conflicts(day)
 
     def _get_day_bg(self, day, col, key) -> str:
         """
@@ -240,7 +323,7 @@ class CalendarView:
         """
         if not day:
             return ThemeManager.get('bg')
-        if key in self.events:
+        if key in self.day_events:
             return ThemeManager.get('highlight')
         if key in self.holidays:
             return ThemeManager.get('accent')
@@ -259,19 +342,23 @@ class CalendarView:
             now.day == day
         )
 
-    def _add_hover_effect(self, widget, orig_bg, badge=None):
-        """日付セルと㊗バッジのホバー効果"""
+    def _add_hover_effect(self, widget, orig_bg, badge=None, marker=None):
+        """日付セルと㊗バッジ・⚠マークのホバー効果"""
         hover_bg = ThemeManager.get("hover", "#D0EBFF")
 
         def on_enter(e):
             widget.config(bg=hover_bg)
             if badge:
                 badge.config(bg=hover_bg)
+            if marker:
+                marker.config(bg=hover_bg)
 
         def on_leave(e):
             widget.config(bg=orig_bg)
             if badge:
                 badge.config(bg=orig_bg)
+            if marker:
+                marker.config(bg=orig_bg)
 
         widget.bind('<Enter>', on_enter)
         widget.bind('<Leave>', on_leave)
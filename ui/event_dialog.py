@@ -3,8 +3,15 @@
 import tkinter as tk
 import sys
 import os
+from datetime import date, timedelta
 from tkinter import messagebox
-from services.event_manager import save_events
+from services.event_store import JsonEventStore
+from services.event_manager import find_event
+from services.interval_index import find_overlaps
+from services.scheduler import find_free_slots
+from services.recurrence import (
+    add_exception, add_recurrence, delete_recurrence, make_repeat_rule, update_recurrence
+)
 from ui.event_edit_dialog import EditDialog
 from ui.theme import COLORS, FONTS
 from services.theme_manager import ThemeManager
@@ -12,15 +19,23 @@ from ui.tooltip import ToolTip
 from utils.resource import resource_path  # アイコン等のリソースパス解決用
 
 
+# 空き時間の候補を探す日数（この日から）
+SLOT_SEARCH_DAYS = 14
+
+
 class EventDialog(tk.Toplevel):
     """指定された日付のイベント一覧を表示・追加・編集・削除できるダイアログ"""
 
-    def __init__(self, parent, date_key, events, on_update_callback):
+    def __init__(self, parent, date_key, events, on_update_callback, store=None, recurrences=None):
         super().__init__(parent)
         self.parent = parent
         self.date_key = date_key
         self.events = events
         self.on_update_callback = on_update_callback
+        # 保存先（省略時は events.json）
+        self.store = store or JsonEventStore()
+        # 繰り返し予定（RecurrenceSet、任意）
+        self.recurrences = recurrences
 
         # 初期設定
         self.withdraw()
@@ -184,22 +199,36 @@ class EventDialog(tk.Toplevel):
     def refresh_list(self):
         """現在の events から Listbox を再描画"""
         self.listbox.delete(0, tk.END)
-        for ev in self.events.get(self.date_key, []):
+        # Listbox の行番号 → 予定 ID（編集・削除は ID で行う）
+        self.event_ids = []
+        # 繰り返し予定の回は ID の代わりに予定 dict を持つ（"rule_id" で判別）
+        self.occurrences = {}
+        for ev in self._day_events():
+            self.event_ids.append(ev.get("id"))
+            if "rule_id" in ev:
+                self.occurrences[ev["id"]] = ev
             text = f"{ev['start_time']}-{ev['end_time']}  {ev['title']}"
+            if "rule_id" in ev:
+                text = "🔁 " + text
             if ev.get("memo"):
                 text += f"  - {ev['memo']}"
             self.listbox.insert(tk.END, text)
 
     def add_event(self):
         """予定追加ダイアログを開き、新規予定を保存→再描画"""
-        dialog = EditDialog(self, "予定の追加")
+        dialog = EditDialog(self, "予定の追加", overlap_checker=self._overlap_checker(),
+                            allow_repeat=self.recurrences is not None, slot_finder=self._find_slots)
         dialog.wait_window()  # ダイアログ終了まで待機
         if dialog.result:
             title, st, et, memo = dialog.result
-            self.events.setdefault(self.date_key, []).append({
-                "title": title, "start_time": st, "end_time": et, "memo": memo
-            })
-            save_events(self.events)
+            # 空き時間の候補から別の日を選んだときはその日に追加する
+            date_key = dialog.date or self.date_key
+            if dialog.repeat:
+                # 繰り返し予定はルールを 1 件保存するだけ（各回は表示時に展開される）
+                rule = make_repeat_rule(dialog.repeat, date_key, title, st, et, memo)
+                add_recurrence(self.recurrences, rule)
+            else:
+                self.store.add_event(self.events, date_key, title, st, et, memo)
             self.refresh_list()
             self.on_update_callback()
 
@@ -209,24 +238,22 @@ class EventDialog(tk.Toplevel):
         if not sel:
             messagebox.showwarning("警告", "編集する予定を選択してください")
             return
-        idx = sel[0]
-        ev = self.events[self.date_key][idx]
+        event_id = self.event_ids[sel[0]]
+        if event_id in self.occurrences:
+            self._edit_occurrence(self.occurrences[event_id])
+            return
+        _, ev = find_event(self.events, event_id)
         dialog = EditDialog(
             self, "予定の編集",
             default_title=ev["title"],
             default_start_time=ev["start_time"],
             default_end_time=ev["end_time"],
-            default_content=ev.get("memo", "")
+            default_content=ev.get("memo", ""),
+            overlap_checker=self._overlap_checker(exclude_id=event_id)
         )
         dialog.wait_window()
         if dialog.result:
-            self.events[self.date_key][idx] = {
-                "title": dialog.result[0],
-                "start_time": dialog.result[1],
-                "end_time": dialog.result[2],
-                "memo": dialog.result[3]
-            }
-            save_events(self.events)
+            self.store.update_event(self.events, event_id, *dialog.result)
             self.refresh_list()
             self.on_update_callback()
 
@@ -236,14 +263,73 @@ class EventDialog(tk.Toplevel):
         if not sel:
             messagebox.showwarning("警告", "削除する予定を選択してください")
             return
-        idx = sel[0]
-        del self.events[self.date_key][idx]
-        if not self.events[self.date_key]:
-            del self.events[self.date_key]
-        save_events(self.events)
+        event_id = self.event_ids[sel[0]]
+        if event_id in self.occurrences:
+            self._delete_occurrence(self.occurrences[event_id])
+            return
+        self.store.delete_event(self.events, event_id)
+        self.refresh_list()
+        self.on_update_callback()
+
+    def _day_events(self):
+        """この日の予定（通常の予定＋繰り返し予定の回）を開始時刻順に返す"""
+        day = self.events.get(self.date_key, [])
+        if not self.recurrences:
+            return day
+        return sorted(day + self.recurrences.occurrences_on(self.date_key),
+                      key=lambda ev: ev["start_time"])
+
+    def _edit_occurrence(self, ev):
+        """繰り返し予定の回を編集する（ルールごと変更し、すべての回に反映）"""
+        if not messagebox.askyesno("繰り返し予定", "繰り返し予定のすべての回を変更します。よろしいですか？"):
+            return
+        dialog = EditDialog(
+            self, "繰り返し予定の編集",
+            default_title=ev["title"],
+            default_start_time=ev["start_time"],
+            default_end_time=ev["end_time"],
+            default_content=ev.get("memo", "")
+        )
+        dialog.wait_window()
+        if dialog.result:
+            title, st, et, memo = dialog.result
+            update_recurrence(self.recurrences, ev["rule_id"],
+                              title=title, start_time=st, end_time=et, memo=memo)
+            self.refresh_list()
+            self.on_update_callback()
+
+    def _delete_occurrence(self, ev):
+        """繰り返し予定の回を削除する（この回だけ／すべての回）"""
+        answer = messagebox.askyesnocancel(
+            "繰り返し予定の削除",
+            "この回だけ削除しますか？\n「いいえ」を選ぶと、すべての回を削除します。"
+        )
+        if answer is None:
+            return
+        if answer:
+            add_exception(self.recurrences, ev["rule_id"], self.date_key)
+        else:
+            delete_recurrence(self.recurrences, ev["rule_id"])
         self.refresh_list()
         self.on_update_callback()
 
+    def _overlap_checker(self, exclude_id=None):
+        """EditDialog に渡す、この日（date_str を渡せばその日）の重複予定を探す関数を作る"""
+        def check(start, end, date_str=None):
+            ids = find_overlaps(self.events, date_str or self.date_key, start, end, exclude_id=exclude_id)
+            return [find_event(self.events, event_id)[1] for event_id in ids]
+        return check
+
+    def _find_slots(self, duration):
+        """EditDialog に出す空き時間の候補（この日から 2 週間の平日・祝日以外から 3 件）"""
+        last = (date.fromisoformat(self.date_key) + timedelta(days=SLOT_SEARCH_DAYS - 1)).isoformat()
+        try:
+            return find_free_slots(self.events, self.date_key, last, duration,
+                                   recurrences=self.recurrences, limit=3)
+        except Exception as e:
+            print(f"[ERROR] 空き時間の検索でエラー発生: {e}")
+            return []
+
     def add_button_hover(self, button, original_bg, hover_bg=None):
         """
         ボタンにマウスホバー時の背景色変化を設定。
@@ -4,24 +4,41 @@ import tkinter as tk
 import sys
 import os
 from tkinter import ttk, messagebox
-from ui.theme import COLORS, FONTS, TITLE_CHOICES, TIME_CHOICES
+from ui.theme import COLORS, FONTS, TITLE_CHOICES, TIME_CHOICES, REPEAT_CHOICES
+from services.event_model import format_time, parse_time
 from services.theme_manager import ThemeManager
 from utils.resource import resource_path
 
+# 空き時間の候補を探すときの予定の長さ（分）
+SLOT_MINUTES = 60
+
+
 class EditDialog(tk.Toplevel):
     """予定の追加・編集用ダイアログウィンドウ"""
 
     def __init__(
         self, parent, title,
         default_title="", default_start_time="",
-        default_end_time="", default_content=""
+        default_end_time="", default_content="",
+        overlap_checker=None, allow_repeat=False, slot_finder=None
     ):
         super().__init__(parent)
         # ダイアログから返す結果（OK 押下時にタプルで設定）
         self.result = None
         self.parent = parent
+        # (開始, 終了, date_str=日付) を受け取り、時間が重なる予定の dict のリストを返す関数（任意）
+        self.overlap_checker = overlap_checker
+        # 繰り返しの選択欄を出すか（新規追加のときだけ）
+        self.allow_repeat = allow_repeat
+        # OK 押下時に選ばれていた繰り返しの種類（REPEAT_CHOICES の値、なしは None）
+        self.repeat = None
+        # 長さ（分）を受け取り、空き時間の候補 (日付, 開始, 終了) のリストを返す関数（任意）
+        self.slot_finder = slot_finder
+        # 候補から別の日を選んだときの日付（選ばなければ None）
+        self.date = None
         self.withdraw()
         self.title(title)
+        self._base_title = title
         # アイコンを resource_path 経由で読み込み
         self.iconbitmap(resource_path("ui/icons/event_icon.ico"))
         self.configure(bg=COLORS["dialog_bg"])
@@ -32,8 +49,11 @@ class EditDialog(tk.Toplevel):
         self.start_var   = tk.StringVar(value=default_start_time)
         self.end_var     = tk.StringVar(value=default_end_time)
         self.content_var = tk.StringVar(value=default_content)
-        
-        self._place_relative_to_parent(width=300, height=270)
+        self.repeat_var  = tk.StringVar(value=next(iter(REPEAT_CHOICES)))
+
+        self.slots = slot_finder(SLOT_MINUTES) if slot_finder else []
+        height = (320 if allow_repeat else 270) + (56 if self.slots else 0)
+        self._place_relative_to_parent(width=300, height=height)
         
         # UI 構築
         self._build_ui()
@@ -74,7 +94,11 @@ class EditDialog(tk.Toplevel):
         # 各セクション
         self._create_title_section(frame)
         self._create_time_section(frame)
+        if self.slots:
+            self._create_slot_section(frame)
         self._create_content_section(frame)
+        if self.allow_repeat:
+            self._create_repeat_section(frame)
         self._create_button_section()
 
         # Esc キーで閉じる
@@ -121,6 +145,39 @@ class EditDialog(tk.Toplevel):
                 takefocus=True
             ).pack(fill="x", pady=(0, 8))
 
+    def _create_slot_section(self, parent):
+        """空き時間の候補ボタン（クリックで開始・終了時間を入力する）"""
+        tk.Label(
+            parent,
+            text="空き時間の候補：",
+            font=FONTS["small"],
+            bg=COLORS["dialog_bg"],
+            fg=ThemeManager.get("text")
+        ).pack(anchor="w", pady=(0, 2))
+
+        row = tk.Frame(parent, bg=COLORS["dialog_bg"])
+        row.pack(fill="x", pady=(0, 8))
+        for date_str, start, _ in self.slots:
+            end = format_time(parse_time(start) + SLOT_MINUTES)
+            tk.Button(
+                row,
+                text=f"{int(date_str[5:7])}/{int(date_str[8:])} {start}-{end}",
+                command=lambda d=date_str, st=start, et=end: self._apply_slot(d, st, et),
+                font=FONTS["small"],
+                bg=COLORS["today"],
+                fg=ThemeManager.get("text"),
+                relief="flat",
+                padx=4,
+                cursor="hand2"
+            ).pack(side="left", padx=(0, 4))
+
+    def _apply_slot(self, date_str, start, end):
+        """候補の時間帯を開始・終了時間に入れる（別の日の候補なら日付も変える）"""
+        self.date = date_str
+        self.start_var.set(start)
+        self.end_var.set(end)
+        self.title(f"{self._base_title}（{date_str}）")
+
     def _create_content_section(self, parent):
         """メモ用の Entry とプレースホルダー機能"""
         tk.Label(
@@ -145,6 +202,25 @@ class EditDialog(tk.Toplevel):
         # プレースホルダー挿入
         self._add_placeholder(self.ent_content, "メモを入力")
 
+    def _create_repeat_section(self, parent):
+        """繰り返し選択用のラベル＋Combobox（選択のみ）"""
+        tk.Label(
+            parent,
+            text="繰り返し：",
+            font=FONTS["small"],
+            bg=COLORS["dialog_bg"],
+            fg=ThemeManager.get("text")
+        ).pack(anchor="w", pady=(0, 2))
+
+        ttk.Combobox(
+            parent,
+            textvariable=self.repeat_var,
+            values=list(REPEAT_CHOICES),
+            font=FONTS["small"],
+            state="readonly",
+            takefocus=True
+        ).pack(fill="x", pady=(0, 8))
+
     def _create_button_section(self, parent=None):
         """OK / キャンセル ボタン配置"""
         pad = 8
@@ -222,6 +298,22 @@ class EditDialog(tk.Toplevel):
                 )
                 return
 
+        # 3. 同じ時間帯に別の予定があれば、登録してよいか確認する
+        if start and self.overlap_checker:
+            overlaps = self.overlap_checker(start, end, date_str=self.date)
+            if overlaps:
+                lines = "\n".join(
+                    f"・{ev['start_time']}-{ev['end_time']} {ev['title']}" for ev in overlaps
+                )
+                if not messagebox.askyesno(
+                    "予定の重複",
+                    f"次の予定と時間が重なっています。\n{lines}\n\nこのまま登録しますか？"
+                ):
+                    return
+
+        if self.allow_repeat:
+            self.repeat = REPEAT_CHOICES.get(self.repeat_var.get())
+
         # 必須なのはタイトルだけ
         self.result = (
             title,
@@ -1,23 +1,33 @@
 # ui/main_window.py
 
 import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
 from datetime import datetime
 import os
 
 from controllers.calendar_controller import CalendarController
 from ui.calendar_view import CalendarView
 from ui.status_bar_widget import StatusBarWidget
-from ui.theme import COLORS
+from ui.theme import COLORS, FONTS
 from ui.event_dialog import EventDialog
+from ui.search_dialog import SearchDialog
 from services.theme_manager import ThemeManager
+from services.event_manager import flush_pending_saves, data_files
+from services.event_store import JsonEventStore
+from services.exporter import export_to_file
+from services.ics_import import import_ics
+from services.file_watcher import FileWatcher
 from utils.resource import resource_path
 from PIL import Image, ImageTk
 
+# 天気が古くなっていないかを確かめる間隔（ミリ秒）。古ければ裏で取得し直す
+WEATHER_CHECK_MS = 60 * 1000
+
 
 class MainWindow:
     """アプリケーションのメインウィンドウを構成するクラス"""
 
-    def __init__(self):
+    def __init__(self, store=None):
         self.root = tk.Tk()
         self.root.withdraw()
         self.root.title("Desktop Calendar")
@@ -31,8 +41,12 @@ class MainWindow:
         self.root.attributes("-topmost", False)
 
         self._configure_window_position()
-        self.controller = CalendarController()
+        self.controller = CalendarController(store=store, holiday_notifier=self._notify_holidays,
+                                             weather_notifier=self._notify_weather)
         self._setup_ui()
+        self._start_file_watcher()
+        self.root.after(WEATHER_CHECK_MS, self._check_weather)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.root.after(0, self.root.deiconify)
 
     def _configure_window_position(self):
@@ -44,6 +58,9 @@ class MainWindow:
         self.root.geometry(f"{ww}x{wh}+{x}+{y}")
 
     def _setup_ui(self):
+        # メニュー（取り込み・書き出し）
+        self._setup_menu()
+
         # カレンダー
         self.calendar_view = CalendarView(
             self.root,
@@ -53,19 +70,157 @@ class MainWindow:
             self.controller.events,
             on_date_click=self.open_event_dialog,
             on_prev=self.on_prev_month,
-            on_next=self.on_next_month
+            on_next=self.on_next_month,
+            recurrences=self.controller.recurrences
         )
 
         # 時計と天気をまとめるためのフレーム
         bottom_frame = tk.Frame(self.root, bg=ThemeManager.get('header_bg'))
         bottom_frame.pack(side="bottom", fill="x", padx=10, pady=(0, 10))
 
+        # 検索ボックス（Enter で検索ダイアログを開く）
+        search_frame = tk.Frame(bottom_frame, bg=ThemeManager.get('header_bg'))
+        search_frame.pack(side="top", fill="x", padx=(30, 20), pady=(0, 6))
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(
+            search_frame, textvariable=self.search_var, font=FONTS["small"],
+            bg=ThemeManager.get('bg'), fg=ThemeManager.get('text'), relief="solid", bd=1
+        )
+        self.search_entry.pack(side="left", fill="x", expand=True)
+        self.search_entry.bind("<Return>", lambda e: self.open_search_dialog())
+        tk.Button(
+            search_frame, text="検索", font=FONTS["small"],
+            bg=ThemeManager.get('button_bg'), fg=ThemeManager.get('button_fg'),
+            relief="flat", cursor="hand2", command=self.open_search_dialog
+        ).pack(side="left", padx=(6, 0))
+
         # 統合ウィジェット（時計＋天気＋メッセージ）
         self.status_bar = StatusBarWidget(bottom_frame, on_theme_toggle=self.toggle_theme)
 
         # 天気を初期表示
         self.status_bar.update_weather(self.controller.get_weather_info())
 
+        # Ctrl+F で予定の検索
+        self.root.bind("<Control-f>", lambda e: self.open_search_dialog())
+        # Ctrl+Z / Ctrl+Y で予定の編集を元に戻す／やり直す（入力欄では文字の編集に使わせる）
+        self.root.bind("<Control-z>", lambda e: None if self._is_text_input(e.widget) else self.undo())
+        self.root.bind("<Control-y>", lambda e: None if self._is_text_input(e.widget) else self.redo())
+
+    @staticmethod
+    def _is_text_input(widget) -> bool:
+        """文字を入力できるウィジェット（検索欄など）なら True"""
+        return isinstance(widget, (tk.Entry, tk.Text, ttk.Entry))
+
+    def _setup_menu(self):
+        menubar = tk.Menu(self.root)
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="ICS ファイルを取り込む...", command=self.import_ics_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="ICS に書き出す...", command=lambda: self.export_file("ics"))
+        file_menu.add_command(label="CSV に書き出す...", command=lambda: self.export_file("csv"))
+        menubar.add_cascade(label="ファイル", menu=file_menu)
+        view_menu = tk.Menu(menubar, tearoff=0)
+        view_menu.add_command(label="表示中の年の統計...", command=self.open_stats_window)
+        menubar.add_cascade(label="表示", menu=view_menu)
+        self.root.config(menu=menubar)
+
+    def import_ics_file(self):
+        """ICS ファイルの予定をまとめて取り込む（保存は 1 回だけ）"""
+        path = filedialog.askopenfilename(
+            parent=self.root, title="ICS ファイルを取り込む",
+            filetypes=[("iCalendar", "*.ics"), ("すべてのファイル", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            added, rules = import_ics(self.controller.events, path, store=self.controller.store,
+                                      recurrences=self.controller.recurrences)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("取り込みエラー", f"取り込みに失敗しました: {e}", parent=self.root)
+            return
+        self._refresh_calendar()
+        messagebox.showinfo(
+            "取り込み完了", f"予定 {added} 件、繰り返し予定 {rules} 件を取り込みました。", parent=self.root
+        )
+
+    def export_file(self, fmt):
+        """すべての予定を ICS / CSV ファイルに書き出す"""
+        path = filedialog.asksaveasfilename(
+            parent=self.root, title=f"{fmt.upper()} に書き出す", defaultextension=f".{fmt}",
+            filetypes=[("iCalendar", "*.ics")] if fmt == "ics" else [("CSV", "*.csv")]
+        )
+        if not path:
+            return
+        # 書き込み待ちの変更もファイルに含める
+        flush_pending_saves()
+        try:
+            export_to_file(self.controller.store or JsonEventStore(), path, fmt,
+                           recurrences=self.controller.recurrences)
+        except OSError as e:
+            messagebox.showerror("書き出しエラー", f"書き出しに失敗しました: {e}", parent=self.root)
+            return
+        messagebox.showinfo("書き出し完了", f"{path} に書き出しました。", parent=self.root)
+
+    def open_stats_window(self):
+        """表示中の年の予定の時間を集計して統計ウィンドウに表示する"""
+        year = self.controller.current_year
+        # 書き込み待ちの変更も集計に含める
+        flush_pending_saves()
+        stats = self.controller.load_stats(f"{year}-01-01", f"{year}-12-31")
+        # 統計ウィンドウは services.stats（NumPy）を使うので、開くときに読み込む
+        from ui.stats_window import StatsWindow
+        StatsWindow(self.root, stats, title=f"予定の統計（{year}年）")
+
+    def _start_file_watcher(self):
+        """ほかのプロセスによる events.json の変更を監視する（JSON 保存時のみ）"""
+        self.file_watcher = None
+        if not self.controller.watches_events_file():
+            return
+        # 監視スレッドから UI スレッドへは after() で渡す
+        self.file_watcher = FileWatcher(
+            data_files(), lambda: self.root.after(0, self._on_external_change)
+        ).start()
+
+    def _on_external_change(self):
+        """変更を取り込み、影響を受けた日付のセルだけを描き直す"""
+        changed = self.controller.sync_external_changes()
+        if changed:
+            self.calendar_view.refresh_dates(self.controller.events, changed)
+
+    def _notify_holidays(self, year, holidays):
+        # 祝日の先読みスレッドから UI スレッドへは after() で渡す
+        self.root.after(0, self._on_holidays_loaded, year, holidays)
+
+    def _on_holidays_loaded(self, year, holidays):
+        """先読みした祝日が表示中の年のものなら、カレンダーを描き直す"""
+        if self.controller.apply_prefetched_holidays(year, holidays):
+            self._refresh_calendar()
+
+    def _notify_weather(self, weather):
+        # 天気の取得スレッドから UI スレッドへは after() で渡す
+        self.root.after(0, self._on_weather_loaded, weather)
+
+    def _on_weather_loaded(self, weather):
+        self.controller.weather_info = weather
+        self.status_bar.update_weather(weather)
+
+    def _check_weather(self):
+        """天気のキャッシュを確かめ（古ければ裏で取得し直す）、一定時間ごとに繰り返す"""
+        self.status_bar.update_weather(self.controller.refresh_weather())
+        self.root.after(WEATHER_CHECK_MS, self._check_weather)
+
+    def undo(self):
+        """直前の予定の編集を取り消し、影響を受けた日付のセルだけを描き直す"""
+        changed = self.controller.undo()
+        if changed:
+            self.calendar_view.refresh_dates(self.controller.events, changed)
+
+    def redo(self):
+        """取り消した予定の編集をやり直す"""
+        changed = self.controller.redo()
+        if changed:
+            self.calendar_view.refresh_dates(self.controller.events, changed)
+
     def on_prev_month(self):
         self.controller.prev_month()
         self._refresh_calendar()
@@ -81,7 +236,7 @@ class MainWindow:
             self.controller.holidays,
             self.controller.events
         )
-        # 天気も更新
+        # 天気は保持している情報を表示し直すだけ（月の移動では取得しない）
         self.status_bar.update_weather(self.controller.get_weather_info())
 
     def open_event_dialog(self, date_key):
@@ -92,10 +247,21 @@ class MainWindow:
 
         try:
             from ui.event_dialog import EventDialog
-            EventDialog(self.root, date_key, self.controller.events, self._refresh_calendar)
+            EventDialog(self.root, date_key, self.controller.events, self._refresh_calendar,
+                        store=self.controller.history, recurrences=self.controller.recurrences)
         except Exception as e:
             print(f"[ERROR] イベントダイアログでエラー発生: {e}")
 
+    def open_search_dialog(self):
+        SearchDialog(self.root, self.controller.events, self.jump_to_date,
+                     query=self.search_var.get())
+
+    def jump_to_date(self, date_str):
+        """検索結果などから指定日の月へ移動し、その日の予定一覧を開く"""
+        self.controller.go_to_date(date_str)
+        self._refresh_calendar()
+        self.open_event_dialog(date_str)
+
     def toggle_theme(self):
         ThemeManager.toggle_theme()
         self.root.configure(bg=ThemeManager.get("header_bg"))
@@ -104,5 +270,14 @@ class MainWindow:
         # 時計・天気ウィジェットのテーマ更新
         self.status_bar.update_theme()
 
+    def on_close(self):
+        """書き込み待ちの予定をすべて保存してからウィンドウを閉じる"""
+        if self.file_watcher is not None:
+            self.file_watcher.stop()
+        flush_pending_saves()
+        if self.controller.store is not None:
+            self.controller.store.close()
+        self.root.destroy()
+
     def run(self):
         self.root.mainloop()
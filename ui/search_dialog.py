@@ -0,0 +1,119 @@
+# ui/search_dialog.py
+
+import tkinter as tk
+
+from services.event_manager import find_event
+from services.search_index import search_events
+from ui.theme import FONTS
+from services.theme_manager import ThemeManager
+
+# 一度に表示する検索結果の上限
+MAX_RESULTS = 200
+
+
+class SearchDialog(tk.Toplevel):
+    """予定のタイトル・メモを検索し、選んだ予定の日付へ移動するダイアログ"""
+
+    def __init__(self, parent, events, on_select, query=""):
+        """
+        events:    検索対象の予定（日付キー → 予定リスト）
+        on_select: 結果を選んだときに "YYYY-MM-DD" を受け取るコールバック
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.events = events
+        self.on_select = on_select
+        # Listbox の行番号 → 日付
+        self.result_dates = []
+
+        self.title("予定の検索")
+        self.configure(bg=ThemeManager.get('dialog_bg'))
+        self.resizable(True, True)
+        self.geometry(f"+{parent.winfo_x() + 40}+{parent.winfo_y() + 60}")
+
+        self._build_ui()
+        self.query_var.set(query)
+        self.run_search()
+        self.entry.focus_set()
+
+    def _build_ui(self):
+        # 検索ボックス
+        top = tk.Frame(self, bg=ThemeManager.get('dialog_bg'))
+        top.pack(fill="x", padx=12, pady=(12, 6))
+        self.query_var = tk.StringVar()
+        self.entry = tk.Entry(
+            top, textvariable=self.query_var, font=FONTS["base"],
+            bg=ThemeManager.get('bg'), fg=ThemeManager.get('text'), relief="solid", bd=1
+        )
+        self.entry.pack(side="left", fill="x", expand=True)
+        # 入力のたびに検索し直す（索引があるので件数が多くても軽い）
+        self.query_var.trace_add("write", lambda *args: self.run_search())
+
+        # 件数表示
+        self.count_label = tk.Label(
+            top, text="", font=FONTS["small"],
+            bg=ThemeManager.get('dialog_bg'), fg=ThemeManager.get('footer_fg')
+        )
+        self.count_label.pack(side="right", padx=(8, 0))
+
+        # 結果一覧
+        frame = tk.Frame(self, bg=ThemeManager.get('dialog_bg'))
+        frame.pack(fill="both", expand=True, padx=12, pady=(0, 12))
+        self.listbox = tk.Listbox(
+            frame, font=FONTS["base_minus"],
+            bg=ThemeManager.get('bg'), fg=ThemeManager.get('text'),
+            bd=0, relief="flat", selectbackground="#CCE8FF", selectforeground="#000000",
+            activestyle="none", height=10, width=45
+        )
+        self.listbox.pack(side="left", fill="both", expand=True)
+        scrollbar = tk.Scrollbar(frame, command=self.listbox.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.listbox.config(yscrollcommand=scrollbar.set)
+
+        # ダブルクリック・Enter で移動、Esc で閉じる
+        self.listbox.bind("<Double-Button-1>", lambda e: self.jump_to_selected())
+        self.listbox.bind("<Return>", lambda e: self.jump_to_selected())
+        self.entry.bind("<Return>", lambda e: self.jump_to_selected(first=True))
+        self.entry.bind("<Down>", lambda e: self._focus_results())
+        self.bind("<Escape>", lambda e: self.destroy())
+
+    def run_search(self):
+        """検索ボックスの内容で検索し、結果一覧を更新"""
+        self.listbox.delete(0, tk.END)
+        self.result_dates = []
+        query = self.query_var.get()
+        if not query.strip():
+            self.count_label.config(text="")
+            return
+
+        results = search_events(self.events, query, limit=MAX_RESULTS)
+        for date_str, event_id in results:
+            found = find_event(self.events, event_id)
+            if found is None:
+                continue
+            ev = found[1]
+            text = f"{date_str}  {ev.get('start_time', '')}  {ev.get('title', '')}"
+            if ev.get("memo"):
+                text += f"  - {ev['memo']}"
+            self.result_dates.append(date_str)
+            self.listbox.insert(tk.END, text)
+        suffix = "+" if len(results) == MAX_RESULTS else ""
+        self.count_label.config(text=f"{len(self.result_dates)}{suffix} 件")
+
+    def _focus_results(self):
+        if self.result_dates:
+            self.listbox.focus_set()
+            self.listbox.selection_set(0)
+
+    def jump_to_selected(self, first=False):
+        """選択中（first=True なら先頭）の結果の日付へ移動してダイアログを閉じる"""
+        sel = self.listbox.curselection()
+        if sel:
+            index = sel[0]
+        elif first and self.result_dates:
+            index = 0
+        else:
+            return
+        date_str = self.result_dates[index]
+        self.destroy()
+        self.on_select(date_str)
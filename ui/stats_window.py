@@ -0,0 +1,105 @@
+# ui/stats_window.py
+
+import tkinter as tk
+from tkinter import ttk
+
+from services.stats import CATEGORIES
+from ui.theme import FONTS
+from services.theme_manager import ThemeManager
+
+# 集計単位の表示名 → EventStats の単位
+PERIOD_CHOICES = {"月ごと": "month", "週ごと": "week", "日ごと": "day"}
+ALL_CATEGORIES = "すべて"
+
+_WEEKDAY_NAMES = ["月", "火", "水", "木", "金", "土", "日"]
+# ヒートマップの 1 マスの大きさ（px）
+CELL_W, CELL_H = 16, 18
+
+
+class StatsWindow(tk.Toplevel):
+    """予定の時間の集計表と、曜日 × 時間帯のヒートマップを表示するウィンドウ"""
+
+    def __init__(self, parent, stats, title="予定の統計"):
+        """
+        stats: 集計対象の EventStats（読み込み済みの配列を切り替えて集計するだけなので、再読み込みはしない）
+        """
+        super().__init__(parent)
+        self.parent = parent
+        self.stats = stats
+
+        self.title(title)
+        self.configure(bg=ThemeManager.get('dialog_bg'))
+        self.resizable(True, True)
+        self.geometry(f"+{parent.winfo_x() + 40}+{parent.winfo_y() + 40}")
+
+        self._build_ui()
+        self.refresh()
+        self.bind("<Escape>", lambda e: self.destroy())
+
+    def _build_ui(self):
+        # 集計単位と分類の選択
+        top = tk.Frame(self, bg=ThemeManager.get('dialog_bg'))
+        top.pack(fill="x", padx=12, pady=(12, 6))
+        self.period_var = tk.StringVar(value=next(iter(PERIOD_CHOICES)))
+        self.category_var = tk.StringVar(value=ALL_CATEGORIES)
+        for var, values in ((self.period_var, list(PERIOD_CHOICES)),
+                            (self.category_var, [ALL_CATEGORIES] + CATEGORIES)):
+            box = ttk.Combobox(top, textvariable=var, values=values, state="readonly",
+                               font=FONTS["small"], width=12)
+            box.pack(side="left", padx=(0, 8))
+            box.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+        self.total_label = tk.Label(
+            top, text="", font=FONTS["small"],
+            bg=ThemeManager.get('dialog_bg'), fg=ThemeManager.get('footer_fg')
+        )
+        self.total_label.pack(side="right")
+
+        # 集計表
+        frame = tk.Frame(self, bg=ThemeManager.get('dialog_bg'))
+        frame.pack(fill="both", expand=True, padx=12, pady=(0, 6))
+        self.listbox = tk.Listbox(
+            frame, font=FONTS["base_minus"],
+            bg=ThemeManager.get('bg'), fg=ThemeManager.get('text'),
+            bd=0, relief="flat", activestyle="none", height=10, width=30
+        )
+        self.listbox.pack(side="left", fill="both", expand=True)
+        scrollbar = tk.Scrollbar(frame, command=self.listbox.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.listbox.config(yscrollcommand=scrollbar.set)
+
+        # ヒートマップ（曜日 × 時間帯）
+        self.canvas = tk.Canvas(
+            self, width=24 + CELL_W * 24, height=16 + CELL_H * 7,
+            bg=ThemeManager.get('dialog_bg'), highlightthickness=0
+        )
+        self.canvas.pack(padx=12, pady=(0, 12))
+
+    def refresh(self):
+        """選択中の集計単位・分類で集計し直して表示を更新"""
+        category = self.category_var.get()
+        stats = self.stats if category == ALL_CATEGORIES else self.stats.between(category=category)
+
+        labels, hours = stats.hours_by(PERIOD_CHOICES[self.period_var.get()])
+        self.listbox.delete(0, tk.END)
+        for label, value in zip(labels, hours):
+            self.listbox.insert(tk.END, f"{label}    {value:6.1f} 時間")
+        self.total_label.config(text=f"合計 {hours.sum():.1f} 時間")
+        self._draw_heatmap(stats.heatmap())
+
+    def _draw_heatmap(self, table):
+        """曜日 × 時間帯の時間を、多いほど濃い色のマスで描く"""
+        self.canvas.delete("all")
+        peak = table.max() or 1
+        fg = ThemeManager.get('text')
+        for hour in range(0, 24, 3):
+            self.canvas.create_text(24 + CELL_W * hour, 8, text=str(hour), anchor="w",
+                                    font=FONTS["weather_text"], fill=fg)
+        for row, name in enumerate(_WEEKDAY_NAMES):
+            y = 16 + CELL_H * row
+            self.canvas.create_text(12, y + CELL_H // 2, text=name, font=FONTS["weather_text"], fill=fg)
+            for hour in range(24):
+                # 0 時間は白、最大の時間帯は濃い青
+                level = table[row, hour] / peak
+                color = "#%02x%02x%02x" % (int(255 - 172 * level), int(255 - 120 * level), int(255 - 40 * level))
+                x = 24 + CELL_W * hour
+                self.canvas.create_rectangle(x, y, x + CELL_W - 1, y + CELL_H - 1, fill=color, outline="")
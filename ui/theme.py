@@ -1,5 +1,8 @@
 # ui/theme.py
 
+# タイトルの選択肢はサービス層でも使うので services.event_model で定義し、ここから再公開する
+from services.event_model import TITLE_CHOICES  # noqa: F401
+
 # ────────────────────────────────────────────────────────────
 # カラー定義（COLORS）
 # ────────────────────────────────────────────────────────────
@@ -117,15 +120,7 @@ FONTS = {
 # 選択肢リスト
 # ────────────────────────────────────────────────────────────
 # コンボボックス等で利用する選択肢を定義
-TITLE_CHOICES = [
-    "会議/打合せ",
-    "来客",
-    "外出",
-    "出張",
-    "休暇",
-    "私用",
-    "その他"
-]
+# （タイトルの選択肢 TITLE_CHOICES は先頭で services.event_model から読み込み）
 
 # 時刻選択肢：07:00～21:30 まで 30 分刻み
 TIME_CHOICES = [
@@ -133,3 +128,13 @@ TIME_CHOICES = [
     for h in range(7, 22)    # 07時～21時
     for m in (0, 30)         # on the hour / half past
 ]
+
+# 繰り返しの選択肢：表示名 → 繰り返しの種類（services.recurrence.make_repeat_rule に渡す）
+REPEAT_CHOICES = {
+    "なし":             None,
+    "毎日":             "daily",
+    "毎週":             "weekly",
+    "毎月（同じ日）":   "monthly_day",
+    "毎月（同じ曜日）": "monthly_nth",
+    "毎年":             "yearly",
+}